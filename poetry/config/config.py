@@ -27,6 +27,17 @@ def boolean_normalizer(val: str) -> bool:
     return val in ["true", "1"]
 
 
+def size_validator(val: str) -> bool:
+    from poetry.utils.helpers import parse_size
+
+    try:
+        parse_size(val)
+    except ValueError:
+        return False
+
+    return True
+
+
 class Config(object):
 
     default_config = {
@@ -39,6 +50,15 @@ class Config(object):
         },
         "experimental": {"new-installer": True},
         "installer": {"parallel": True},
+        "solver": {
+            "prefetch-workers": 10,
+            "override-workers": 0,
+            "async-requests": 0,
+            "decision-heuristic": "fewest-versions",
+            "resolution-cache": False,
+            "trust-locked-metadata": False,
+        },
+        "cache": {"artifacts": {"max-size": None}, "not-found-ttl": 300},
     }
 
     def __init__(
@@ -141,10 +161,21 @@ class Config(object):
             "virtualenvs.in-project",
             "virtualenvs.options.always-copy",
             "installer.parallel",
+            "solver.resolution-cache",
+            "solver.trust-locked-metadata",
+            "offline",
         }:
             return boolean_normalizer
 
         if name == "virtualenvs.path":
             return lambda val: str(Path(val))
 
+        if name in {
+            "solver.prefetch-workers",
+            "solver.async-requests",
+            "solver.override-workers",
+            "cache.not-found-ttl",
+        }:
+            return int
+
         return lambda val: val
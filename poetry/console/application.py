@@ -62,6 +62,7 @@ COMMANDS = [
     # Cache commands
     "cache clear",
     "cache list",
+    "cache prune",
     # Debug commands
     "debug info",
     "debug resolve",
@@ -1,4 +1,5 @@
 import os
+import shutil
 
 from cleo.helpers import argument
 from cleo.helpers import option
@@ -15,9 +16,10 @@ class CacheClearCommand(Command):
     options = [option("all", description="Clear all entries in the cache.")]
 
     def handle(self) -> int:
-        from cachy import CacheManager
-
+        from poetry.factory import Factory
         from poetry.locations import REPOSITORY_CACHE_DIR
+        from poetry.puzzle.resolution_cache import ResolutionCache
+        from poetry.repositories.metadata_store import MetadataStore
 
         cache = self.argument("cache")
 
@@ -31,13 +33,7 @@ class CacheClearCommand(Command):
         except ValueError:
             raise ValueError("{} is not a valid repository cache".format(root))
 
-        cache = CacheManager(
-            {
-                "default": parts[0],
-                "serializer": "json",
-                "stores": {parts[0]: {"driver": "file", "path": str(cache_dir)}},
-            }
-        )
+        store = MetadataStore(cache_dir)
 
         if len(parts) == 1:
             if not self.option("all"):
@@ -50,18 +46,32 @@ class CacheClearCommand(Command):
                 self.line("No cache entries for {}".format(parts[0]))
                 return 0
 
-            # Calculate number of entries
-            entries_count = 0
-            for path, dirs, files in os.walk(str(cache_dir)):
-                entries_count += len(files)
-
             delete = self.confirm(
-                "<question>Delete {} entries?</>".format(entries_count)
+                "<question>Delete {} entries?</>".format(store.count())
             )
             if not delete:
                 return 0
 
-            cache.flush()
+            store.clear()
+            store.close()
+
+            # Also remove the HTTP cache and what is left
+            # of the previous, file based, metadata cache.
+            for path in cache_dir.iterdir():
+                if path.name.startswith(MetadataStore.FILENAME):
+                    continue
+
+                if path.is_dir():
+                    shutil.rmtree(str(path))
+                else:
+                    path.unlink()
+
+            # The cached resolutions rely on the metadata of the repositories
+            resolutions_dir = ResolutionCache.get_cache_dir(
+                Factory.create_config(self.io)
+            )
+            if resolutions_dir.exists():
+                shutil.rmtree(str(resolutions_dir))
         elif len(parts) == 2:
             raise RuntimeError(
                 "Only specifying the package name is not yet supported. "
@@ -71,7 +81,7 @@ class CacheClearCommand(Command):
             package = parts[1]
             version = parts[2]
 
-            if not cache.has("{}:{}".format(package, version)):
+            if not store.has("{}:{}".format(package, version)):
                 self.line("No cache entries for {}:{}".format(package, version))
                 return 0
 
@@ -79,6 +89,6 @@ class CacheClearCommand(Command):
             if not delete:
                 return 0
 
-            cache.forget("{}:{}".format(package, version))
+            store.forget("{}:{}".format(package, version))
         else:
             raise ValueError("Invalid cache key")
@@ -0,0 +1,69 @@
+from typing import Optional
+
+from cleo.helpers import option
+
+from ..command import Command
+
+
+class CachePruneCommand(Command):
+
+    name = "cache prune"
+    description = "Removes the least recently used artifacts from Poetry's cache."
+
+    options = [
+        option(
+            "max-size",
+            None,
+            "The maximum size of the artifact cache, like 512M or 10G. "
+            "Defaults to the <comment>cache.artifacts.max-size</> setting.",
+            flag=False,
+        ),
+        option(
+            "older-than",
+            None,
+            "Remove the artifacts that have not been used for this long, "
+            "like 12h or 30d.",
+            flag=False,
+        ),
+    ]
+
+    def handle(self) -> Optional[int]:
+        from poetry.factory import Factory
+        from poetry.installation.artifact_cache import ArtifactCache
+        from poetry.utils.helpers import parse_duration
+        from poetry.utils.helpers import parse_size
+
+        config = Factory.create_config(self.io)
+
+        max_size = self.option("max-size")
+        if max_size is None:
+            max_size = config.get("cache.artifacts.max-size")
+
+        older_than = self.option("older-than")
+
+        if max_size is None and older_than is None:
+            self.line_error(
+                "<error>Specify --max-size or --older-than, "
+                "or set the cache.artifacts.max-size setting.</>"
+            )
+
+            return 1
+
+        try:
+            max_size = parse_size(max_size) if max_size is not None else None
+            older_than = parse_duration(older_than) if older_than is not None else None
+        except ValueError as e:
+            self.line_error("<error>{}</>".format(e))
+
+            return 1
+
+        cache = ArtifactCache.from_config(config)
+        removed = cache.prune(max_size=max_size, older_than=older_than)
+
+        self.line(
+            "Removed <info>{}</> artifacts ({:.1f} MB)".format(
+                len(removed), sum(size for _, size in removed) / 2**20
+            )
+        )
+
+        return 0
@@ -56,7 +56,9 @@ To remove a repository (repo is a short alias for repositories):
 
         from poetry.config.config import boolean_normalizer
         from poetry.config.config import boolean_validator
+        from poetry.config.config import size_validator
         from poetry.locations import CACHE_DIR
+        from poetry.mixology.version_solver import DECISION_HEURISTICS
 
         unique_config_values = {
             "cache-dir": (
@@ -86,6 +88,26 @@ To remove a repository (repo is a short alias for repositories):
                 boolean_normalizer,
                 True,
             ),
+            "solver.prefetch-workers": (lambda val: val.isdigit(), int, 10),
+            "solver.async-requests": (lambda val: val.isdigit(), int, 0),
+            "solver.override-workers": (lambda val: val.isdigit(), int, 0),
+            "solver.decision-heuristic": (
+                lambda val: val in DECISION_HEURISTICS,
+                str,
+                "fewest-versions",
+            ),
+            "solver.resolution-cache": (
+                boolean_validator,
+                boolean_normalizer,
+                True,
+            ),
+            "solver.trust-locked-metadata": (
+                boolean_validator,
+                boolean_normalizer,
+                False,
+            ),
+            "cache.artifacts.max-size": (size_validator, str, None),
+            "cache.not-found-ttl": (lambda val: val.isdigit(), int, 300),
         }
 
         return unique_config_values
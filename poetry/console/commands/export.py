@@ -29,6 +29,11 @@ class ExportCommand(Command):
             multiple=True,
         ),
         option("with-credentials", None, "Include credentials for extra indices."),
+        option(
+            "offline",
+            None,
+            "Do not access the network: only use the cached metadata and distributions.",
+        ),
     ]
 
     def handle(self) -> None:
@@ -39,6 +44,9 @@ class ExportCommand(Command):
 
         output = self.option("output")
 
+        if self.option("offline"):
+            self.poetry.pool.set_offline()
+
         locker = self.poetry.locker
         if not locker.is_locked():
             self.line("<comment>The lock file does not exist. Locking.</comment>")
@@ -32,6 +32,11 @@ class InstallCommand(InstallerCommand):
             flag=False,
             multiple=True,
         ),
+        option(
+            "offline",
+            None,
+            "Do not access the network: only use the cached metadata and distributions.",
+        ),
     ]
 
     help = """The <info>install</info> command reads the <comment>poetry.lock</> file from
@@ -70,6 +75,9 @@ dependencies and not including the current project, run the command with the
         self._installer.dev_only(self.option("dev-only"))
         self._installer.dry_run(self.option("dry-run"))
         self._installer.remove_untracked(self.option("remove-untracked"))
+        if self.option("offline"):
+            self._installer.offline()
+
         self._installer.verbose(self._io.is_verbose())
 
         return_code = self._installer.run()
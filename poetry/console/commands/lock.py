@@ -12,6 +12,11 @@ class LockCommand(InstallerCommand):
         option(
             "no-update", None, "Do not update locked versions, only refresh lock file."
         ),
+        option(
+            "offline",
+            None,
+            "Do not access the network: only use the cached metadata and distributions.",
+        ),
     ]
 
     help = """
@@ -29,6 +34,9 @@ file.
             self.poetry.config.get("experimental.new-installer", False)
         )
 
+        if self.option("offline"):
+            self._installer.offline()
+
         self._installer.lock(update=not self.option("no-update"))
 
         return self._installer.run()
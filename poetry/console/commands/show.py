@@ -39,6 +39,11 @@ class ShowCommand(EnvCommand):
             "a",
             "Show all packages (even those not compatible with current system).",
         ),
+        option(
+            "offline",
+            None,
+            "Do not access the network: only use the cached metadata and distributions.",
+        ),
     ]
 
     help = """The show command displays detailed information about a package, or
@@ -58,6 +63,9 @@ lists all packages available."""
 
         package = self.argument("package")
 
+        if self.option("offline"):
+            self.poetry.pool.set_offline()
+
         if self.option("tree"):
             self.init_styles(self.io)
 
@@ -148,6 +156,13 @@ lists all packages available."""
         latest_statuses = {}
         installed_repo = InstalledRepository.load(self.env)
 
+        if show_latest:
+            self.poetry.pool.preload(
+                locked.name
+                for locked in locked_packages
+                if show_all or locked in required_locked_packages
+            )
+
         # Computing widths
         for locked in locked_packages:
             if locked not in required_locked_packages and not show_all:
@@ -18,6 +18,7 @@ from .locations import CONFIG_DIR
 from .packages.locker import Locker
 from .poetry import Poetry
 from .repositories.pypi_repository import PyPiRepository
+from .utils.fetch_engine import FetchEngine
 
 
 if TYPE_CHECKING:
@@ -97,11 +98,20 @@ class Factory(BaseFactory):
         # but only if we have no other default source
         if not poetry.pool.has_default():
             has_sources = bool(sources)
-            poetry.pool.add_repository(PyPiRepository(), not has_sources, has_sources)
+            poetry.pool.add_repository(
+                PyPiRepository(config=config), not has_sources, has_sources
+            )
         else:
             if io.is_debug():
                 io.write_line("Deactivating the PyPI repository")
 
+        if config.get("offline", False):
+            poetry.pool.set_offline()
+
+        async_requests = config.get("solver.async-requests", 0)
+        if async_requests:
+            poetry.pool.set_fetch_engine(FetchEngine(async_requests))
+
         return poetry
 
     @classmethod
@@ -571,6 +571,26 @@ class PackageInfo:
         except ValueError:
             return PackageInfo()
 
+    @classmethod
+    def from_core_metadata(cls, metadata: bytes) -> "PackageInfo":
+        """
+        Gather package information from the content of a core metadata file,
+        like the METADATA file of a wheel.
+
+        :param metadata: Raw content of the metadata file.
+        """
+        dist = pkginfo.Distribution()
+        dist.parse(metadata)
+
+        return cls(
+            name=dist.name,
+            version=dist.version,
+            summary=dist.summary,
+            platform=dist.supported_platforms,
+            requires_dist=list(dist.requires_dist) or None,
+            requires_python=dist.requires_python,
+        )
+
     @classmethod
     def from_bdist(cls, path: Path) -> "PackageInfo":
         """
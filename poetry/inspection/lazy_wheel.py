@@ -0,0 +1,190 @@
+import re
+import zipfile
+
+from bisect import bisect_left
+from bisect import bisect_right
+from tempfile import NamedTemporaryFile
+from typing import Any
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import requests
+
+
+METADATA_RE = re.compile(r"^[^/]+\.dist-info/METADATA$")
+
+
+class LazyWheelUnsupportedError(Exception):
+    """
+    Raised when a wheel cannot be inspected lazily, either because the server
+    does not support range requests or because the archive is not usable.
+    """
+
+
+class LazyZipOverHTTP:
+    """
+    Read-only file-like object mapped to a ZIP file served over HTTP.
+
+    The file is backed by a sparse temporary file and only the byte ranges
+    that are actually read are retrieved, using HTTP range requests.
+    """
+
+    def __init__(
+        self, url: str, session: requests.Session, chunk_size: int = 10240
+    ) -> None:
+        try:
+            response = session.head(url, allow_redirects=True)
+        except requests.RequestException as e:
+            raise LazyWheelUnsupportedError(str(e))
+
+        if not response.ok or response.headers.get("Accept-Ranges") != "bytes":
+            raise LazyWheelUnsupportedError(
+                "Range requests are not supported for {}".format(url)
+            )
+
+        try:
+            self._length = int(response.headers["Content-Length"])
+        except (KeyError, ValueError):
+            raise LazyWheelUnsupportedError(
+                "Unable to determine the size of {}".format(url)
+            )
+
+        self._session = session
+        self._url = response.url
+        self._chunk_size = chunk_size
+        self._file = NamedTemporaryFile()
+        self._file.truncate(self._length)
+
+        # Sorted, non-overlapping, inclusive intervals
+        # of the bytes that have already been retrieved.
+        self._left: List[int] = []
+        self._right: List[int] = []
+
+        # The central directory lives at the end of the archive:
+        # fetching the last chunk upfront usually saves a few round trips.
+        self._download(max(0, self._length - self._chunk_size), self._length - 1)
+
+    @property
+    def name(self) -> str:
+        return self._file.name
+
+    @property
+    def mode(self) -> str:
+        return "rb"
+
+    def seekable(self) -> bool:
+        return True
+
+    def readable(self) -> bool:
+        return True
+
+    def writable(self) -> bool:
+        return False
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def close(self) -> None:
+        self._file.close()
+
+    def tell(self) -> int:
+        return self._file.tell()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._file.seek(offset, whence)
+
+    def read(self, size: int = -1) -> bytes:
+        start = self.tell()
+        stop = self._length if size < 0 else min(start + size, self._length)
+
+        if start < stop:
+            self._download(start, stop - 1)
+
+        self.seek(start)
+
+        return self._file.read(stop - start)
+
+    def __enter__(self) -> "LazyZipOverHTTP":
+        self._file.__enter__()
+
+        return self
+
+    def __exit__(self, *exc: Any) -> Optional[bool]:
+        return self._file.__exit__(*exc)
+
+    def _download(self, start: int, end: int) -> None:
+        """
+        Retrieve the bytes between start and end (inclusive)
+        that have not been retrieved yet.
+        """
+        left = bisect_left(self._right, start)
+        right = bisect_right(self._left, end)
+
+        for gap_start, gap_end in self._gaps(start, end, left, right):
+            self._fetch(gap_start, gap_end)
+
+        if left < right:
+            start = min(start, self._left[left])
+            end = max(end, self._right[right - 1])
+
+        self._left[left:right] = [start]
+        self._right[left:right] = [end]
+
+    def _gaps(
+        self, start: int, end: int, left: int, right: int
+    ) -> Iterator[Tuple[int, int]]:
+        cursor = start
+        for lslice, rslice in zip(self._left[left:right], self._right[left:right]):
+            if lslice > cursor:
+                yield cursor, lslice - 1
+
+            cursor = max(cursor, rslice + 1)
+
+        if cursor <= end:
+            yield cursor, end
+
+    def _fetch(self, start: int, end: int) -> None:
+        position = self.tell()
+
+        # Servers may reject range requests even though they advertise them:
+        # any failure lets the caller download the whole file instead.
+        try:
+            with self._session.get(
+                self._url,
+                headers={"Range": "bytes={}-{}".format(start, end)},
+                stream=True,
+            ) as response:
+                response.raise_for_status()
+
+                if response.status_code != 206:
+                    raise LazyWheelUnsupportedError(
+                        "Range requests are not supported for {}".format(self._url)
+                    )
+
+                self._file.seek(start)
+                for chunk in response.iter_content(chunk_size=self._chunk_size):
+                    self._file.write(chunk)
+        except requests.RequestException as e:
+            raise LazyWheelUnsupportedError(str(e))
+
+        self._file.seek(position)
+
+
+def metadata_from_wheel_url(url: str, session: requests.Session) -> bytes:
+    """
+    Retrieve the content of the METADATA file of a remote wheel,
+    downloading only the parts of the archive needed to read it.
+    """
+    with LazyZipOverHTTP(url, session) as lazy_file:
+        try:
+            with zipfile.ZipFile(lazy_file) as archive:
+                for name in archive.namelist():
+                    if METADATA_RE.match(name):
+                        return archive.read(name)
+        except zipfile.BadZipFile as e:
+            raise LazyWheelUnsupportedError(str(e))
+
+    raise LazyWheelUnsupportedError("No METADATA found in {}".format(url))
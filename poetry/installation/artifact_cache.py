@@ -0,0 +1,121 @@
+import os
+import time
+
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+if TYPE_CHECKING:
+    from poetry.config.config import Config
+
+
+class ArtifactCache:
+    """
+    The cache of the distributions downloaded by the installer.
+
+    The last time an artifact was used is tracked through its modification
+    time, so that the least recently used artifacts can be evicted
+    when the cache grows too large.
+    """
+
+    # Artifacts used more recently than this, in seconds, are never removed
+    # since another process may be downloading or about to install them.
+    GRACE_PERIOD = 600
+
+    def __init__(self, cache_dir: Path) -> None:
+        self._cache_dir = cache_dir
+
+    @classmethod
+    def from_config(cls, config: "Config") -> "ArtifactCache":
+        return cls(Path(config.get("cache-dir")).expanduser().joinpath("artifacts"))
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    def touch(self, artifact: Path) -> None:
+        """
+        Record that an artifact has just been used.
+        """
+        try:
+            os.utime(str(artifact))
+        except OSError:
+            pass
+
+    def artifacts(self) -> Iterator[Tuple[float, int, Path]]:
+        """
+        Return the last access time, the size and the path of the cached artifacts.
+        """
+        for root, _, files in os.walk(str(self._cache_dir)):
+            for name in files:
+                path = Path(root, name)
+                try:
+                    stat = path.stat()
+                except OSError:
+                    # Removed by another process in the meantime
+                    continue
+
+                yield stat.st_mtime, stat.st_size, path
+
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.artifacts())
+
+    def prune(
+        self, max_size: Optional[int] = None, older_than: Optional[float] = None
+    ) -> List[Tuple[Path, int]]:
+        """
+        Remove the artifacts that have not been used for older_than seconds,
+        then the least recently used ones until the cache fits in max_size bytes.
+
+        Returns the removed artifacts and their size.
+        """
+        now = time.time()
+        artifacts = sorted(self.artifacts())
+        total = sum(size for _, size, _ in artifacts)
+
+        removed = []
+        for accessed, size, path in artifacts:
+            if now - accessed < self.GRACE_PERIOD:
+                # Artifacts are sorted by access time: all the next ones are in use
+                break
+
+            too_old = older_than is not None and now - accessed > older_than
+            too_large = max_size is not None and total > max_size
+            if not too_old and not too_large:
+                continue
+
+            try:
+                # Processes that already opened the artifact can still read it
+                path.unlink()
+            except FileNotFoundError:
+                # Removed by another process in the meantime
+                pass
+            except OSError:
+                continue
+
+            total -= size
+            removed.append((path, size))
+
+        self._remove_empty_directories(now)
+
+        return removed
+
+    def _remove_empty_directories(self, now: float) -> None:
+        for root, dirs, files in os.walk(str(self._cache_dir), topdown=False):
+            path = Path(root)
+            if files or path == self._cache_dir:
+                continue
+
+            try:
+                # Another process may be about to download an artifact
+                # in a directory it has just created.
+                if now - path.stat().st_mtime < self.GRACE_PERIOD:
+                    continue
+
+                path.rmdir()
+            except OSError:
+                continue
@@ -12,6 +12,8 @@ import requests.auth
 import requests.exceptions
 
 from poetry.exceptions import PoetryException
+from poetry.utils.http_client import get_http_clients
+from poetry.utils.http_client import parse_retry_after
 from poetry.utils.password_manager import PasswordManager
 
 
@@ -45,7 +47,7 @@ class Authenticator(object):
     @property
     def session(self) -> requests.Session:
         if self._session is None:
-            self._session = requests.Session()
+            self._session = get_http_clients().session()
 
         return self._session
 
@@ -79,6 +81,7 @@ class Authenticator(object):
 
         while True:
             is_last_attempt = attempt >= 5
+            retry_after = None
             try:
                 resp = session.send(prepared_request, **send_kwargs)
             except (requests.exceptions.ConnectionError, OSError) as e:
@@ -89,9 +92,11 @@ class Authenticator(object):
                     resp.raise_for_status()
                     return resp
 
+                retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+
             if not is_last_attempt:
                 attempt += 1
-                delay = 0.5 * attempt
+                delay = 0.5 * attempt if retry_after is None else retry_after
                 self._log(
                     "Retrying HTTP request in {} seconds.".format(delay), level="debug"
                 )
@@ -7,7 +7,9 @@ from typing import List
 from typing import Optional
 
 from poetry.core.packages.utils.link import Link
+from poetry.core.packages.utils.utils import url_to_path
 
+from .artifact_cache import ArtifactCache
 from .chooser import InvalidWheelName
 from .chooser import Wheel
 
@@ -22,9 +24,8 @@ class Chef:
     def __init__(self, config: "Config", env: "Env") -> None:
         self._config = config
         self._env = env
-        self._cache_dir = (
-            Path(config.get("cache-dir")).expanduser().joinpath("artifacts")
-        )
+        self._artifact_cache = ArtifactCache.from_config(config)
+        self._cache_dir = self._artifact_cache.cache_dir
 
     def prepare(self, archive: Path) -> Path:
         return archive
@@ -72,7 +73,10 @@ class Chef:
         if not candidates:
             return link
 
-        return min(candidates)[1]
+        archive = min(candidates)[1]
+        self._artifact_cache.touch(url_to_path(archive.url))
+
+        return archive
 
     def get_cached_archives_for_link(self, link: Link) -> List[Link]:
         cache_dir = self.get_cache_directory_for_link(link)
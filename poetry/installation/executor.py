@@ -19,9 +19,11 @@ from cleo.io.null_io import NullIO
 from poetry.core.packages.file_dependency import FileDependency
 from poetry.core.packages.utils.link import Link
 from poetry.core.pyproject.toml import PyProjectTOML
+from poetry.repositories.exceptions import OfflineError
 from poetry.utils._compat import decode
 from poetry.utils.env import EnvCommandError
 from poetry.utils.helpers import safe_rmtree
+from poetry.utils.http_client import get_http_clients
 
 from .authenticator import Authenticator
 from .chef import Chef
@@ -56,6 +58,7 @@ class Executor(object):
         self._dry_run = False
         self._enabled = True
         self._verbose = False
+        self._pool = pool
         self._authenticator = Authenticator(config, self._io)
         self._chef = Chef(config, self._env)
         self._chooser = Chooser(pool, self._env)
@@ -75,6 +78,8 @@ class Executor(object):
         else:
             self._max_workers = 1
 
+        # Each worker may be downloading a distribution
+        get_http_clients().reserve(self._max_workers)
         self._executor = ThreadPoolExecutor(max_workers=self._max_workers)
         self._total_operations = 0
         self._executed_operations = 0
@@ -120,6 +125,9 @@ class Executor(object):
             self._executed[job_type] = 0
             self._skipped[job_type] = 0
 
+        if self._pool.offline and self._enabled and not self._dry_run:
+            self._check_offline(operations)
+
         if operations and (self._enabled or self._dry_run):
             self._display_summary(operations)
 
@@ -167,6 +175,39 @@ class Executor(object):
 
         return 1 if self._shutdown else 0
 
+    def _check_offline(self, operations: List["OperationTypes"]) -> None:
+        """
+        Make sure that the distributions of all the packages to install are cached,
+        before installing anything, since they cannot be downloaded while offline.
+        """
+        missing = []
+        for operation in operations:
+            if operation.job_type == "uninstall" or operation.skipped:
+                continue
+
+            package = operation.package
+            if package.source_type in {"directory", "file"}:
+                continue
+
+            if package.source_type == "git":
+                missing.append("git repository {}".format(package.source_url))
+                continue
+
+            try:
+                if package.source_type == "url":
+                    link = Link(package.source_url)
+                else:
+                    link = self._chooser.choose_for(package)
+            except OfflineError as e:
+                missing += e.missing
+                continue
+
+            if self._chef.get_cached_archive_for_link(link) is link:
+                missing.append(link.url_without_fragment)
+
+        if missing:
+            raise OfflineError(missing)
+
     def _write(self, operation: "OperationTypes", line: str) -> None:
         if not self.supports_fancy_output() or not self._should_write_operation(
             operation
@@ -623,6 +664,9 @@ class Executor(object):
 
         archive = self._chef.get_cached_archive_for_link(link)
         if archive is link:
+            if self._pool.offline:
+                raise OfflineError([link.url_without_fragment])
+
             # No cached distributions was found, so we download and prepare it
             try:
                 archive = self._download_archive(operation, link)
@@ -680,7 +724,8 @@ class Executor(object):
         done = 0
         archive = self._chef.get_cache_directory_for_link(link) / link.filename
         archive.parent.mkdir(parents=True, exist_ok=True)
-        with archive.open("wb") as f:
+        # Closing the response lets another download to the same host start
+        with response, archive.open("wb") as f:
             for chunk in response.iter_content(chunk_size=4096):
                 if not chunk:
                     break
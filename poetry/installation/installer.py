@@ -10,12 +10,16 @@ from cleo.io.null_io import NullIO
 from poetry.config.config import Config
 from poetry.core.packages.project_package import ProjectPackage
 from poetry.packages import Locker
+from poetry.puzzle.resolution_cache import ResolutionCache
 from poetry.repositories import Pool
 from poetry.repositories import Repository
 from poetry.repositories.installed_repository import InstalledRepository
 from poetry.utils.extras import get_extra_package_names
 from poetry.utils.helpers import canonicalize_name
+from poetry.utils.helpers import parse_size
+from poetry.utils.http_client import get_http_clients
 
+from .artifact_cache import ArtifactCache
 from .base_installer import BaseInstaller
 from .executor import Executor
 from .operations import Install
@@ -26,6 +30,7 @@ from .pip_installer import PipInstaller
 
 
 if TYPE_CHECKING:
+    from poetry.puzzle import Solver
     from poetry.utils.env import Env
 
     from .operations import OperationTypes
@@ -48,6 +53,7 @@ class Installer:
         self._package = package
         self._locker = locker
         self._pool = pool
+        self._config = config
 
         self._dry_run = False
         self._remove_untracked = False
@@ -109,7 +115,17 @@ class Installer:
 
         local_repo = Repository()
 
-        return self._do_install(local_repo)
+        result = self._do_install(local_repo)
+        if result == 0 and self._execute_operations:
+            self._prune_artifacts()
+
+        if self._io.is_verbose():
+            self._display_host_limits()
+
+        if self._io.is_debug():
+            self._display_connection_stats()
+
+        return result
 
     def dry_run(self, dry_run: bool = True) -> "Installer":
         self._dry_run = dry_run
@@ -134,6 +150,14 @@ class Installer:
 
         return self
 
+    def offline(self, offline: bool = True) -> "Installer":
+        self._pool.set_offline(offline)
+
+        return self
+
+    def is_offline(self) -> bool:
+        return self._pool.offline
+
     def is_verbose(self) -> bool:
         return self._verbose
 
@@ -209,7 +233,10 @@ class Installer:
             locked_repository,
             locked_repository,
             self._io,
+            config=self._config,
+            resolution_cache=self._get_resolution_cache(),
         )
+        self._use_locked_metadata(solver)
 
         ops = solver.solve(use_latest=[])
 
@@ -225,9 +252,14 @@ class Installer:
 
         locked_repository = Repository()
         if self._update:
+            incremental = False
             if self._locker.is_locked() and not self._lock:
                 locked_repository = self._locker.locked_repository(True)
 
+                # Only the whitelisted packages and their dependencies
+                # need to be solved for, the others can be kept as they are.
+                incremental = bool(self._whitelist)
+
                 # If no packages have been whitelisted (The ones we want to update),
                 # we whitelist every package in the lock file.
                 if not self._whitelist:
@@ -247,7 +279,11 @@ class Installer:
                 locked_repository,
                 self._io,
                 remove_untracked=self._remove_untracked,
+                config=self._config,
+                resolution_cache=self._get_resolution_cache(),
+                incremental=incremental,
             )
+            self._use_locked_metadata(solver)
 
             ops = solver.solve(use_latest=self._whitelist)
         else:
@@ -335,6 +371,70 @@ class Installer:
         # Execute operations
         return self._execute(ops)
 
+    def _get_resolution_cache(self) -> Optional[ResolutionCache]:
+        if not self._config.get("solver.resolution-cache"):
+            return None
+
+        return ResolutionCache.from_config(self._config, self._locker)
+
+    def _use_locked_metadata(self, solver: "Solver") -> None:
+        """
+        Let the solver rely on the dependencies recorded in the lock file
+        for the locked versions, if configured to.
+        """
+        if not self._config.get("solver.trust-locked-metadata"):
+            return
+
+        if not self._locker.is_locked():
+            return
+
+        solver.provider.set_locked_metadata(
+            self._locker.locked_repository(True).packages
+        )
+
+    def _prune_artifacts(self) -> None:
+        """
+        Evict the least recently used artifacts
+        if the artifact cache is larger than its configured maximum size.
+        """
+        max_size = self._config.get("cache.artifacts.max-size")
+        if max_size is None:
+            return
+
+        removed = ArtifactCache.from_config(self._config).prune(
+            max_size=parse_size(max_size)
+        )
+        if removed and self._io.is_verbose():
+            self._io.write_line(
+                "Removed <info>{}</> cached artifacts ({:.1f} MB)".format(
+                    len(removed), sum(size for _, size in removed) / 2 ** 20
+                )
+            )
+
+    def _display_connection_stats(self) -> None:
+        for host, stats in sorted(get_http_clients().stats().items()):
+            self._io.write_line(
+                "<debug>HTTP connections to {}: {} opened, {} reused</debug>".format(
+                    host, stats.opened, stats.reused
+                )
+            )
+
+    def _display_host_limits(self) -> None:
+        for host, limiter in sorted(get_http_clients().limiters().items()):
+            if not limiter.throttled:
+                continue
+
+            self._io.write_line(
+                "<debug>Requests to {} throttled {} time{}: "
+                "now {} at once and {:.1f} per second</debug>".format(
+                    host,
+                    limiter.throttled,
+                    "" if limiter.throttled == 1 else "s",
+                    limiter.limit,
+                    limiter.rate,
+                )
+            )
+
     def _write_lock_file(self, repo: Repository, force: bool = True) -> None:
         if force or (self._update and self._write_lock):
             updated_lock = self._locker.set_lock_data(self._package, repo.packages)
@@ -18,7 +18,10 @@ def resolve_version(
     provider: "Provider",
     locked: Dict[str, "DependencyPackage"] = None,
     use_latest: List[str] = None,
+    heuristic: str = "fewest-versions",
 ) -> "SolverResult":
-    solver = VersionSolver(root, provider, locked=locked, use_latest=use_latest)
+    solver = VersionSolver(
+        root, provider, locked=locked, use_latest=use_latest, heuristic=heuristic
+    )
 
     return solver.solve()
@@ -0,0 +1,121 @@
+import threading
+
+from contextlib import contextmanager
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import Iterator
+from typing import Optional
+from typing import Tuple
+
+from poetry.core.semver.version_union import VersionUnion
+
+
+if TYPE_CHECKING:
+    from poetry.core.semver import VersionTypes
+
+
+_local = threading.local()
+
+
+class ConstraintCache:
+    """
+    Memoizes the operations on version constraints
+    that terms perform while solving.
+
+    Constraints of the same type with the same string representation
+    and the same upper bounds are interned to the same key, so that
+    the operations are looked up without hashing the constraints again.
+    The constraints are referenced by the cache for as long as it is used.
+    """
+
+    def __init__(self) -> None:
+        # The key of each constraint seen so far, by id.
+        self._ids: Dict[int, Tuple["VersionTypes", int]] = {}
+        self._keys: Dict[Tuple[type, str, Tuple[str, ...]], int] = {}
+
+        self._results: Dict[Tuple[str, int, int], Any] = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def current(cls) -> Optional["ConstraintCache"]:
+        """
+        Returns the cache used by the current thread, if any.
+        """
+        return getattr(_local, "cache", None)
+
+    @contextmanager
+    def use(self) -> Iterator["ConstraintCache"]:
+        """
+        Uses this cache for the operations of the current thread.
+        """
+        previous = self.current()
+        _local.cache = self
+
+        try:
+            yield self
+        finally:
+            _local.cache = previous
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        if not lookups:
+            return 0.0
+
+        return self.hits / lookups
+
+    def apply(
+        self, operation: str, constraint: "VersionTypes", other: "VersionTypes"
+    ) -> Any:
+        """
+        Returns the result of constraint.<operation>(other).
+        """
+        key = (operation, self._key(constraint), self._key(other))
+
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+
+            result = self._results[key] = getattr(constraint, operation)(other)
+
+            return result
+
+        self.hits += 1
+
+        return result
+
+    def _key(self, constraint: "VersionTypes") -> int:
+        interned = self._ids.get(id(constraint))
+        if interned is None:
+            if isinstance(constraint, VersionUnion):
+                ranges = constraint.ranges
+            else:
+                ranges = [constraint]
+
+            # The string representation of a range does not tell
+            # whether it allows the pre-releases of its upper bound.
+            canonical = (
+                type(constraint),
+                str(constraint),
+                tuple(str(getattr(range_, "full_max", None)) for range_ in ranges),
+            )
+            key = self._keys.setdefault(canonical, len(self._keys))
+            interned = self._ids[id(constraint)] = (constraint, key)
+
+        return interned[1]
+
+
+def apply(operation: str, constraint: "VersionTypes", other: "VersionTypes") -> Any:
+    """
+    Returns the result of constraint.<operation>(other),
+    memoized by the cache of the current thread if any.
+    """
+    cache = ConstraintCache.current()
+    if cache is None:
+        return getattr(constraint, operation)(other)
+
+    return cache.apply(operation, constraint, other)
@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 from typing import Dict
 from typing import List
+from typing import Optional
+from typing import Set
 
 from .assignment import Assignment
 from .incompatibility import Incompatibility
@@ -27,6 +29,15 @@ class PartialSolution:
         # assigned.
         self._assignments: List[Assignment] = []
 
+        # The assignments made so far for each package, in the order they were
+        # assigned, along with their index in _assignments, and the intersections
+        # of their successive prefixes.
+        #
+        # The intersections are computed when first needed by satisfier().
+        self._package_assignments: Dict[str, List[Assignment]] = dict()
+        self._package_indices: Dict[str, List[int]] = dict()
+        self._package_prefixes: Dict[str, List[Optional[Term]]] = dict()
+
         # The decisions made for each package.
         self._decisions: Dict[str, "Package"] = dict()
 
@@ -36,6 +47,15 @@ class PartialSolution:
         # This is derived from self._assignments.
         self._positive: Dict[str, Term] = dict()
 
+        # The rank of each package of _positive in its order,
+        # increasing with each package added or moved to its end.
+        self._positive_ranks: Dict[str, int] = dict()
+        self._next_rank = 0
+
+        # The packages whose positive term, rank or decision changed
+        # since take_changed() was last called.
+        self._changed: Set[str] = set()
+
         # The union of all negative Assignments for each package.
         #
         # If a package has any positive Assignments, it doesn't appear in this
@@ -62,6 +82,32 @@ class PartialSolution:
     def attempted_solutions(self) -> int:
         return self._attempted_solutions
 
+    def positive(self, name: str) -> Optional[Term]:
+        """
+        Returns the positive term of the package, if any.
+        """
+        return self._positive.get(name)
+
+    def rank(self, name: str) -> int:
+        """
+        Returns the rank of the positive term of the package
+        in the order in which unsatisfied() returns them.
+        """
+        return self._positive_ranks[name]
+
+    def is_decided(self, name: str) -> bool:
+        return name in self._decisions
+
+    def take_changed(self) -> Set[str]:
+        """
+        Returns the packages whose positive term, rank or decision changed
+        since the last call, and forgets them.
+        """
+        changed = self._changed
+        self._changed = set()
+
+        return changed
+
     @property
     def unsatisfied(self) -> List["Dependency"]:
         return [
@@ -109,6 +155,9 @@ class PartialSolution:
         """
         Adds an Assignment to _assignments and _positive or _negative.
         """
+        name = assignment.dependency.complete_name
+        self._package_assignments.setdefault(name, []).append(assignment)
+        self._package_indices.setdefault(name, []).append(len(self._assignments))
         self._assignments.append(assignment)
         self._register(assignment)
 
@@ -122,21 +171,41 @@ class PartialSolution:
         packages = set()
         while self._assignments[-1].decision_level > decision_level:
             removed = self._assignments.pop(-1)
-            packages.add(removed.dependency.complete_name)
+            package = removed.dependency.complete_name
+            packages.add(package)
+            self._package_assignments[package].pop(-1)
+            self._package_indices[package].pop(-1)
             if removed.is_decision():
-                del self._decisions[removed.dependency.complete_name]
+                del self._decisions[package]
+
+        self._changed.update(packages)
 
         # Re-compute _positive and _negative for the packages that were removed.
+        #
+        # The positive terms are kept in the order in which they first became
+        # positive, since it is the order in which unsatisfied() returns them.
+        positive_since = dict()
         for package in packages:
             if package in self._positive:
                 del self._positive[package]
+                del self._positive_ranks[package]
 
             if package in self._negative:
                 del self._negative[package]
 
-        for assignment in self._assignments:
-            if assignment.dependency.complete_name in packages:
+            assignments = self._package_assignments[package]
+            prefixes = self._package_prefixes.get(package)
+            if prefixes is not None:
+                del prefixes[len(assignments) :]
+
+            for index, assignment in zip(self._package_indices[package], assignments):
                 self._register(assignment)
+                if package not in positive_since and package in self._positive:
+                    positive_since[package] = index
+
+        for package in sorted(positive_since, key=positive_since.get):
+            self._positive[package] = self._positive.pop(package)
+            self._rank(package)
 
     def _register(self, assignment: Assignment) -> None:
         """
@@ -146,6 +215,7 @@ class PartialSolution:
         old_positive = self._positive.get(name)
         if old_positive is not None:
             self._positive[name] = old_positive.intersect(assignment)
+            self._changed.add(name)
 
             return
 
@@ -162,23 +232,49 @@ class PartialSolution:
                 del self._negative[name]
 
             self._positive[name] = term
+            self._rank(name)
         else:
             if name not in self._negative:
                 self._negative[name] = {}
 
             self._negative[name][ref] = term
 
+    def _rank(self, name: str) -> None:
+        self._positive_ranks[name] = self._next_rank
+        self._next_rank += 1
+        self._changed.add(name)
+
     def satisfier(self, term: Term) -> Assignment:
         """
         Returns the first Assignment in this solution such that the sublist of
         assignments up to and including that entry collectively satisfies term.
         """
-        assigned_term = None
+        name = term.dependency.complete_name
+        assignments = self._package_assignments.get(name, [])
+
+        if all(
+            assignment.dependency.is_root
+            or assignment.dependency.is_same_package_as(term.dependency)
+            for assignment in assignments
+        ):
+            # All the assignments are intersected:
+            # the intersections of the successive prefixes can be reused.
+            prefixes = self._package_prefixes.setdefault(name, [])
+            for i, assignment in enumerate(assignments):
+                if i == len(prefixes):
+                    prefixes.append(
+                        assignment if not i else prefixes[-1].intersect(assignment)
+                    )
+
+                # As soon as we have enough assignments to satisfy term, return them.
+                if prefixes[i].satisfies(term):
+                    return assignment
+
+            raise RuntimeError("[BUG] {} is not satisfied.".format(term))
 
-        for assignment in self._assignments:
-            if assignment.dependency.complete_name != term.dependency.complete_name:
-                continue
+        assigned_term = None
 
+        for assignment in assignments:
             if (
                 not assignment.dependency.is_root
                 and not assignment.dependency.is_same_package_as(term.dependency)
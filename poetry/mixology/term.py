@@ -4,6 +4,7 @@ from typing import Optional
 
 from poetry.core.packages import Dependency
 
+from .constraint_cache import apply
 from .set_relation import SetRelation
 
 
@@ -65,11 +66,11 @@ class Term(object):
                     return SetRelation.DISJOINT
 
                 # foo ^1.5.0 is a subset of foo ^1.0.0
-                if other_constraint.allows_all(self.constraint):
+                if apply("allows_all", other_constraint, self.constraint):
                     return SetRelation.SUBSET
 
                 # foo ^2.0.0 is disjoint with foo ^1.0.0
-                if not self.constraint.allows_any(other_constraint):
+                if not apply("allows_any", self.constraint, other_constraint):
                     return SetRelation.DISJOINT
 
                 return SetRelation.OVERLAPPING
@@ -78,7 +79,7 @@ class Term(object):
                     return SetRelation.OVERLAPPING
 
                 # not foo ^1.0.0 is disjoint with foo ^1.5.0
-                if self.constraint.allows_all(other_constraint):
+                if apply("allows_all", self.constraint, other_constraint):
                     return SetRelation.DISJOINT
 
                 # not foo ^1.5.0 overlaps foo ^1.0.0
@@ -90,11 +91,11 @@ class Term(object):
                     return SetRelation.SUBSET
 
                 # foo ^2.0.0 is a subset of not foo ^1.0.0
-                if not other_constraint.allows_any(self.constraint):
+                if not apply("allows_any", other_constraint, self.constraint):
                     return SetRelation.SUBSET
 
                 # foo ^1.5.0 is disjoint with not foo ^1.0.0
-                if other_constraint.allows_all(self.constraint):
+                if apply("allows_all", other_constraint, self.constraint):
                     return SetRelation.DISJOINT
 
                 # foo ^1.0.0 overlaps not foo ^1.5.0
@@ -104,7 +105,7 @@ class Term(object):
                     return SetRelation.OVERLAPPING
 
                 # not foo ^1.0.0 is a subset of not foo ^1.5.0
-                if self.constraint.allows_all(other_constraint):
+                if apply("allows_all", self.constraint, other_constraint):
                     return SetRelation.SUBSET
 
                 # not foo ^2.0.0 overlaps not foo ^1.0.0
@@ -128,17 +129,17 @@ class Term(object):
                 negative = other if self.is_positive() else self
 
                 return self._non_empty_term(
-                    positive.constraint.difference(negative.constraint), True
+                    apply("difference", positive.constraint, negative.constraint), True
                 )
             elif self.is_positive():
                 # foo ^1.0.0 ∩ foo >=1.5.0 <3.0.0 → foo ^1.5.0
                 return self._non_empty_term(
-                    self.constraint.intersect(other.constraint), True
+                    apply("intersect", self.constraint, other.constraint), True
                 )
             else:
                 # not foo ^1.0.0 ∩ not foo >=1.5.0 <3.0.0 → not foo >=1.0.0 <3.0.0
                 return self._non_empty_term(
-                    self.constraint.union(other.constraint), False
+                    apply("union", self.constraint, other.constraint), False
                 )
         elif self.is_positive() != other.is_positive():
             return self if self.is_positive() else other
@@ -1,16 +1,22 @@
 # -*- coding: utf-8 -*-
+import heapq
+import itertools
 import time
 
 from typing import TYPE_CHECKING
+from typing import Any
 from typing import Dict
 from typing import List
 from typing import Optional
+from typing import Set
+from typing import Tuple
 from typing import Union
 
 from poetry.core.packages import Dependency
 from poetry.core.packages import Package
 from poetry.core.packages import ProjectPackage
 
+from .constraint_cache import ConstraintCache
 from .failure import SolveFailure
 from .incompatibility import Incompatibility
 from .incompatibility_cause import ConflictCause
@@ -29,6 +35,12 @@ if TYPE_CHECKING:
 
 _conflict = object()
 
+# The heuristics available to choose the next package to decide.
+DECISION_HEURISTICS = ("fewest-versions", "conflict-activity", "locked-first")
+
+# The factor by which the activity of the packages decays after each conflict.
+ACTIVITY_DECAY = 0.95
+
 
 class VersionSolver:
     """
@@ -45,19 +57,62 @@ class VersionSolver:
         provider: "Provider",
         locked: Dict[str, Package] = None,
         use_latest: List[str] = None,
+        heuristic: str = "fewest-versions",
     ):
+        if heuristic not in DECISION_HEURISTICS:
+            raise ValueError(
+                "Unknown decision heuristic {}, expected one of {}".format(
+                    heuristic, ", ".join(DECISION_HEURISTICS)
+                )
+            )
+
         self._root = root
         self._provider = provider
+        self._is_debugging = provider.is_debugging()
         self._locked = locked or {}
 
         if use_latest is None:
             use_latest = []
 
         self._use_latest = use_latest
+        self._heuristic = heuristic
+
+        # The number of versions available for each package, by name,
+        # along with the dependency they were counted for.
+        #
+        # They only have to be counted again when the constraint
+        # of the package changes.
+        self._version_counts: Dict[str, Tuple[Dependency, int]] = {}
+
+        # The activity of each package, by name: how much and how recently
+        # it has been involved in conflicts.
+        self._activity: Dict[str, float] = {}
+        self._activity_increment = 1.0
+
+        # The candidates for the next decision, as a heap of
+        # (key, rank, count, name, dependency) entries ordered by _decision_key()
+        # and, for equal keys, by the order of PartialSolution.unsatisfied.
+        #
+        # Entries are pushed again for the packages whose key or rank changes.
+        # Those left behind are only discarded once they reach the top.
+        self._candidates: List[Tuple[Tuple, int, int, str, Dependency]] = []
+        self._pushed = itertools.count()
+        self._activity_changed: Set[str] = set()
 
         self._incompatibilities: Dict[str, List[Incompatibility]] = {}
+
+        # The names of the two packages whose terms are watched
+        # for each incompatibility, by id, or None if all its terms are watched.
+        #
+        # Watched terms are kept not satisfied by _solution as it changes:
+        # as long as that holds, the incompatibility can be neither almost
+        # satisfied nor satisfied, and unit propagation skips it.
+        self._watches: Dict[int, Optional[Tuple[str, str]]] = {}
+
         self._solution = PartialSolution()
 
+        self._constraint_cache = ConstraintCache()
+
     @property
     def solution(self) -> PartialSolution:
         return self._solution
@@ -76,20 +131,25 @@ class VersionSolver:
         )
 
         try:
-            next = self._root.name
-            while next is not None:
-                self._propagate(next)
-                next = self._choose_package_version()
+            with self._constraint_cache.use():
+                next = self._root.name
+                while next is not None:
+                    self._propagate(next)
+                    next = self._choose_package_version()
 
-            return self._result()
+                return self._result()
         except Exception:
             raise
         finally:
             self._log(
                 "Version solving took {:.3f} seconds.\n"
-                "Tried {} solutions.".format(
-                    time.time() - start, self._solution.attempted_solutions
-                )
+                "Tried {} solutions.\n"
+                "Constraint cache: {} hits, {} misses ({:.0%} hit rate).",
+                time.time() - start,
+                self._solution.attempted_solutions,
+                self._constraint_cache.hits,
+                self._constraint_cache.misses,
+                self._constraint_cache.hit_rate,
             )
 
     def _propagate(self, package: str) -> None:
@@ -108,6 +168,11 @@ class VersionSolver:
             # we can derive stronger assignments sooner and more eagerly find
             # conflicts.
             for incompatibility in reversed(self._incompatibilities[package]):
+                if self._watches[id(incompatibility)] is not None:
+                    # Two of its terms are not satisfied by _solution:
+                    # there is nothing to deduce from it.
+                    continue
+
                 result = self._propagate_incompatibility(incompatibility)
 
                 if result is _conflict:
@@ -128,6 +193,39 @@ class VersionSolver:
                     break
                 elif result is not None:
                     changed.add(result)
+                elif self._watches[id(incompatibility)] is None:
+                    # Backtracking may have left enough terms unsatisfied
+                    # to watch only two of them again.
+                    self._watches[id(incompatibility)] = self._watch(incompatibility)
+
+    def _update_watches(self, package: str) -> None:
+        """
+        Stops watching the terms about package that _solution now satisfies,
+        watching other terms of their incompatibilities instead if possible.
+        """
+        for incompatibility in self._incompatibilities.get(package, []):
+            watched = self._watches[id(incompatibility)]
+            if watched is None or package not in watched:
+                continue
+
+            for term in incompatibility.terms:
+                if term.dependency.complete_name == package:
+                    break
+
+            if self._solution.relation(term) == SetRelation.SUBSET:
+                self._watches[id(incompatibility)] = self._watch(incompatibility)
+
+    def _watch(self, incompatibility: Incompatibility) -> Optional[Tuple[str, str]]:
+        """
+        Returns the names of two packages whose terms in incompatibility
+        are not satisfied by _solution, or None if all the terms must be watched.
+        """
+        names = []
+        for term in incompatibility.terms:
+            if self._solution.relation(term) != SetRelation.SUBSET:
+                names.append(term.dependency.complete_name)
+                if len(names) == 2:
+                    return names[0], names[1]
 
     def _propagate_incompatibility(
         self, incompatibility: Incompatibility
@@ -172,14 +270,15 @@ class VersionSolver:
             return _conflict
 
         self._log(
-            "derived: {}{}".format(
-                "not " if unsatisfied.is_positive() else "", unsatisfied.dependency
-            )
+            "derived: {}{}",
+            "not " if unsatisfied.is_positive() else "",
+            unsatisfied.dependency,
         )
 
         self._solution.derive(
             unsatisfied.dependency, not unsatisfied.is_positive(), incompatibility
         )
+        self._update_watches(unsatisfied.dependency.complete_name)
 
         return unsatisfied.dependency.complete_name
 
@@ -194,10 +293,12 @@ class VersionSolver:
 
         .. _conflict resolution: https://github.com/dart-lang/pub/tree/master/doc/solver.md#conflict-resolution
         """
-        self._log("conflict: {}".format(incompatibility))
+        self._log("conflict: {}", incompatibility)
 
         new_incompatibility = False
         while not incompatibility.is_failure():
+            self._bump_activity(incompatibility)
+
             # The term in incompatibility.terms that was most recently satisfied by
             # _solution.
             most_recent_term = None
@@ -265,6 +366,8 @@ class VersionSolver:
                 if new_incompatibility:
                     self._add_incompatibility(incompatibility)
 
+                self._activity_increment /= ACTIVITY_DECAY
+
                 return incompatibility
 
             # Create a new incompatibility by combining incompatibility with the
@@ -305,14 +408,14 @@ class VersionSolver:
             partially = "" if difference is None else " partially"
             bang = "!"
             self._log(
-                "{} {} is{} satisfied by {}".format(
-                    bang, most_recent_term, partially, most_recent_satisfier
-                )
-            )
-            self._log(
-                '{} which is caused by "{}"'.format(bang, most_recent_satisfier.cause)
+                "{} {} is{} satisfied by {}",
+                bang,
+                most_recent_term,
+                partially,
+                most_recent_satisfier,
             )
-            self._log("{} thus: {}".format(bang, incompatibility))
+            self._log('{} which is caused by "{}"', bang, most_recent_satisfier.cause)
+            self._log("{} thus: {}", bang, incompatibility)
 
         raise SolveFailure(incompatibility)
 
@@ -324,46 +427,10 @@ class VersionSolver:
         propagated by _propagate(), or None indicating that version solving is
         complete and a solution has been found.
         """
-        unsatisfied = self._solution.unsatisfied
-        if not unsatisfied:
+        dependency = self._next_candidate()
+        if dependency is None:
             return
 
-        # Prefer packages with as few remaining versions as possible,
-        # so that if a conflict is necessary it's forced quickly.
-        def _get_min(dependency: Dependency) -> int:
-            if dependency.name in self._use_latest:
-                # If we're forced to use the latest version of a package, it effectively
-                # only has one version to choose from.
-                return 1
-
-            locked = self._get_locked(dependency)
-            if locked and (
-                dependency.constraint.allows(locked.version)
-                or locked.is_prerelease()
-                and dependency.constraint.allows(locked.version.next_patch)
-            ):
-                return 1
-
-            # VCS, URL, File or Directory dependencies
-            # represent a single version
-            if (
-                dependency.is_vcs()
-                or dependency.is_url()
-                or dependency.is_file()
-                or dependency.is_directory()
-            ):
-                return 1
-
-            try:
-                return len(self._provider.search_for(dependency))
-            except ValueError:
-                return 0
-
-        if len(unsatisfied) == 1:
-            dependency = unsatisfied[0]
-        else:
-            dependency = min(*unsatisfied, key=_get_min)
-
         locked = self._get_locked(dependency)
         if locked is None or not dependency.constraint.allows(locked.version):
             try:
@@ -409,13 +476,145 @@ class VersionSolver:
 
         if not conflict:
             self._solution.decide(version)
-            self._log(
-                "selecting {} ({})".format(
-                    version.complete_name, version.full_pretty_version
+            self._update_watches(version.complete_name)
+            self._log("selecting {0.complete_name} ({0.full_pretty_version})", version)
+
+        return dependency.complete_name
+
+    def _next_candidate(self) -> Optional[Dependency]:
+        """
+        Returns the unsatisfied dependency to decide next, if any.
+        """
+        changed = self._solution.take_changed()
+        if self._activity_changed:
+            changed |= self._activity_changed
+            self._activity_changed = set()
+
+        for name in changed:
+            term = self._solution.positive(name)
+            if term is not None and not self._solution.is_decided(name):
+                heapq.heappush(
+                    self._candidates,
+                    (
+                        self._decision_key(term.dependency),
+                        self._solution.rank(name),
+                        next(self._pushed),
+                        name,
+                        term.dependency,
+                    ),
                 )
+
+        while self._candidates:
+            key, rank, _, name, dependency = self._candidates[0]
+            term = self._solution.positive(name)
+            if (
+                term is not None
+                and term.dependency is dependency
+                and not self._solution.is_decided(name)
+                and self._solution.rank(name) == rank
+                and self._decision_key(dependency) == key
+            ):
+                return dependency
+
+            heapq.heappop(self._candidates)
+
+        return None
+
+    def _decision_key(self, dependency: Dependency) -> Tuple:
+        """
+        Returns the key by which unsatisfied dependencies are ordered
+        to choose the next package to decide, according to the heuristic.
+        """
+        if self._heuristic == "conflict-activity":
+            # Prefer the packages involved in the most recent conflicts,
+            # so that the solver focuses on the part of the graph that is hard.
+            return (
+                -self._activity.get(dependency.complete_name, 0.0),
+                self._count_versions(dependency),
             )
 
-        return dependency.complete_name
+        if self._heuristic == "locked-first":
+            # Prefer the packages whose locked version can be kept,
+            # so that the lock file changes as little as possible.
+            return (
+                not self._allows_locked(dependency),
+                self._count_versions(dependency),
+            )
+
+        # Prefer packages with as few remaining versions as possible,
+        # so that if a conflict is necessary it's forced quickly.
+        return (self._count_versions(dependency),)
+
+    def _count_versions(self, dependency: Dependency) -> int:
+        """
+        Returns the number of versions that can be chosen for dependency.
+        """
+        counted = self._version_counts.get(dependency.complete_name)
+        if counted is not None and (
+            counted[0] is dependency or counted[0] == dependency
+        ):
+            return counted[1]
+
+        if dependency.is_root:
+            # The root package only has its own version
+            count = 1
+        elif dependency.name in self._use_latest:
+            # If we're forced to use the latest version of a package, it effectively
+            # only has one version to choose from.
+            count = 1
+        elif self._allows_locked(dependency):
+            count = 1
+        elif (
+            dependency.is_vcs()
+            or dependency.is_url()
+            or dependency.is_file()
+            or dependency.is_directory()
+        ):
+            # VCS, URL, File or Directory dependencies
+            # represent a single version
+            count = 1
+        else:
+            try:
+                count = len(self._provider.search_for(dependency))
+            except ValueError:
+                count = 0
+
+        self._version_counts[dependency.complete_name] = (dependency, count)
+
+        return count
+
+    def _allows_locked(self, dependency: Dependency) -> bool:
+        locked = self._get_locked(dependency)
+
+        return locked is not None and (
+            dependency.constraint.allows(locked.version)
+            or locked.is_prerelease()
+            and dependency.constraint.allows(locked.version.next_patch)
+        )
+
+    def _bump_activity(self, incompatibility: Incompatibility) -> None:
+        """
+        Increases the activity of the packages of incompatibility,
+        which takes part in the resolution of a conflict.
+        """
+        if self._heuristic != "conflict-activity":
+            return
+
+        for term in incompatibility.terms:
+            name = term.dependency.complete_name
+            self._activity[name] = (
+                self._activity.get(name, 0.0) + self._activity_increment
+            )
+            self._activity_changed.add(name)
+
+        if self._activity_increment > 1e100:
+            # Scale everything down before the activities overflow.
+            for name in self._activity:
+                self._activity[name] *= 1e-100
+
+            self._activity_changed.update(self._activity)
+
+            self._activity_increment *= 1e-100
 
     def _result(self) -> SolverResult:
         """
@@ -430,7 +629,9 @@ class VersionSolver:
         )
 
     def _add_incompatibility(self, incompatibility: Incompatibility) -> None:
-        self._log("fact: {}".format(incompatibility))
+        self._log("fact: {}", incompatibility)
+
+        self._watches[id(incompatibility)] = self._watch(incompatibility)
 
         for term in incompatibility.terms:
             if term.dependency.complete_name not in self._incompatibilities:
@@ -459,5 +660,17 @@ class VersionSolver:
 
         return locked
 
-    def _log(self, text: str) -> None:
-        self._provider.debug(text, self._solution.attempted_solutions)
+    def _log(self, message: str, *args: Any) -> None:
+        """
+        Logs message, formatted with args, if the provider is debugging.
+
+        Messages are only formatted when they are logged: formatting
+        incompatibilities is expensive and logging happens at every step.
+        """
+        if not self._is_debugging:
+            return
+
+        if args:
+            message = message.format(*args)
+
+        self._provider.debug(message, self._solution.attempted_solutions)
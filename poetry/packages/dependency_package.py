@@ -1,5 +1,6 @@
 from typing import Any
 from typing import List
+from typing import Tuple
 from typing import Union
 
 from poetry.core.packages.dependency import Dependency
@@ -37,6 +38,11 @@ class DependencyPackage(object):
 
         setattr(self._package, key, value)
 
+    def __reduce__(self) -> Tuple[type, Tuple[Dependency, Package]]:
+        # Attribute lookups are forwarded to the package,
+        # which is not there yet while unpickling.
+        return self.__class__, (self._dependency, self._package)
+
     def __str__(self) -> str:
         return str(self._package)
 
@@ -60,6 +60,13 @@ class Locker(object):
     def lock(self) -> TOMLFile:
         return self._lock
 
+    @property
+    def content_hash(self) -> str:
+        """
+        The hash of the relevant content of the pyproject file.
+        """
+        return self._content_hash
+
     @property
     def lock_data(self) -> "TOMLDocument":
         if self._lock_data is None:
@@ -94,8 +101,6 @@ class Locker(object):
         """
         Searches and returns a repository of locked packages.
         """
-        from poetry.factory import Factory
-
         if not self.is_locked():
             return poetry.repositories.Repository()
 
@@ -113,92 +118,102 @@ class Locker(object):
             return packages
 
         for info in locked_packages:
-            source = info.get("source", {})
-            source_type = source.get("type")
-            url = source.get("url")
-            if source_type in ["directory", "file"]:
-                url = self._lock.path.parent.joinpath(url).resolve().as_posix()
-
-            package = Package(
-                info["name"],
-                info["version"],
-                info["version"],
-                source_type=source_type,
-                source_url=url,
-                source_reference=source.get("reference"),
-                source_resolved_reference=source.get("resolved_reference"),
-            )
-            package.description = info.get("description", "")
-            package.category = info["category"]
-            package.optional = info["optional"]
             if "hashes" in lock_data["metadata"]:
                 # Old lock so we create dummy files from the hashes
-                package.files = [
+                files = [
                     {"name": h, "hash": h}
                     for h in lock_data["metadata"]["hashes"][info["name"]]
                 ]
             else:
-                package.files = lock_data["metadata"]["files"][info["name"]]
-
-            package.python_versions = info["python-versions"]
-            extras = info.get("extras", {})
-            if extras:
-                for name, deps in extras.items():
-                    package.extras[name] = []
-
-                    for dep in deps:
-                        try:
-                            dependency = dependency_from_pep_508(dep)
-                        except InvalidRequirement:
-                            # handle lock files with invalid PEP 508
-                            m = re.match(r"^(.+?)(?:\[(.+?)])?(?:\s+\((.+)\))?$", dep)
-                            dep_name = m.group(1)
-                            extras = m.group(2) or ""
-                            constraint = m.group(3) or "*"
-                            dependency = Dependency(
-                                dep_name, constraint, extras=extras.split(",")
-                            )
-                        package.extras[name].append(dependency)
+                files = lock_data["metadata"]["files"][info["name"]]
 
-            if "marker" in info:
-                package.marker = parse_marker(info["marker"])
-            else:
-                # Compatibility for old locks
-                if "requirements" in info:
-                    dep = Dependency("foo", "0.0.0")
-                    for name, value in info["requirements"].items():
-                        if name == "python":
-                            dep.python_versions = value
-                        elif name == "platform":
-                            dep.platform = value
-
-                    split_dep = dep.to_pep_508(False).split(";")
-                    if len(split_dep) > 1:
-                        package.marker = parse_marker(split_dep[1].strip())
-
-            for dep_name, constraint in info.get("dependencies", {}).items():
-                if isinstance(constraint, list):
-                    for c in constraint:
-                        package.add_dependency(
-                            Factory.create_dependency(
-                                dep_name, c, root_dir=self._lock.path.parent
-                            )
-                        )
+            packages.add_package(self._load_package(info, files))
 
-                    continue
+        return packages
 
-                package.add_dependency(
-                    Factory.create_dependency(
-                        dep_name, constraint, root_dir=self._lock.path.parent
+    def _load_package(self, info: dict, files: List[dict]) -> Package:
+        """
+        Returns the package described by an entry of the lock file.
+        """
+        from poetry.factory import Factory
+
+        source = info.get("source", {})
+        source_type = source.get("type")
+        url = source.get("url")
+        if source_type in ["directory", "file"]:
+            url = self._lock.path.parent.joinpath(url).resolve().as_posix()
+
+        package = Package(
+            info["name"],
+            info["version"],
+            info["version"],
+            source_type=source_type,
+            source_url=url,
+            source_reference=source.get("reference"),
+            source_resolved_reference=source.get("resolved_reference"),
+        )
+        package.description = info.get("description", "")
+        package.category = info["category"]
+        package.optional = info["optional"]
+        package.files = files
+
+        package.python_versions = info["python-versions"]
+        extras = info.get("extras", {})
+        if extras:
+            for name, deps in extras.items():
+                package.extras[name] = []
+
+                for dep in deps:
+                    try:
+                        dependency = dependency_from_pep_508(dep)
+                    except InvalidRequirement:
+                        # handle lock files with invalid PEP 508
+                        m = re.match(r"^(.+?)(?:\[(.+?)])?(?:\s+\((.+)\))?$", dep)
+                        dep_name = m.group(1)
+                        extras = m.group(2) or ""
+                        constraint = m.group(3) or "*"
+                        dependency = Dependency(
+                            dep_name, constraint, extras=extras.split(",")
+                        )
+                    package.extras[name].append(dependency)
+
+        if "marker" in info:
+            package.marker = parse_marker(info["marker"])
+        else:
+            # Compatibility for old locks
+            if "requirements" in info:
+                dep = Dependency("foo", "0.0.0")
+                for name, value in info["requirements"].items():
+                    if name == "python":
+                        dep.python_versions = value
+                    elif name == "platform":
+                        dep.platform = value
+
+                split_dep = dep.to_pep_508(False).split(";")
+                if len(split_dep) > 1:
+                    package.marker = parse_marker(split_dep[1].strip())
+
+        for dep_name, constraint in info.get("dependencies", {}).items():
+            if isinstance(constraint, list):
+                for c in constraint:
+                    package.add_dependency(
+                        Factory.create_dependency(
+                            dep_name, c, root_dir=self._lock.path.parent
+                        )
                     )
-                )
 
-            if "develop" in info:
-                package.develop = info["develop"]
+                continue
 
-            packages.add_package(package)
+            package.add_dependency(
+                Factory.create_dependency(
+                    dep_name, constraint, root_dir=self._lock.path.parent
+                )
+            )
 
-        return packages
+        if "develop" in info:
+            package.develop = info["develop"]
+
+        return package
 
     @staticmethod
     def __get_locked_package(
@@ -508,6 +523,9 @@ class Locker(object):
         return locked
 
     def _dump_package(self, package: Package) -> dict:
+        """
+        Returns the entry of the lock file describing the package.
+        """
         dependencies = {}
         for dependency in sorted(package.requires, key=lambda d: d.name):
             if dependency.pretty_name not in dependencies:
@@ -25,6 +25,7 @@ from poetry.core.masonry.metadata import Metadata
 from poetry.core.masonry.utils.helpers import escape_name
 from poetry.core.masonry.utils.helpers import escape_version
 from poetry.utils.helpers import normalize_version
+from poetry.utils.http_client import get_http_clients
 from poetry.utils.patterns import wheel_file_re
 
 
@@ -73,7 +74,7 @@ class Uploader:
             status_forcelist=[500, 501, 502, 503],
         )
 
-        return adapters.HTTPAdapter(max_retries=retry)
+        return get_http_clients().adapter(max_retries=retry)
 
     @property
     def files(self) -> List[Path]:
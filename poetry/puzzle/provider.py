@@ -1,21 +1,30 @@
 import logging
 import os
 import re
+import threading
 import time
 import urllib.parse
 
+from bisect import bisect_left
+from bisect import bisect_right
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from pathlib import Path
 from tempfile import mkdtemp
 from typing import Any
 from typing import Dict
+from typing import FrozenSet
+from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
 from typing import Union
 
 from cleo.ui.progress_indicator import ProgressIndicator
 
+from poetry.config.config import Config
 from poetry.core.packages import Dependency
 from poetry.core.packages import DirectoryDependency
 from poetry.core.packages import FileDependency
@@ -23,7 +32,10 @@ from poetry.core.packages import Package
 from poetry.core.packages import URLDependency
 from poetry.core.packages import VCSDependency
 from poetry.core.packages.utils.utils import get_python_constraint_from_marker
+from poetry.core.semver import VersionTypes
 from poetry.core.semver.version import Version
+from poetry.core.semver.version_range import VersionRange
+from poetry.core.semver.version_union import VersionUnion
 from poetry.core.vcs.git import Git
 from poetry.core.version.markers import MarkerUnion
 from poetry.inspection.info import PackageInfo
@@ -35,11 +47,14 @@ from poetry.mixology.term import Term
 from poetry.packages import DependencyPackage
 from poetry.packages.package_collection import PackageCollection
 from poetry.puzzle.exceptions import OverrideNeeded
+from poetry.puzzle.resolution_cache import MetadataRecorder
 from poetry.repositories import Pool
+from poetry.repositories.exceptions import OfflineError
 from poetry.utils.env import Env
 from poetry.utils.helpers import download_file
 from poetry.utils.helpers import safe_rmtree
 from poetry.utils.helpers import temporary_directory
+from poetry.utils.http_client import get_http_clients
 
 
 logger = logging.getLogger(__name__)
@@ -52,35 +67,333 @@ class Indicator(ProgressIndicator):
         return "{:.1f}s".format(elapsed)
 
 
+class Prefetcher:
+    """
+    Speculatively retrieves the metadata the solver is likely to ask for next.
+
+    Once a package has been completed, the version lists of its dependencies
+    and the release information of their most likely candidates are fetched
+    on a bounded thread pool, so that the corresponding lookups made later
+    by the solver are served from already completed requests.
+
+    Each prefetched result is handed out only once: subsequent lookups
+    go to the pool directly, exactly as they would without prefetching.
+    """
+
+    def __init__(self, pool: Pool, max_workers: int) -> None:
+        self._pool = pool
+        self._max_workers = max_workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._seen = set()
+        self._packages: Dict[Tuple, Future] = {}
+        self._releases: Dict[Tuple, Tuple[FrozenSet[str], Future]] = {}
+        # The versions whose release information is not needed.
+        self._ignored: FrozenSet[Tuple[str, str]] = frozenset()
+        self._hits = 0
+        self._misses = 0
+
+    @property
+    def hits(self) -> int:
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        return self._misses
+
+    def ignore_releases(self, releases: Iterable[Tuple[str, str]]) -> None:
+        """
+        Never prefetch the release information of these names and versions.
+        """
+        self._ignored = frozenset(releases)
+
+    def prefetch(self, dependencies: Iterable[Dependency]) -> None:
+        if self._pool.offline:
+            # Everything is read from the cache, and what is missing
+            # is only reported if the solver needs it.
+            return
+
+        with self._lock:
+            if self._executor is None:
+                get_http_clients().reserve(self._max_workers)
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_workers,
+                    thread_name_prefix="poetry-prefetch",
+                )
+
+            pending = {}
+            for dependency in dependencies:
+                key = self._packages_key(dependency)
+                if key not in self._seen:
+                    self._seen.add(key)
+                    pending[key] = dependency
+
+            if self._pool.fetch_engine is not None and pending:
+                # The version lists are requested all at once, from a single thread,
+                # and the workers looking for them wait for the same requests.
+                self._executor.submit(
+                    self._pool.preload, [d.name for d in pending.values()]
+                )
+
+            for key, dependency in pending.items():
+                self._packages[key] = self._executor.submit(
+                    self._fetch_packages, dependency
+                )
+
+    def find_packages(self, dependency: Dependency) -> List[Package]:
+        with self._lock:
+            future = self._packages.pop(self._packages_key(dependency), None)
+
+        packages = self._result(future)
+        if packages is None:
+            self._count(hit=False)
+
+            return self._pool.find_packages(dependency)
+
+        self._count(hit=True)
+
+        return list(packages)
+
+    def package(
+        self,
+        name: str,
+        version: str,
+        extras: Optional[List[str]] = None,
+        repository: Optional[str] = None,
+    ) -> Package:
+        with self._lock:
+            prefetched = self._releases.pop((name, version, repository), None)
+
+        if prefetched is not None:
+            prefetched_extras, future = prefetched
+            # Even if the extras differ, waiting for the pending request
+            # ensures that the release information has been cached
+            # before we ask for it again.
+            package = self._result(future)
+            if package is not None and prefetched_extras == frozenset(extras or []):
+                self._count(hit=True)
+
+                return package
+
+        self._count(hit=False)
+
+        return self._pool.package(name, version, extras=extras, repository=repository)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Cancels the pending lookups and stops the threads,
+        waiting for the running lookups to finish if asked to.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+            for future in self._packages.values():
+                future.cancel()
+
+            for _, future in self._releases.values():
+                future.cancel()
+
+            self._packages.clear()
+            self._releases.clear()
+            self._seen.clear()
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _fetch_packages(self, dependency: Dependency) -> List[Package]:
+        packages = self._pool.find_packages(dependency)
+        if not packages:
+            return packages
+
+        # The candidate the solver will most likely pick is the one
+        # Provider.search_for() would put first.
+        candidate = max(
+            packages,
+            key=lambda p: (
+                not p.is_prerelease() and not dependency.allows_prereleases(),
+                p.version,
+            ),
+        )
+        self._prefetch_release(dependency, candidate)
+
+        return packages
+
+    def _prefetch_release(self, dependency: Dependency, package: Package) -> None:
+        if (package.name, package.version.text) in self._ignored:
+            return
+
+        key = (package.name, package.version.text, dependency.source_name)
+        extras = frozenset(dependency.extras)
+
+        with self._lock:
+            if self._executor is None or key in self._seen:
+                return
+
+            self._seen.add(key)
+            self._releases[key] = (
+                extras,
+                self._executor.submit(
+                    self._pool.package,
+                    package.name,
+                    package.version.text,
+                    extras=list(extras),
+                    repository=dependency.source_name,
+                ),
+            )
+
+    def _packages_key(self, dependency: Dependency) -> Tuple:
+        return (
+            dependency.complete_name,
+            dependency.source_name,
+            str(dependency.constraint),
+            dependency.allows_prereleases(),
+        )
+
+    def _result(self, future: Optional[Future]) -> Any:
+        if future is None or future.cancelled():
+            return
+
+        try:
+            return future.result()
+        except Exception:
+            # Prefetching is purely speculative: failures are ignored here
+            # and will resurface, if relevant, when the lookup is retried.
+            return
+
+
 class Provider:
 
     UNSAFE_PACKAGES = {"setuptools", "distribute", "pip", "wheel"}
 
     def __init__(
-        self, package: Package, pool: Pool, io: Any, env: Optional[Env] = None
+        self,
+        package: Package,
+        pool: Pool,
+        io: Any,
+        env: Optional[Env] = None,
+        config: Optional[Config] = None,
     ) -> None:
         self._package = package
         self._pool = pool
         self._io = io
         self._env = env
         self._python_constraint = package.python_constraint
-        self._search_for = {}
+        # The packages found for each package name, along with the dependency
+        # they were searched for, sorted from the latest version to the oldest,
+        # and their versions in ascending order.
+        self._search_for: Dict[
+            str, List[Tuple[Dependency, List[Package], List[Version]]]
+        ] = {}
         self._is_debugging = self._io.is_debug() or self._io.is_very_verbose()
         self._in_progress = False
         self._overrides = {}
         self._deferred_cache = {}
         self._load_deferred = True
+        self._recorder: Optional[MetadataRecorder] = None
+        # The locked packages that are kept as they are, by name.
+        self._pinned: Dict[str, Package] = {}
+        # The locked packages whose dependencies are trusted, by name and version.
+        self._locked_metadata: Dict[Tuple[str, str], Package] = {}
+        # What was needed but not available in the cache while offline.
+        self._missing: List[str] = []
+
+        # Prefetching starts background threads, so it is only enabled
+        # when the configuration asks for it.
+        prefetch_workers = 0
+        if config is None:
+            config = Config(use_environment=True)
+        else:
+            prefetch_workers = config.get("solver.prefetch-workers", 0)
+
+        self._override_workers = config.get("solver.override-workers", 0)
+        self._decision_heuristic = config.get(
+            "solver.decision-heuristic", "fewest-versions"
+        )
+
+        self._prefetcher: Optional[Prefetcher] = None
+        if prefetch_workers > 0:
+            self._prefetcher = Prefetcher(self._pool, prefetch_workers)
 
     @property
     def pool(self) -> Pool:
         return self._pool
 
+    @property
+    def prefetcher(self) -> Optional[Prefetcher]:
+        return self._prefetcher
+
+    @property
+    def decision_heuristic(self) -> str:
+        return self._decision_heuristic
+
+    @property
+    def override_workers(self) -> int:
+        return self._override_workers
+
+    @property
+    def recorder(self) -> Optional[MetadataRecorder]:
+        return self._recorder
+
+    @property
+    def python_constraint(self) -> VersionTypes:
+        return self._python_constraint
+
+    @property
+    def missing(self) -> List[str]:
+        return list(self._missing)
+
+    def add_missing(self, missing: Iterable[str]) -> None:
+        """
+        Records what was needed but not available in the cache while offline.
+        """
+        for item in missing:
+            if item not in self._missing:
+                self._missing.append(item)
+
+    @property
+    def env(self) -> Optional[Env]:
+        return self._env
+
     def is_debugging(self) -> bool:
         return self._is_debugging
 
     def set_overrides(self, overrides: Dict) -> None:
         self._overrides = overrides
 
+    def set_pinned_packages(self, packages: Iterable[Package]) -> None:
+        """
+        Only offers the given versions of these packages to the solver,
+        along with the dependencies they are given, without consulting
+        the repositories about them.
+        """
+        self._pinned = {package.name: package for package in packages}
+
+    @property
+    def locked_metadata(self) -> List[Package]:
+        return list(self._locked_metadata.values())
+
+    def set_locked_metadata(self, packages: Iterable[Package]) -> None:
+        """
+        Completes the locked versions of these packages with the dependencies
+        recorded in the lock file instead of retrieving their release information.
+        """
+        self._locked_metadata = {
+            (package.name, package.version.text): package
+            for package in packages
+            if package.source_type not in {"directory", "file", "url", "git"}
+        }
+
+        if self._prefetcher is not None:
+            self._prefetcher.ignore_releases(self._locked_metadata)
+
     def load_deferred(self, load_deferred: bool) -> None:
         self._load_deferred = load_deferred
 
@@ -97,6 +410,19 @@ class Provider:
         self._env = original_env
         self._python_constraint = original_python_constraint
 
+    @contextmanager
+    def record_metadata(self, recorder: MetadataRecorder) -> Iterator[None]:
+        """
+        Records the repository metadata consulted in the meantime.
+        """
+        original_recorder = self._recorder
+        self._recorder = recorder
+
+        try:
+            yield
+        finally:
+            self._recorder = original_recorder
+
     def search_for(
         self,
         dependency: Union[
@@ -116,50 +442,175 @@ class Provider:
         if dependency.is_root:
             return PackageCollection(dependency, [self._package])
 
-        for constraint in self._search_for:
+        pinned = self._get_pinned(dependency)
+        if pinned is not None:
+            if not dependency.constraint.allows(pinned.version):
+                return PackageCollection(dependency, [])
+
+            return PackageCollection(dependency, [pinned])
+
+        for searched, packages, versions in self._search_for.get(
+            dependency.complete_name, []
+        ):
             if (
-                constraint.is_same_package_as(dependency)
-                and constraint.constraint.intersect(dependency.constraint)
+                searched.is_same_package_as(dependency)
+                and searched.constraint.intersect(dependency.constraint)
                 == dependency.constraint
             ):
-                packages = [
-                    p
-                    for p in self._search_for[constraint]
-                    if dependency.constraint.allows(p.version)
-                ]
-
-                packages.sort(
-                    key=lambda p: (
-                        not p.is_prerelease() and not dependency.allows_prereleases(),
-                        p.version,
-                    ),
-                    reverse=True,
+                return PackageCollection(
+                    dependency, self._select_packages(dependency, packages, versions)
                 )
 
-                return PackageCollection(dependency, packages)
+        try:
+            packages = self._search_for_packages(dependency)
+        except OfflineError as e:
+            # The resolution goes on without the package,
+            # so that everything else missing is found as well.
+            self.add_missing(e.missing)
+            packages = []
+
+        if self._recorder is not None:
+            self._recorder.record_search(dependency, packages)
+
+        candidates = sorted(packages, key=lambda p: p.version, reverse=True)
+        self._search_for.setdefault(dependency.complete_name, []).append(
+            (dependency, candidates, [p.version for p in reversed(candidates)])
+        )
 
+        return PackageCollection(dependency, packages)
+
+    def _search_for_packages(
+        self,
+        dependency: Union[
+            Dependency,
+            VCSDependency,
+            FileDependency,
+            DirectoryDependency,
+            URLDependency,
+        ],
+    ) -> List[Package]:
         if dependency.is_vcs():
-            packages = self.search_for_vcs(dependency)
+            return self.search_for_vcs(dependency)
         elif dependency.is_file():
-            packages = self.search_for_file(dependency)
+            return self.search_for_file(dependency)
         elif dependency.is_directory():
-            packages = self.search_for_directory(dependency)
+            return self.search_for_directory(dependency)
         elif dependency.is_url():
-            packages = self.search_for_url(dependency)
+            return self.search_for_url(dependency)
+
+        find_packages = self._pool.find_packages
+        if self._prefetcher is not None:
+            find_packages = self._prefetcher.find_packages
+
+        packages = find_packages(dependency)
+        packages.sort(
+            key=lambda p: (
+                not p.is_prerelease() and not dependency.allows_prereleases(),
+                p.version,
+            ),
+            reverse=True,
+        )
+
+        return packages
+
+    def _get_pinned(self, dependency: Dependency) -> Optional[Package]:
+        pinned = self._pinned.get(dependency.name)
+        if pinned is None:
+            return
+
+        if (
+            dependency.is_vcs()
+            or dependency.is_file()
+            or dependency.is_directory()
+            or dependency.is_url()
+        ):
+            return
+
+        if (
+            dependency.source_name
+            and dependency.source_name.lower()
+            != (pinned.source_reference or "").lower()
+        ):
+            return
+
+        return pinned
+
+    def _get_locked_metadata(self, package: DependencyPackage) -> Optional[Package]:
+        if self._pinned.get(package.name) is package.package:
+            return package.package
+
+        locked = self._locked_metadata.get((package.name, package.version.text))
+        if locked is None:
+            return
+
+        if (
+            locked.source_type != package.source_type
+            or locked.source_reference != package.source_reference
+        ):
+            return
+
+        return locked
+
+    @staticmethod
+    def _select_packages(
+        dependency: Dependency, packages: List[Package], versions: List[Version]
+    ) -> List[Package]:
+        """
+        Returns the packages allowed by the constraint of dependency,
+        in the order in which search_for() returns them.
+
+        The packages must be sorted from the latest version to the oldest
+        and versions must hold their versions in ascending order:
+        the packages allowed by each range of the constraint
+        are then found by a binary search.
+        """
+        constraint = dependency.constraint
+        if constraint.is_empty():
+            return []
+
+        if isinstance(constraint, VersionUnion):
+            ranges = constraint.ranges
         else:
-            packages = self._pool.find_packages(dependency)
+            ranges = [constraint]
+
+        # The slices of versions that may be allowed, in ascending order.
+        slices = []
+        for range_ in ranges:
+            if not isinstance(range_, VersionRange):
+                slices = [(0, len(versions))]
+                break
+
+            start = 0
+            if range_.min is not None:
+                start = bisect_left(versions, range_.min)
+
+            end = len(versions)
+            if range_.full_max is not None:
+                end = bisect_right(versions, range_.full_max)
+
+            if start < end:
+                slices.append((start, end))
+
+        merged = []
+        for start, end in sorted(slices):
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(end, merged[-1][1]))
+            else:
+                merged.append((start, end))
 
-            packages.sort(
-                key=lambda p: (
-                    not p.is_prerelease() and not dependency.allows_prereleases(),
-                    p.version,
-                ),
-                reverse=True,
-            )
+        selected = []
+        for start, end in reversed(merged):
+            for package in packages[len(packages) - end : len(packages) - start]:
+                if constraint.allows(package.version):
+                    selected.append(package)
 
-        self._search_for[dependency] = packages
+        if not dependency.allows_prereleases():
+            # Prefer stable releases over pre-releases.
+            selected = [p for p in selected if not p.is_prerelease()] + [
+                p for p in selected if p.is_prerelease()
+            ]
 
-        return PackageCollection(dependency, packages)
+        return selected
 
     def search_for_vcs(self, dependency: VCSDependency) -> List[Package]:
         """
@@ -171,6 +622,11 @@ class Provider:
         if dependency in self._deferred_cache:
             return [self._deferred_cache[dependency]]
 
+        if self._pool.offline:
+            raise OfflineError(
+                ["{} repository {}".format(dependency.vcs, dependency.source)]
+            )
+
         package = self.get_package_from_vcs(
             dependency.vcs,
             dependency.source,
@@ -315,6 +771,9 @@ class Provider:
         if dependency in self._deferred_cache:
             return [self._deferred_cache[dependency]]
 
+        if self._pool.offline:
+            raise OfflineError([dependency.url])
+
         package = self.get_package_from_url(dependency.url)
 
         if dependency.name != package.name:
@@ -441,15 +900,27 @@ class Provider:
             "url",
             "git",
         }:
-            package = DependencyPackage(
-                package.dependency,
-                self._pool.package(
-                    package.name,
-                    package.version.text,
-                    extras=list(package.dependency.extras),
-                    repository=package.dependency.source_name,
-                ),
-            )
+            locked = self._get_locked_metadata(package)
+            if locked is not None:
+                # Completing the package alters it, the locked one is left untouched
+                package = DependencyPackage(package.dependency, locked.clone())
+            else:
+                lookup = self._pool.package
+                if self._prefetcher is not None:
+                    lookup = self._prefetcher.package
+
+                extras = list(package.dependency.extras)
+                repository = package.dependency.source_name
+                package = DependencyPackage(
+                    package.dependency,
+                    lookup(
+                        package.name,
+                        package.version.text,
+                        extras=extras,
+                        repository=repository,
+                    ),
+                )
+
             requires = package.requires
         else:
             requires = package.requires
@@ -457,14 +928,17 @@ class Provider:
         if self._load_deferred:
             # Retrieving constraints for deferred dependencies
             for r in requires:
-                if r.is_directory():
-                    self.search_for_directory(r)
-                elif r.is_file():
-                    self.search_for_file(r)
-                elif r.is_vcs():
-                    self.search_for_vcs(r)
-                elif r.is_url():
-                    self.search_for_url(r)
+                try:
+                    if r.is_directory():
+                        self.search_for_directory(r)
+                    elif r.is_file():
+                        self.search_for_file(r)
+                    elif r.is_vcs():
+                        self.search_for_vcs(r)
+                    elif r.is_url():
+                        self.search_for_url(r)
+                except OfflineError as e:
+                    self.add_missing(e.missing)
 
         optional_dependencies = []
         _dependencies = []
@@ -702,8 +1176,41 @@ class Provider:
 
         package.requires = clean_dependencies
 
+        if self._prefetcher is not None:
+            self._prefetcher.prefetch(
+                dep
+                for dep in clean_dependencies
+                if not (
+                    dep.is_vcs() or dep.is_file() or dep.is_directory() or dep.is_url()
+                )
+                and self._get_pinned(dep) is None
+            )
+
         return package
 
+    def after_fork(self) -> None:
+        """
+        Stops relying on the threads of the parent process in a forked one.
+
+        The metadata retrieved so far is still used, and the remaining metadata
+        is retrieved when needed, without prefetching.
+        """
+        self._prefetcher = None
+        self._pool.set_fetch_engine(None)
+        # Forked processes never fork again
+        self._override_workers = 0
+
+    def stop_prefetching(self, wait: bool = False) -> None:
+        if self._prefetcher is None:
+            return
+
+        self.debug(
+            "Prefetched metadata: {} hits, {} misses".format(
+                self._prefetcher.hits, self._prefetcher.misses
+            )
+        )
+        self._prefetcher.shutdown(wait=wait)
+
     def debug(self, message: str, depth: int = 0) -> None:
         if not (self._io.is_very_verbose() or self._io.is_debug()):
             return
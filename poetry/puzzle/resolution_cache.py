@@ -0,0 +1,273 @@
+import json
+import logging
+import os
+
+from hashlib import sha256
+from pathlib import Path
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from poetry.core.packages.dependency import Dependency
+from poetry.repositories.exceptions import PackageNotFound
+
+
+if TYPE_CHECKING:
+    from poetry.config.config import Config
+    from poetry.core.packages import Package
+    from poetry.core.packages.project_package import ProjectPackage
+    from poetry.packages.locker import Locker
+    from poetry.repositories import Pool
+    from poetry.repositories import Repository
+
+    from .provider import Provider
+
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataRecorder:
+    """
+    Records the versions of the packages found by the provider during a solve,
+    so that they can be looked for again later to tell whether they changed.
+
+    The information of the releases themselves is not recorded:
+    a release does not change once published, and retrieving it again
+    would cost as much as solving again.
+    """
+
+    def __init__(self) -> None:
+        self._searches: Dict[Tuple[str, str, bool, Optional[str]], str] = {}
+        self._reproducible = True
+
+    @property
+    def reproducible(self) -> bool:
+        """
+        Whether the solve only consulted the metadata of the repositories.
+        Packages from VCS, files, directories and URLs are not recorded.
+        """
+        return self._reproducible
+
+    def record_search(self, dependency: Dependency, packages: List["Package"]) -> None:
+        if (
+            dependency.is_vcs()
+            or dependency.is_file()
+            or dependency.is_directory()
+            or dependency.is_url()
+        ):
+            self._reproducible = False
+
+            return
+
+        key = (
+            dependency.name,
+            str(dependency.constraint),
+            dependency.allows_prereleases(),
+            dependency.source_name,
+        )
+        self._searches[key] = self._search_digest(packages)
+
+    def update(self, other: "MetadataRecorder") -> None:
+        """
+        Adds the metadata recorded by another recorder,
+        such as the one of a forked process.
+        """
+        self._searches.update(other._searches)
+        self._reproducible = self._reproducible and other._reproducible
+
+    def fingerprint(self) -> str:
+        return self._fingerprint(self._searches)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"searches": [list(key) for key in sorted(self._searches, key=str)]}
+
+    @classmethod
+    def replay(cls, data: Dict[str, Any], pool: "Pool") -> str:
+        """
+        Looks for the recorded packages again and returns their current fingerprint.
+        """
+        searches = {}
+        for name, constraint, allows_prereleases, source_name in data["searches"]:
+            dependency = Dependency(
+                name, constraint, allows_prereleases=allows_prereleases
+            )
+            dependency.source_name = source_name
+
+            searches[
+                (name, constraint, allows_prereleases, source_name)
+            ] = cls._search_digest(pool.find_packages(dependency))
+
+        return cls._fingerprint(searches)
+
+    @staticmethod
+    def _search_digest(packages: List["Package"]) -> str:
+        return sha256(
+            json.dumps(
+                sorted(
+                    (p.version.text, p.source_type or "", p.source_reference or "")
+                    for p in packages
+                )
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _fingerprint(searches: Dict) -> str:
+        return sha256(
+            json.dumps(
+                sorted(json.dumps([key, digest]) for key, digest in searches.items())
+            ).encode()
+        ).hexdigest()
+
+
+class ResolutionCache:
+    """
+    The package sets solved for a project, so that resolving it again
+    with the same dependencies, sources and repository metadata
+    does not run the version solver.
+
+    A resolution is keyed by the content hash of the project, its sources,
+    its Python constraint and the locked packages it was solved with
+    or whose locked dependencies it trusted.
+    It is only reused if the versions the solver found are unchanged.
+
+    Only the most recently used resolutions are kept.
+    """
+
+    # The number of resolutions kept, of all the projects
+    MAX_ENTRIES = 100
+
+    def __init__(self, cache_dir: Path, locker: "Locker") -> None:
+        self._cache_dir = cache_dir
+        self._locker = locker
+
+    @classmethod
+    def from_config(cls, config: "Config", locker: "Locker") -> "ResolutionCache":
+        return cls(cls.get_cache_dir(config), locker)
+
+    @staticmethod
+    def get_cache_dir(config: "Config") -> Path:
+        return Path(config.get("cache-dir")).expanduser().joinpath("resolutions")
+
+    @property
+    def cache_dir(self) -> Path:
+        return self._cache_dir
+
+    def key(
+        self,
+        package: "ProjectPackage",
+        provider: "Provider",
+        locked: "Repository",
+        use_latest: Optional[List[str]],
+    ) -> str:
+        return sha256(
+            json.dumps(
+                [
+                    self._locker.content_hash,
+                    sorted(dep.to_pep_508() for dep in package.all_requires),
+                    [
+                        [repository.name, getattr(repository, "url", None)]
+                        for repository in provider.pool.repositories
+                    ],
+                    str(provider.python_constraint),
+                    self._describe(locked.packages),
+                    self._describe(provider.locked_metadata),
+                    sorted(use_latest or []),
+                    provider.decision_heuristic,
+                ]
+            ).encode()
+        ).hexdigest()
+
+    @staticmethod
+    def _describe(packages: List["Package"]) -> List[List[str]]:
+        return sorted(
+            [p.name, p.version.text, p.source_type or "", p.source_url or ""]
+            for p in packages
+        )
+
+    def get(
+        self, key: str, pool: "Pool"
+    ) -> Optional[Tuple[List["Package"], List[int]]]:
+        """
+        Returns the packages and depths of the cached resolution,
+        or None if there is none or the metadata it relied on changed.
+        """
+        path = self._cache_dir / "{}.json".format(key)
+        if not path.exists():
+            return None
+
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+
+        try:
+            fingerprint = MetadataRecorder.replay(data["metadata"], pool)
+        except (PackageNotFound, ValueError):
+            fingerprint = None
+
+        if fingerprint != data["fingerprint"]:
+            logger.debug("Discarding the cached resolution %s", key)
+
+            return None
+
+        packages = [
+            self._locker._load_package(info, info.get("files", []))
+            for info in data["packages"]
+        ]
+
+        try:
+            # Recently used resolutions are evicted last
+            os.utime(str(path))
+        except OSError:
+            pass
+
+        return packages, data["depths"]
+
+    def set(
+        self,
+        key: str,
+        packages: List["Package"],
+        depths: List[int],
+        recorder: MetadataRecorder,
+    ) -> None:
+        # The packages are described as in the lock file
+        data = {
+            "fingerprint": recorder.fingerprint(),
+            "metadata": recorder.to_json(),
+            "packages": [self._locker._dump_package(package) for package in packages],
+            "depths": depths,
+        }
+
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            self._cache_dir.joinpath("{}.json".format(key)).write_text(
+                json.dumps(data), encoding="utf-8"
+            )
+        except OSError:
+            return
+
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used resolutions beyond MAX_ENTRIES.
+        """
+        entries = []
+        for path in self._cache_dir.glob("*.json"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+
+        if len(entries) <= self.MAX_ENTRIES:
+            return
+
+        entries.sort(key=lambda entry: entry[0])
+        for _, path in entries[: len(entries) - self.MAX_ENTRIES]:
+            try:
+                path.unlink()
+            except OSError:
+                pass
@@ -1,11 +1,15 @@
 import enum
+import multiprocessing
+import sys
 import time
 
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from contextlib import contextmanager
 from typing import TYPE_CHECKING
 from typing import Callable
 from typing import Dict
+from typing import Iterator
 from typing import List
 from typing import Optional
 from typing import Tuple
@@ -13,6 +17,7 @@ from typing import Union
 
 from cleo.io.io import IO
 
+from poetry.config.config import Config
 from poetry.core.packages import Package
 from poetry.core.packages.project_package import ProjectPackage
 from poetry.installation.operations import Install
@@ -23,11 +28,16 @@ from poetry.mixology.failure import SolveFailure
 from poetry.packages import DependencyPackage
 from poetry.repositories import Pool
 from poetry.repositories import Repository
+from poetry.repositories.exceptions import OfflineError
+from poetry.repositories.metadata_store import commit_stores
 from poetry.utils.env import Env
+from poetry.utils.helpers import canonicalize_name
 
 from .exceptions import OverrideNeeded
 from .exceptions import SolverProblemError
 from .provider import Provider
+from .resolution_cache import MetadataRecorder
+from .resolution_cache import ResolutionCache
 
 
 if TYPE_CHECKING:
@@ -49,6 +59,9 @@ class Solver:
         io: IO,
         remove_untracked: bool = False,
         provider: Optional[Provider] = None,
+        config: Optional[Config] = None,
+        resolution_cache: Optional[ResolutionCache] = None,
+        incremental: bool = False,
     ):
         self._package = package
         self._pool = pool
@@ -57,11 +70,13 @@ class Solver:
         self._io = io
 
         if provider is None:
-            provider = Provider(self._package, self._pool, self._io)
+            provider = Provider(self._package, self._pool, self._io, config=config)
 
         self._provider = provider
         self._overrides = []
         self._remove_untracked = remove_untracked
+        self._resolution_cache = resolution_cache
+        self._incremental = incremental
 
     @property
     def provider(self) -> Provider:
@@ -75,7 +90,21 @@ class Solver:
     def solve(self, use_latest: List[str] = None) -> List["OperationTypes"]:
         with self._provider.progress():
             start = time.time()
-            packages, depths = self._solve(use_latest=use_latest)
+            try:
+                packages, depths = self._solve_or_reuse(use_latest=use_latest)
+            except OfflineError as e:
+                # Reported along with everything else found missing until then
+                self._provider.add_missing(e.missing)
+            except SolverProblemError:
+                # The resolution may have failed for lack of what is missing
+                if not self._provider.missing:
+                    raise
+            finally:
+                self._provider.stop_prefetching()
+
+            if self._provider.missing:
+                raise OfflineError(self._provider.missing)
+
             end = time.time()
 
             if len(self._overrides) > 1:
@@ -218,13 +247,7 @@ class Solver:
 
         packages = []
         depths = []
-        for override in overrides:
-            self._provider.debug(
-                "<comment>Retrying dependency resolution "
-                "with the following overrides ({}).</comment>".format(override)
-            )
-            self._provider.set_overrides(override)
-            _packages, _depths = self._solve(use_latest=use_latest)
+        for _packages, _depths in self._solve_overrides(overrides, use_latest):
             for index, package in enumerate(_packages):
                 if package not in packages:
                     packages.append(package)
@@ -241,6 +264,142 @@ class Solver:
 
         return packages, depths
 
+    def _solve_overrides(
+        self, overrides: Tuple[Dict], use_latest: List[str] = None
+    ) -> Iterator[Tuple[List[Package], List[int]]]:
+        """
+        Solves once per set of overrides, in order.
+        """
+        workers = min(self._provider.override_workers, len(overrides))
+        if workers < 2 or self._provider.is_debugging() or not _can_fork_branches():
+            for override in overrides:
+                self._provider.debug(
+                    "<comment>Retrying dependency resolution "
+                    "with the following overrides ({}).</comment>".format(override)
+                )
+                self._provider.set_overrides(override)
+                yield self._solve(use_latest=use_latest)
+
+            return
+
+        global _branches
+
+        # No thread may hold a lock or a connection while the process forks.
+        # The forked processes start with a copy of everything retrieved so far.
+        self._provider.stop_prefetching(wait=True)
+        _branches = (self, overrides, use_latest)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("fork")
+            ) as executor:
+                results = list(executor.map(_solve_branch, range(len(overrides))))
+        finally:
+            _branches = None
+
+        recorder = self._provider.recorder
+        for override, result in zip(overrides, results):
+            if result is None:
+                # Solving again in this process to raise the error
+                self._provider.set_overrides(override)
+                yield self._solve(use_latest=use_latest)
+
+                continue
+
+            packages, depths, branch_recorder, branch_overrides, missing = result
+            self._overrides.extend(branch_overrides)
+            self._provider.add_missing(missing)
+            if recorder is not None and branch_recorder is not None:
+                recorder.update(branch_recorder)
+
+            yield packages, depths
+
+    def _solve_or_reuse(
+        self, use_latest: List[str] = None
+    ) -> Tuple[List[Package], List[int]]:
+        """
+        Reuses the resolution cached for the same inputs if the repository
+        metadata it relied on did not change, and solves otherwise.
+        """
+        if self._resolution_cache is None or self._provider.env is not None:
+            return self._solve_incrementally(use_latest=use_latest)
+
+        key = self._resolution_cache.key(
+            self._package, self._provider, self._locked, use_latest
+        )
+        cached = self._resolution_cache.get(key, self._pool)
+        if cached is not None:
+            self._provider.debug("Reusing the cached resolution {}".format(key))
+
+            return cached
+
+        recorder = MetadataRecorder()
+        with self._provider.record_metadata(recorder):
+            packages, depths = self._solve_incrementally(use_latest=use_latest)
+
+        if recorder.reproducible and not self._provider.missing:
+            self._resolution_cache.set(key, packages, depths, recorder)
+
+        return packages, depths
+
+    def _solve_incrementally(
+        self, use_latest: List[str] = None
+    ) -> Tuple[List[Package], List[int]]:
+        """
+        Keeps the locked packages that are not reachable from the packages
+        to update as they are, along with their locked dependencies,
+        and only solves for the others.
+
+        Falls back to a full solve if the kept packages do not fit
+        the new requirements.
+        """
+        pinned = []
+        if self._incremental:
+            pinned = self._get_unaffected_locked_packages(use_latest or [])
+
+        if not pinned:
+            return self._solve(use_latest=use_latest)
+
+        self._provider.debug(
+            "Keeping {} locked packages out of {}".format(
+                len(pinned), len(self._locked.packages)
+            )
+        )
+
+        self._provider.set_pinned_packages(pinned)
+        try:
+            return self._solve(use_latest=use_latest)
+        except SolverProblemError:
+            self._provider.debug(
+                "The locked packages conflict with the new requirements, "
+                "solving again from scratch"
+            )
+        finally:
+            self._provider.set_pinned_packages([])
+
+        return self._solve(use_latest=use_latest)
+
+    def _get_unaffected_locked_packages(self, use_latest: List[str]) -> List[Package]:
+        locked = {package.name: package for package in self._locked.packages}
+
+        # The packages to update and everything they depend on, transitively
+        affected = set()
+        stack = [canonicalize_name(name) for name in use_latest]
+        while stack:
+            name = stack.pop()
+            if name in affected:
+                continue
+
+            affected.add(name)
+            if name in locked:
+                stack.extend(dependency.name for dependency in locked[name].requires)
+
+        return [
+            package
+            for name, package in locked.items()
+            if name not in affected
+            and package.source_type not in {"directory", "file", "url", "git"}
+        ]
+
     def _solve(self, use_latest: List[str] = None) -> Tuple[List[Package], List[int]]:
         if self._provider._overrides:
             self._overrides.append(self._provider._overrides)
@@ -251,7 +410,11 @@ class Solver:
 
         try:
             result = resolve_version(
-                self._package, self._provider, locked=locked, use_latest=use_latest
+                self._package,
+                self._provider,
+                locked=locked,
+                use_latest=use_latest,
+                heuristic=self._provider.decision_heuristic,
             )
 
             packages = result.packages
@@ -293,6 +456,58 @@ class Solver:
         return final_packages, depths
 
 
+# The solver whose sets of overrides are being solved by forked processes,
+# along with the overrides and the packages to update.
+_branches: Optional[Tuple[Solver, Tuple[Dict], Optional[List[str]]]] = None
+
+
+def _can_fork_branches() -> bool:
+    # Process pools take a start method from Python 3.7 on,
+    # and forking a process running threads is only safe enough on Linux.
+    return (
+        sys.version_info >= (3, 7)
+        and sys.platform.startswith("linux")
+        and "fork" in multiprocessing.get_all_start_methods()
+    )
+
+
+def _solve_branch(
+    index: int,
+) -> Optional[
+    Tuple[List[Package], List[int], Optional[MetadataRecorder], List[Dict], List[str]]
+]:
+    """
+    Solves with the given set of overrides in a forked process.
+
+    Returns None if solving failed, so that the error is raised
+    by the parent process. Otherwise, the overrides used and what was found
+    missing while offline are returned along with the resolution,
+    as the parent process does not see them.
+    """
+    solver, overrides, use_latest = _branches
+    provider = solver.provider
+
+    provider.after_fork()
+    provider.set_overrides(overrides[index])
+    start = len(solver._overrides)
+    start_missing = len(provider.missing)
+    try:
+        packages, depths = solver._solve(use_latest=use_latest)
+    except Exception:
+        return None
+    finally:
+        # Forked processes exit without running the exit hooks
+        commit_stores()
+
+    return (
+        packages,
+        depths,
+        provider.recorder,
+        solver._overrides[start:],
+        provider.missing[start_missing:],
+    )
+
+
 class DFSNode(object):
     def __init__(self, id: Tuple[str, str, bool], name: str, base_name: str) -> None:
         self.id = id
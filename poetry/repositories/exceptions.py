@@ -1,3 +1,6 @@
+from typing import List
+
+
 class RepositoryError(Exception):
 
     pass
@@ -6,3 +9,19 @@ class RepositoryError(Exception):
 class PackageNotFound(Exception):
 
     pass
+
+
+class OfflineError(RepositoryError):
+    """
+    Raised when something that is not cached is needed while offline.
+    """
+
+    def __init__(self, missing: List[str]) -> None:
+        self.missing = missing
+
+        super(OfflineError, self).__init__(
+            "The following are not available in the cache "
+            "and cannot be retrieved while offline:\n{}".format(
+                "\n".join("  - {}".format(item) for item in missing)
+            )
+        )
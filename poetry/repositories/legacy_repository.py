@@ -1,21 +1,30 @@
 import cgi
+import hashlib
+import json
+import os
 import re
+import threading
+import time
 import urllib.parse
 import warnings
 
+from collections import OrderedDict
 from collections import defaultdict
+from html.parser import HTMLParser
 from pathlib import Path
 from typing import TYPE_CHECKING
 from typing import Any
 from typing import Dict
+from typing import Iterable
 from typing import Iterator
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import Union
 
 import requests
 import requests.auth
 
-from cachecontrol import CacheControl
 from cachecontrol.caches.file_cache import FileCache
 from cachy import CacheManager
 
@@ -27,13 +36,16 @@ from poetry.core.semver import VersionRange
 from poetry.core.semver import parse_constraint
 from poetry.locations import REPOSITORY_CACHE_DIR
 from poetry.utils.helpers import canonicalize_name
+from poetry.utils.http_client import get_http_clients
 from poetry.utils.patterns import wheel_file_re
 
 from ..config.config import Config
 from ..inspection.info import PackageInfo
 from ..installation.authenticator import Authenticator
+from .exceptions import OfflineError
 from .exceptions import PackageNotFound
 from .exceptions import RepositoryError
+from .metadata_store import MetadataStore
 from .pypi_repository import PyPiRepository
 
 
@@ -43,11 +55,6 @@ if TYPE_CHECKING:
 try:
     from html import unescape
 except ImportError:
-    try:
-        from html.parser import HTMLParser
-    except ImportError:
-        from HTMLParser import HTMLParser
-
     unescape = HTMLParser().unescape
 
 
@@ -62,6 +69,88 @@ with warnings.catch_warnings():
     import html5lib
 
 
+class SimpleLink(Link):
+    """
+    A link found on a simple repository page, along with the information
+    the index exposes about the core metadata of the distribution (PEP 658).
+    """
+
+    def __init__(
+        self,
+        url: str,
+        comes_from: Optional["Page"] = None,
+        requires_python: Optional[str] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        yanked: Union[bool, str] = False,
+    ) -> None:
+        super(SimpleLink, self).__init__(
+            url, comes_from=comes_from, requires_python=requires_python
+        )
+
+        # None if the metadata file is not available, otherwise
+        # the (possibly empty) hashes of the metadata file.
+        self.metadata = metadata
+
+        # False if the file is not yanked, otherwise
+        # True or the reason given for yanking it.
+        self.yanked = yanked
+
+    @property
+    def is_yanked(self) -> bool:
+        return self.yanked is not False
+
+    @property
+    def yanked_reason(self) -> Optional[str]:
+        if isinstance(self.yanked, str):
+            return self.yanked
+
+    @property
+    def has_metadata(self) -> bool:
+        return self.metadata is not None
+
+    @property
+    def metadata_url(self) -> Optional[str]:
+        if not self.has_metadata:
+            return
+
+        return self.url_without_fragment + ".metadata"
+
+
+class AnchorParser(HTMLParser):
+    """
+    Streaming parser collecting the attributes of the anchors of a page.
+
+    Unlike html5lib, it does not build a document tree, which makes it
+    much faster on the large pages of projects with thousands of files.
+    """
+
+    ATTRIBUTES = (
+        "href",
+        "data-requires-python",
+        "data-yanked",
+        "data-core-metadata",
+        "data-dist-info-metadata",
+    )
+
+    def __init__(self) -> None:
+        super(AnchorParser, self).__init__(convert_charrefs=True)
+
+        self.anchors: List[Dict[str, str]] = []
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        if tag != "a":
+            return
+
+        anchor = {}
+        for name, value in attrs:
+            if name in self.ATTRIBUTES:
+                # Like html5lib, keep the first occurrence of an attribute
+                # and use an empty value for attributes without one.
+                anchor.setdefault(name, value or "")
+
+        self.anchors.append(anchor)
+
+
 class Page:
 
     VERSION_REGEX = re.compile(r"(?i)([a-z0-9_\-.]+?)-(?=\d)([a-z0-9_.!+-]+)")
@@ -75,7 +164,11 @@ class Page:
         ".tar",
     ]
 
-    def __init__(self, url: str, content: str, headers: Dict[str, Any]) -> None:
+    ANCHOR_REGEX = re.compile(r"<a[\s>]", re.I)
+
+    def __init__(
+        self, url: str, content: Union[str, bytes], headers: Dict[str, Any]
+    ) -> None:
         if not url.endswith("/"):
             url += "/"
 
@@ -88,51 +181,133 @@ class Page:
                 encoding = params["charset"]
 
         self._content = content
+        self._anchors = self.parse_anchors(content, encoding)
+        if self._anchors is None:
+            self._anchors = self.parse_anchors_with_html5lib(content, encoding)
+
+        self._index_links()
+
+    @classmethod
+    def parse_anchors(
+        cls, content: Union[str, bytes], encoding: Optional[str] = None
+    ) -> Optional[List[Dict[str, str]]]:
+        """
+        Extract the attributes of the anchors of a page with a streaming parser.
 
+        Returns None if the page could not be parsed reliably,
+        in which case html5lib should be used instead.
+        """
+        if not content:
+            return []
+
+        if isinstance(content, bytes):
+            try:
+                content = content.decode(encoding or "utf-8")
+            except (LookupError, UnicodeDecodeError):
+                return
+
+        parser = AnchorParser()
+        try:
+            parser.feed(content)
+            parser.close()
+        except (AssertionError, ValueError):
+            return
+
+        if not parser.anchors and cls.ANCHOR_REGEX.search(content):
+            # The page has anchors that the streaming parser
+            # could not make sense of: it is likely malformed.
+            return
+
+        return parser.anchors
+
+    @staticmethod
+    def parse_anchors_with_html5lib(
+        content: Union[str, bytes], encoding: Optional[str] = None
+    ) -> List[Dict[str, str]]:
         if encoding is None:
-            self._parsed = html5lib.parse(content, namespaceHTMLElements=False)
+            parsed = html5lib.parse(content, namespaceHTMLElements=False)
         else:
-            self._parsed = html5lib.parse(
+            parsed = html5lib.parse(
                 content, transport_encoding=encoding, namespaceHTMLElements=False
             )
 
+        return [dict(anchor.attrib) for anchor in parsed.findall(".//a")]
+
     @property
     def versions(self) -> Iterator[Version]:
-        seen = set()
-        for link in self.links:
-            version = self.link_version(link)
+        return iter(self._links_by_version)
 
-            if not version:
-                continue
+    @property
+    def links(self) -> Iterator[Link]:
+        return iter(self._links)
 
-            if version in seen:
-                continue
+    def links_for_version(self, version: Version) -> Iterator[Link]:
+        return iter(self._links_by_version.get(version, []))
 
-            seen.add(version)
+    def _index_links(self) -> None:
+        """
+        Parse the links of the page once and index them by version,
+        since the same page is usually looked up for several versions.
+        """
+        self._links: List[Link] = []
+        self._links_by_version: Dict[Version, List[Link]] = {}
 
-            yield version
+        for link in self._parse_links():
+            self._links.append(link)
 
-    @property
-    def links(self) -> Iterator[Link]:
-        for anchor in self._parsed.findall(".//a"):
+            version = self.link_version(link)
+            if version is None:
+                continue
+
+            self._links_by_version.setdefault(version, []).append(link)
+
+    def serialize(self) -> Dict[str, Any]:
+        """
+        Return the parsed links of the page in a form that can be cached.
+        """
+        return {
+            "url": self._url,
+            "links": [
+                {
+                    "url": link.url,
+                    "requires-python": link.requires_python,
+                    "metadata": getattr(link, "metadata", None),
+                    "yanked": getattr(link, "yanked", False),
+                }
+                for link in self._links
+            ],
+        }
+
+    def _parse_links(self) -> Iterator[Link]:
+        for anchor in self._anchors:
             if anchor.get("href"):
                 href = anchor.get("href")
                 url = self.clean_link(urllib.parse.urljoin(self._url, href))
                 pyrequire = anchor.get("data-requires-python")
                 pyrequire = unescape(pyrequire) if pyrequire else None
-
-                link = Link(url, self, requires_python=pyrequire)
+                metadata = anchor.get("data-core-metadata")
+                if metadata is None:
+                    metadata = anchor.get("data-dist-info-metadata")
+
+                yanked = anchor.get("data-yanked")
+                if yanked is None:
+                    yanked = False
+                elif not yanked:
+                    yanked = True
+
+                link = SimpleLink(
+                    url,
+                    self,
+                    requires_python=pyrequire,
+                    metadata=self.parse_metadata_attribute(metadata),
+                    yanked=yanked,
+                )
 
                 if link.ext not in self.SUPPORTED_FORMATS:
                     continue
 
                 yield link
 
-    def links_for_version(self, version: Version) -> Iterator[Link]:
-        for link in self.links:
-            if self.link_version(link) == version:
-                yield link
-
     def link_version(self, link: Link) -> Optional[Version]:
         m = wheel_file_re.match(link.filename)
         if m:
@@ -152,6 +327,28 @@ class Page:
 
         return version
 
+    @staticmethod
+    def parse_metadata_attribute(
+        value: Optional[Union[str, bool, Dict[str, str]]]
+    ) -> Optional[Dict[str, str]]:
+        """
+        Normalizes the PEP 658 metadata information of a link,
+        as exposed by the HTML (PEP 503) or JSON (PEP 691) simple API,
+        to the hashes of the metadata file, or None if it is not available.
+        """
+        if value is None or value is False or value == "false":
+            return
+
+        if isinstance(value, dict):
+            return value
+
+        if isinstance(value, str) and "=" in value:
+            hash_name, hash_value = value.split("=", 1)
+
+            return {hash_name: hash_value}
+
+        return {}
+
     _clean_re = re.compile(r"[^a-z0-9$&+,/:;=?@.#%_\\|-]", re.I)
 
     def clean_link(self, url: str) -> str:
@@ -161,7 +358,133 @@ class Page:
         return self._clean_re.sub(lambda match: "%%%2x" % ord(match.group(0)), url)
 
 
+class JsonPage(Page):
+    """
+    A project page served by the JSON-based simple API (PEP 691).
+    """
+
+    CONTENT_TYPE = "application/vnd.pypi.simple.v1+json"
+
+    def __init__(
+        self, url: str, content: Union[str, bytes], headers: Dict[str, Any]
+    ) -> None:
+        if not url.endswith("/"):
+            url += "/"
+
+        self._url = url
+        self._content = content
+        self._parsed = json.loads(content)
+
+        self._index_links()
+
+    def _parse_links(self) -> Iterator[Link]:
+        for file in self._parsed.get("files", []):
+            url = self.clean_link(urllib.parse.urljoin(self._url, file["url"]))
+
+            hashes = file.get("hashes") or {}
+            if "#" not in url and hashes:
+                hash_name = "sha256" if "sha256" in hashes else sorted(hashes)[0]
+                url += "#{}={}".format(hash_name, hashes[hash_name])
+
+            metadata = file.get("core-metadata")
+            if metadata is None:
+                metadata = file.get("dist-info-metadata")
+
+            link = SimpleLink(
+                url,
+                self,
+                requires_python=file.get("requires-python"),
+                metadata=self.parse_metadata_attribute(metadata),
+                yanked=file.get("yanked", False),
+            )
+
+            if link.ext not in self.SUPPORTED_FORMATS:
+                continue
+
+            yield link
+
+
+class CachedPage(Page):
+    """
+    A page rebuilt from the links of a previously parsed page.
+    """
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self._url = data["url"]
+        self._content = None
+        self._cached_links = data["links"]
+
+        self._index_links()
+
+    def _parse_links(self) -> Iterator[Link]:
+        for link in self._cached_links:
+            yield SimpleLink(
+                link["url"],
+                self,
+                requires_python=link["requires-python"],
+                metadata=link["metadata"],
+                yanked=link["yanked"],
+            )
+
+
+class PageCache:
+    """
+    Thread-safe LRU cache of parsed pages, keyed by URL.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self._maxsize = maxsize
+        self._pages: "OrderedDict[str, Page]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, url: str) -> Optional[Page]:
+        with self._lock:
+            page = self._pages.get(url)
+            if page is not None:
+                self._pages.move_to_end(url)
+
+            return page
+
+    def put(self, url: str, page: Page) -> None:
+        with self._lock:
+            self._pages[url] = page
+            self._pages.move_to_end(url)
+
+            while len(self._pages) > self._maxsize:
+                self._pages.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pages.clear()
+
+    def _forget_lock(self) -> None:
+        # A thread of the parent of a forked process may have held the lock
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+
 class LegacyRepository(PyPiRepository):
+
+    # Parsed pages are shared by all the repositories of the process,
+    # so that a project page is only retrieved and parsed once.
+    _pages = PageCache()
+
+    # How long, in seconds, a page stored on disk is used without being
+    # revalidated, when its response does not specify a max-age.
+    PAGE_TTL = 300
+
+    MAX_AGE_REGEX = re.compile(r"max-age=(\d+)")
+
+    ACCEPT = ", ".join(
+        [
+            JsonPage.CONTENT_TYPE,
+            "application/vnd.pypi.simple.v1+html;q=0.2",
+            "text/html;q=0.01",
+        ]
+    )
+
     def __init__(
         self,
         name: str,
@@ -182,21 +505,21 @@ class LegacyRepository(PyPiRepository):
         self._cache_dir = REPOSITORY_CACHE_DIR / name
         self._cache = CacheManager(
             {
-                "default": "releases",
+                "default": "packages",
                 "serializer": "json",
                 "stores": {
-                    "releases": {"driver": "file", "path": str(self._cache_dir)},
                     "packages": {"driver": "dict"},
                     "matches": {"driver": "dict"},
                 },
             }
         )
+        self._store = MetadataStore(self._cache_dir)
 
-        self._authenticator = Authenticator(
-            config=config or Config(use_environment=True)
-        )
+        config = config or Config(use_environment=True)
+        self._not_found_ttl = config.get("cache.not-found-ttl")
+        self._authenticator = Authenticator(config=config)
 
-        self._session = CacheControl(
+        self._session = get_http_clients().mount(
             self._authenticator.session, cache=FileCache(str(self._cache_dir / "_http"))
         )
 
@@ -381,7 +704,9 @@ class LegacyRepository(PyPiRepository):
 
         data.files = files
 
-        info = self._get_info_from_urls(urls)
+        info = self._get_info_from_metadata_links(links)
+        if info is None:
+            info = self._get_info_from_urls(urls)
 
         data.summary = info.summary
         data.requires_dist = info.requires_dist
@@ -389,11 +714,170 @@ class LegacyRepository(PyPiRepository):
 
         return data.asdict()
 
+    def _get_info_from_metadata_links(self, links: List[Link]) -> Optional[PackageInfo]:
+        """
+        Retrieve the release information from the core metadata files
+        exposed by the index (PEP 658), without downloading any distribution.
+
+        Returns None if no usable metadata file is available.
+        """
+        candidates = [
+            link for link in links if isinstance(link, SimpleLink) and link.has_metadata
+        ]
+
+        # Prefer universal wheels, then other wheels and finally sdists,
+        # like when inspecting distributions.
+        def priority(link: Link) -> int:
+            if not link.is_wheel:
+                return 2
+
+            m = wheel_file_re.match(link.filename)
+            if m and m.group("abi") == "none" and m.group("plat") == "any":
+                return 0
+
+            return 1
+
+        for link in sorted(candidates, key=priority):
+            self._log(
+                "Retrieving metadata file for {}".format(link.filename), level="debug"
+            )
+
+            try:
+                response = self.session.get(link.metadata_url)
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self._log(
+                    "Unable to retrieve metadata file for {}: {}".format(
+                        link.filename, e
+                    ),
+                    level="debug",
+                )
+                continue
+
+            if not self._metadata_hash_matches(link, response.content):
+                self._log(
+                    "Hash mismatch for the metadata file of {}".format(link.filename),
+                    level="debug",
+                )
+                continue
+
+            return PackageInfo.from_core_metadata(response.content)
+
+    def _metadata_hash_matches(self, link: SimpleLink, content: bytes) -> bool:
+        for hash_name, expected in link.metadata.items():
+            try:
+                actual = hashlib.new(hash_name, content).hexdigest()
+            except ValueError:
+                # Unsupported hash algorithm
+                continue
+
+            return actual == expected
+
+        return True
+
     def _get(self, endpoint: str) -> Optional[Page]:
         url = self._url + endpoint
+        if not self._disable_cache:
+            page = self._pages.get(url)
+            if page is not None:
+                return page
+
+        page = self._get_page(url)
+        if page is not None and not self._disable_cache:
+            self._pages.put(url, page)
+
+        return page
+
+    def preload(self, names: Iterable[str]) -> None:
+        if self._fetch_engine is None or self._offline or self._disable_cache:
+            return
+
+        entries = {}
+        for name in names:
+            url = self._url + "/{}/".format(canonicalize_name(name).replace(".", "-"))
+            if (
+                url in entries
+                or self._pages.get(url) is not None
+                or self._is_not_found(url)
+            ):
+                continue
+
+            cached = self._get_stored_page(url)
+            if cached and cached["expires"] > time.time():
+                continue
+
+            entries[url] = cached
+
+        responses = self._fetch_engine.send_all(
+            self.session,
+            [
+                requests.Request("GET", url, headers=self._get_page_headers(cached))
+                for url, cached in entries.items()
+            ],
+        )
+        for (url, cached), response in zip(entries.items(), responses):
+            # Preloading is purely speculative: failures are ignored here
+            # and will resurface, if relevant, when the page is retrieved.
+            if isinstance(response, Exception):
+                continue
+
+            try:
+                page = self._page_from_response(url, response, cached)
+            except RepositoryError:
+                continue
+
+            if page is not None:
+                self._pages.put(url, page)
+
+    def _get_page(self, url: str) -> Optional[Page]:
+        if self._is_not_found(url):
+            return
+
+        cached = self._get_stored_page(url)
+        if cached and (self._offline or cached["expires"] > time.time()):
+            self._log("Using cached page for {}".format(url), level="debug")
+
+            return CachedPage(cached["page"])
+
+        if self._offline:
+            raise OfflineError([url])
+
+        response = self._request(url, headers=self._get_page_headers(cached))
+
+        return self._page_from_response(url, response, cached)
+
+    def _get_stored_page(self, url: str) -> Optional[Dict[str, Any]]:
+        if self._disable_cache:
+            return
+
+        cached = self._store.get(url, namespace="pages")
+        if cached and cached.get("cache-version") != str(self.CACHE_VERSION):
+            return
+
+        return cached
+
+    def _get_page_headers(self, cached: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        headers = {"Accept": self.ACCEPT}
+        if cached:
+            # Revalidate the page stored on disk
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+
+            if cached.get("last-modified"):
+                headers["If-Modified-Since"] = cached["last-modified"]
+
+        return headers
+
+    def _page_from_response(
+        self,
+        url: str,
+        response: requests.Response,
+        cached: Optional[Dict[str, Any]] = None,
+    ) -> Optional[Page]:
         try:
-            response = self.session.get(url)
             if response.status_code == 404:
+                self._remember_not_found(url)
+
                 return
             response.raise_for_status()
         except requests.HTTPError as e:
@@ -406,6 +890,14 @@ class LegacyRepository(PyPiRepository):
             )
             return
 
+        if cached and self._is_not_modified(response, cached):
+            self._log("Cached page for {} is still valid".format(url), level="debug")
+
+            page = CachedPage(cached["page"])
+            self._cache_page(url, page, response, cached)
+
+            return page
+
         if response.url != url:
             self._log(
                 "Response URL {response_url} differs from request URL {url}".format(
@@ -414,4 +906,73 @@ class LegacyRepository(PyPiRepository):
                 level="debug",
             )
 
-        return Page(response.url, response.content, response.headers)
+        content_type, _ = cgi.parse_header(response.headers.get("Content-Type", ""))
+        if content_type == JsonPage.CONTENT_TYPE:
+            page = JsonPage(response.url, response.content, response.headers)
+        else:
+            page = Page(response.url, response.content, response.headers)
+
+        if not self._disable_cache:
+            self._cache_page(url, page, response)
+
+        return page
+
+    def _is_not_modified(
+        self, response: requests.Response, cached: Dict[str, Any]
+    ) -> bool:
+        if response.status_code == 304:
+            return True
+
+        # The HTTP cache may answer a successful revalidation
+        # with the full response it has stored.
+        etag = response.headers.get("ETag")
+        if etag:
+            return etag == cached.get("etag")
+
+        last_modified = response.headers.get("Last-Modified")
+        if last_modified:
+            return last_modified == cached.get("last-modified")
+
+        return False
+
+    def _cache_page(
+        self,
+        url: str,
+        page: Page,
+        response: requests.Response,
+        cached: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Store the parsed page on disk along with the validators of the response,
+        or of the cached entry it revalidated, for conditional requests.
+        """
+        cached = cached or {}
+        cache_control = response.headers.get("Cache-Control", "")
+        if "no-store" in cache_control:
+            return
+
+        ttl = self.PAGE_TTL
+        if "no-cache" in cache_control:
+            ttl = 0
+        else:
+            m = self.MAX_AGE_REGEX.search(cache_control)
+            if m:
+                ttl = int(m.group(1))
+
+        self._store.put(
+            url,
+            {
+                "cache-version": str(self.CACHE_VERSION),
+                "expires": time.time() + ttl,
+                "etag": response.headers.get("ETag", cached.get("etag")),
+                "last-modified": response.headers.get(
+                    "Last-Modified", cached.get("last-modified")
+                ),
+                "page": page.serialize(),
+            },
+            namespace="pages",
+        )
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=LegacyRepository._pages._forget_lock)
@@ -0,0 +1,296 @@
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import weakref
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+logger = logging.getLogger(__name__)
+
+# The stores of the process, whose pending writes are committed at its end.
+_stores: "weakref.WeakSet[MetadataStore]" = weakref.WeakSet()
+
+# The connections inherited from the parent of a forked process.
+# They are never closed, which would release the locks
+# the parent process holds on the databases.
+_inherited_connections: List[sqlite3.Connection] = []
+
+
+def commit_stores() -> None:
+    """
+    Commit the pending writes of all the stores.
+
+    Forked processes exiting without running the exit hooks
+    call it to keep what they retrieved.
+    """
+    for store in list(_stores):
+        store._commit_at_exit()
+
+
+def _forget_connections() -> None:
+    for store in list(_stores):
+        store._forget_connection()
+
+
+atexit.register(commit_stores)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_connections)
+
+
+class MetadataStore:
+    """
+    Persistent store of the metadata of a repository,
+    backed by a single SQLite database.
+
+    Writes are buffered and committed together, in a single transaction,
+    at the end of the process or when enough of them are pending.
+    The writes still pending when a store is collected are committed then.
+    """
+
+    FILENAME = "metadata.sqlite"
+
+    # Number of pending writes that triggers a commit
+    BATCH_SIZE = 1000
+
+    def __init__(self, directory: Path) -> None:
+        self._directory = directory
+        self._path = directory / self.FILENAME
+        self._connection: Optional[sqlite3.Connection] = None
+        self._pending: Dict[Tuple[str, str], str] = {}
+        self._lock = threading.RLock()
+
+        _stores.add(self)
+
+        # The pending writes are shared with the finalizer: they are only
+        # ever cleared, never replaced.
+        self._finalizer = weakref.finalize(
+            self, MetadataStore._commit_pending, directory, self._pending
+        )
+        # The stores still alive are committed by commit_stores()
+        self._finalizer.atexit = False
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def get(self, key: str, namespace: str = "releases") -> Any:
+        with self._lock:
+            value = self._pending.get((namespace, key))
+            if value is None:
+                row = self._execute(
+                    "SELECT value FROM metadata WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                ).fetchone()
+
+                if row is not None:
+                    value = row[0]
+                elif namespace == "releases":
+                    return self._migrate(key)
+
+        if value is None:
+            return
+
+        return json.loads(value)
+
+    def has(self, key: str, namespace: str = "releases") -> bool:
+        return self.get(key, namespace=namespace) is not None
+
+    def put(self, key: str, value: Any, namespace: str = "releases") -> None:
+        with self._lock:
+            self._pending[(namespace, key)] = json.dumps(value)
+
+            if len(self._pending) >= self.BATCH_SIZE:
+                self.commit()
+
+    def remember(
+        self, key: str, callback: Callable[[], Any], namespace: str = "releases"
+    ) -> Any:
+        """
+        Return the value stored for a key,
+        or store and return the result of the callback if there is none.
+        """
+        value = self.get(key, namespace=namespace)
+        if value is None:
+            value = callback()
+            self.put(key, value, namespace=namespace)
+
+        return value
+
+    def forget(self, key: str, namespace: str = "releases") -> None:
+        with self._lock:
+            self._pending.pop((namespace, key), None)
+
+            with self._connect() as connection:
+                connection.execute(
+                    "DELETE FROM metadata WHERE namespace = ? AND key = ?",
+                    (namespace, key),
+                )
+
+        if namespace == "releases":
+            legacy_path = self._legacy_path(key)
+            if legacy_path.exists():
+                legacy_path.unlink()
+
+    def count(self) -> int:
+        with self._lock:
+            self.commit()
+
+            return self._execute("SELECT COUNT(*) FROM metadata").fetchone()[0]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._pending.clear()
+
+            with self._connect() as connection:
+                connection.execute("DELETE FROM metadata")
+
+    def commit(self) -> None:
+        with self._lock:
+            if not self._pending:
+                return
+
+            with self._connect() as connection:
+                connection.executemany(
+                    "INSERT OR REPLACE INTO metadata (namespace, key, value) "
+                    "VALUES (?, ?, ?)",
+                    [
+                        (namespace, key, value)
+                        for (namespace, key), value in self._pending.items()
+                    ],
+                )
+
+            self._pending.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self.commit()
+
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    @classmethod
+    def _commit_pending(
+        cls, directory: Path, pending: Dict[Tuple[str, str], str]
+    ) -> None:
+        if not pending:
+            return
+
+        store = cls(directory)
+        store._pending.update(pending)
+        store._commit_at_exit()
+
+    def _commit_at_exit(self) -> None:
+        try:
+            self.close()
+        except (OSError, sqlite3.Error) as e:
+            logger.debug(
+                "Unable to write the metadata cache {}: {}".format(self._path, e)
+            )
+
+    def _forget_connection(self) -> None:
+        # SQLite connections cannot be used across a fork, and the locks of the parent
+        # may have been held by one of its threads: a forked process starts over.
+        # The writes pending in the parent process are committed by it.
+        if self._connection is not None:
+            _inherited_connections.append(self._connection)
+
+        self._connection = None
+        self._pending.clear()
+        self._lock = threading.RLock()
+
+    def _execute(self, sql: str, parameters: Tuple = ()) -> sqlite3.Cursor:
+        return self._connect().execute(sql, parameters)
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None:
+            return self._connection
+
+        self._directory.mkdir(parents=True, exist_ok=True)
+
+        try:
+            self._connection = self._open()
+        except sqlite3.DatabaseError:
+            # The database is corrupted: it is only a cache, start over
+            logger.debug(
+                "Recreating the corrupted metadata cache {}".format(self._path)
+            )
+            self._path.unlink()
+            self._connection = self._open()
+
+        return self._connection
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            str(self._path), timeout=30, check_same_thread=False
+        )
+
+        try:
+            # Let other processes read the cache while it is written
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS metadata ("
+                "namespace TEXT NOT NULL, "
+                "key TEXT NOT NULL, "
+                "value TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, key)"
+                ") WITHOUT ROWID"
+            )
+        except sqlite3.DatabaseError:
+            connection.close()
+
+            raise
+
+        return connection
+
+    def _legacy_path(self, key: str) -> Path:
+        """
+        Return the path of the file the entry of the given key was stored in
+        by the previous, file based, cache of the repository.
+        """
+        h = hashlib.sha256(key.encode()).hexdigest()
+        parts = [h[i : i + 2] for i in range(0, 16, 2)]
+
+        return self._directory.joinpath(*parts, h)
+
+    def _migrate(self, key: str) -> Any:
+        """
+        Move the entry of the given key from the previous,
+        file based, cache of the repository if it exists.
+        """
+        path = self._legacy_path(key)
+        if not path.exists():
+            return
+
+        try:
+            content = path.read_bytes()
+            expires = int(content[:10])
+            value = json.loads(content[10:].decode())
+        except (OSError, ValueError):
+            return
+        finally:
+            try:
+                os.remove(str(path))
+            except OSError:
+                pass
+
+        if time.time() >= expires:
+            return
+
+        self.put(key, value)
+
+        return value
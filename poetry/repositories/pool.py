@@ -1,19 +1,41 @@
+import os
+import threading
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
+from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import Iterable
 from typing import List
 from typing import Optional
+from typing import Tuple
+
+from poetry.utils.helpers import canonicalize_name
+from poetry.utils.http_client import get_http_clients
 
 from .base_repository import BaseRepository
 from .exceptions import PackageNotFound
+from .remote_repository import RemoteRepository
 from .repository import Repository
 
 
 if TYPE_CHECKING:
     from poetry.core.packages import Dependency
     from poetry.core.packages import Package
+    from poetry.utils.fetch_engine import FetchEngine
 
 
 class Pool(BaseRepository):
+
+    # The packages of the repositories are searched for concurrently,
+    # by threads shared by all the pools
+    MAX_WORKERS = 10
+
+    _executor: Optional[ThreadPoolExecutor] = None
+    _executor_lock = threading.Lock()
+
     def __init__(
         self,
         repositories: Optional[List[Repository]] = None,
@@ -26,6 +48,11 @@ class Pool(BaseRepository):
         self._repositories: List[Repository] = []
         self._default = False
         self._secondary_start_idx = None
+        self._offline = False
+        self._fetch_engine: Optional["FetchEngine"] = None
+
+        # The repository that provided each package found, by name and version
+        self._sources: Dict[Tuple[str, str], Repository] = {}
 
         for repository in repositories:
             self.add_repository(repository)
@@ -38,6 +65,14 @@ class Pool(BaseRepository):
     def repositories(self) -> List[Repository]:
         return self._repositories
 
+    @property
+    def offline(self) -> bool:
+        return self._offline
+
+    @property
+    def fetch_engine(self) -> Optional["FetchEngine"]:
+        return self._fetch_engine
+
     def has_default(self) -> bool:
         return self._default
 
@@ -64,6 +99,13 @@ class Pool(BaseRepository):
         repository_name = (
             repository.name.lower() if repository.name is not None else None
         )
+        if isinstance(repository, RemoteRepository):
+            if self._offline:
+                repository.set_offline()
+
+            if self._fetch_engine is not None:
+                repository.set_fetch_engine(self._fetch_engine)
+
         if default:
             if self.has_default():
                 raise ValueError("Only one repository can be the default")
@@ -101,6 +143,41 @@ class Pool(BaseRepository):
 
         return self
 
+    def set_offline(self, offline: bool = True) -> "Pool":
+        """
+        Only use the cached information of the remote repositories
+        and the cached distributions, without ever accessing the network.
+        """
+        self._offline = offline
+
+        for repository in self._repositories:
+            if isinstance(repository, RemoteRepository):
+                repository.set_offline(offline)
+
+        return self
+
+    def set_fetch_engine(self, engine: Optional["FetchEngine"]) -> "Pool":
+        """
+        Send the requests of the remote repositories with the given fetch engine.
+        """
+        self._fetch_engine = engine
+
+        for repository in self._repositories:
+            if isinstance(repository, RemoteRepository):
+                repository.set_fetch_engine(engine)
+
+        return self
+
+    def preload(self, names: Iterable[str]) -> None:
+        """
+        Retrieve at once, from each remote repository,
+        the information of the given packages that later lookups will need.
+        """
+        names = list(names)
+        for repository in self._repositories:
+            if isinstance(repository, RemoteRepository):
+                repository.preload(names)
+
     def remove_repository(self, repository_name: str) -> "Pool":
         if repository_name is not None:
             repository_name = repository_name.lower()
@@ -133,7 +210,27 @@ class Pool(BaseRepository):
             except PackageNotFound:
                 pass
         else:
-            for idx, repo in enumerate(self._repositories):
+            repositories = self._repositories
+
+            # Go straight to the repository the package was found in, if any
+            source = self._sources.get((canonicalize_name(name), version))
+            if source is not None:
+                try:
+                    package = source.package(name, version, extras=extras)
+                except PackageNotFound:
+                    package = None
+
+                if package:
+                    self._packages.append(package)
+
+                    return package
+
+                repositories = [repo for repo in repositories if repo is not source]
+
+            # Retrieving the information of a release can mean inspecting
+            # its distributions, so repositories are queried in turn
+            # rather than all at once, and the first one providing it wins.
+            for repo in repositories:
                 try:
                     package = repo.package(name, version, extras=extras)
                 except PackageNotFound:
@@ -161,9 +258,24 @@ class Pool(BaseRepository):
         if repository is not None and not self._ignore_repository_names:
             return self.repository(repository).find_packages(dependency)
 
+        futures = self._start(
+            self._repositories, lambda repo: repo.find_packages(dependency)
+        )
         packages = []
-        for repo in self._repositories:
-            packages += repo.find_packages(dependency)
+        try:
+            # Results are merged in the priority order of the repositories
+            for repo, future in zip(self._repositories, futures):
+                if future is not None:
+                    found = future.result()
+                else:
+                    found = repo.find_packages(dependency)
+
+                for package in found:
+                    self._sources.setdefault((package.name, package.version.text), repo)
+
+                packages += found
+        finally:
+            self._cancel(futures)
 
         return packages
 
@@ -178,3 +290,47 @@ class Pool(BaseRepository):
             results += repository.search(query)
 
         return results
+
+    @classmethod
+    def _forget_executor(cls) -> None:
+        # The threads of the executor are not carried over to forked processes
+        cls._executor = None
+        cls._executor_lock = threading.Lock()
+
+    @classmethod
+    def _get_executor(cls) -> ThreadPoolExecutor:
+        with cls._executor_lock:
+            if cls._executor is None:
+                get_http_clients().reserve(cls.MAX_WORKERS)
+                cls._executor = ThreadPoolExecutor(
+                    max_workers=cls.MAX_WORKERS, thread_name_prefix="poetry-pool"
+                )
+
+            return cls._executor
+
+    def _start(
+        self, repositories: List[Repository], lookup: Callable[[Repository], Any]
+    ) -> List[Optional[Future]]:
+        """
+        Start a lookup in all the given repositories at once,
+        if more than one of them is remote.
+
+        Otherwise, no future is returned and lookups
+        are expected to be done in turn.
+        """
+        remote = [repo for repo in repositories if isinstance(repo, RemoteRepository)]
+        if len(remote) < 2:
+            return [None] * len(repositories)
+
+        executor = self._get_executor()
+
+        return [executor.submit(lookup, repo) for repo in repositories]
+
+    def _cancel(self, futures: List[Optional[Future]]) -> None:
+        for future in futures:
+            if future is not None:
+                future.cancel()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=Pool._forget_executor)
@@ -1,16 +1,18 @@
 import logging
 import os
+import time
 import urllib.parse
 
 from collections import defaultdict
 from pathlib import Path
 from typing import Dict
+from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Union
 
 import requests
 
-from cachecontrol import CacheControl
 from cachecontrol.caches.file_cache import FileCache
 from cachecontrol.controller import logger as cache_control_logger
 from cachy import CacheManager
@@ -29,10 +31,16 @@ from poetry.locations import REPOSITORY_CACHE_DIR
 from poetry.utils._compat import to_str
 from poetry.utils.helpers import download_file
 from poetry.utils.helpers import temporary_directory
+from poetry.utils.http_client import get_http_clients
 from poetry.utils.patterns import wheel_file_re
 
+from ..config.config import Config
 from ..inspection.info import PackageInfo
+from ..inspection.lazy_wheel import LazyWheelUnsupportedError
+from ..inspection.lazy_wheel import metadata_from_wheel_url
+from .exceptions import OfflineError
 from .exceptions import PackageNotFound
+from .metadata_store import MetadataStore
 from .remote_repository import RemoteRepository
 
 
@@ -50,6 +58,7 @@ class PyPiRepository(RemoteRepository):
         url: str = "https://pypi.org/",
         disable_cache: bool = False,
         fallback: bool = True,
+        config: Optional[Config] = None,
     ) -> None:
         super(PyPiRepository, self).__init__(url.rstrip("/") + "/simple/")
 
@@ -57,27 +66,29 @@ class PyPiRepository(RemoteRepository):
         self._disable_cache = disable_cache
         self._fallback = fallback
 
+        config = config or Config(use_environment=True)
+        self._not_found_ttl = config.get("cache.not-found-ttl")
+
         release_cache_dir = REPOSITORY_CACHE_DIR / "pypi"
         self._cache = CacheManager(
             {
-                "default": "releases",
+                "default": "packages",
                 "serializer": "json",
                 "stores": {
-                    "releases": {"driver": "file", "path": str(release_cache_dir)},
                     "packages": {"driver": "dict"},
+                    "releases": {"driver": "dict"},
                 },
             }
         )
+        self._store = MetadataStore(release_cache_dir)
 
         self._cache_control_cache = FileCache(str(release_cache_dir / "_http"))
-        self._session = CacheControl(
-            requests.session(), cache=self._cache_control_cache
-        )
+        self._session = get_http_clients().session(cache=self._cache_control_cache)
 
         self._name = "PyPI"
 
     @property
-    def session(self) -> CacheControl:
+    def session(self) -> requests.Session:
         return self._session
 
     def find_packages(self, dependency: Dependency) -> List[Package]:
@@ -102,7 +113,7 @@ class PyPiRepository(RemoteRepository):
                 allow_prereleases = True
 
         try:
-            info = self.get_package_info(dependency.name)
+            info = self._get_releases(dependency.name)
         except PackageNotFound:
             self._log(
                 "No packages found for {} {}".format(dependency.name, str(constraint)),
@@ -114,7 +125,7 @@ class PyPiRepository(RemoteRepository):
         ignored_pre_release_packages = []
 
         for version, release in info["releases"].items():
-            if not release:
+            if not release["files"]:
                 # Bad release
                 self._log(
                     "No release information found for {}-{}, skipping".format(
@@ -125,7 +136,7 @@ class PyPiRepository(RemoteRepository):
                 continue
 
             try:
-                package = Package(info["info"]["name"], version)
+                package = Package(info["name"], version)
             except ParseVersionError:
                 self._log(
                     'Unable to parse version "{}" for the {} package, skipping'.format(
@@ -166,7 +177,9 @@ class PyPiRepository(RemoteRepository):
 
         search = {"q": query}
 
-        response = requests.session().get(self._base_url + "search", params=search)
+        response = (
+            get_http_clients().session().get(self._base_url + "search", params=search)
+        )
         content = parse(response.content, namespaceHTMLElements=False)
         for result in content.findall(".//*[@class='package-snippet']"):
             name = result.find("h3/*[@class='package-snippet__name']").text
@@ -214,6 +227,38 @@ class PyPiRepository(RemoteRepository):
 
         return data
 
+    def _get_releases(self, name: str) -> dict:
+        """
+        Return the releases of a package given its name,
+        as kept by _compact_package_info().
+        """
+        if self._disable_cache:
+            return self._compact_package_info(self._get_package_info(name))
+
+        return self._cache.store("releases").remember_forever(
+            name, lambda: self._compact_package_info(self._get_package_info(name))
+        )
+
+    @staticmethod
+    def _compact_package_info(data: dict) -> dict:
+        """
+        Keep only what is needed to find packages from the project information,
+        which describes every file of every release and can be very large.
+        """
+        releases = {}
+        for version, files in data["releases"].items():
+            releases[version] = {
+                "files": [
+                    {
+                        "file": file_info["filename"],
+                        "hash": "sha256:" + file_info["digests"]["sha256"],
+                    }
+                    for file_info in files
+                ],
+            }
+
+        return {"name": data["info"]["name"], "releases": releases}
+
     def get_release_info(self, name: str, version: str) -> PackageInfo:
         """
         Return the release information given a package name and a version.
@@ -221,10 +266,17 @@ class PyPiRepository(RemoteRepository):
         The information is returned from the cache if it exists
         or retrieved from the remote server.
         """
+        if self._offline:
+            cached = self._store.get("{}:{}".format(name, version))
+            if not cached or cached.get("_cache_version") != str(self.CACHE_VERSION):
+                raise OfflineError(["{} {} from {}".format(name, version, self.name)])
+
+            return PackageInfo.load(cached)
+
         if self._disable_cache:
             return PackageInfo.load(self._get_release_info(name, version))
 
-        cached = self._cache.remember_forever(
+        cached = self._store.remember(
             "{}:{}".format(name, version), lambda: self._get_release_info(name, version)
         )
 
@@ -237,7 +289,7 @@ class PyPiRepository(RemoteRepository):
             )
             cached = self._get_release_info(name, version)
 
-            self._cache.forever("{}:{}".format(name, version), cached)
+            self._store.put("{}:{}".format(name, version), cached)
 
         return PackageInfo.load(cached)
 
@@ -315,20 +367,113 @@ class PyPiRepository(RemoteRepository):
         return data.asdict()
 
     def _get(self, endpoint: str) -> Union[dict, None]:
+        url = self._base_url + endpoint
+        if self._is_not_found(url):
+            return None
+
+        if self._offline:
+            json_response = self._get_cached_response(url)
+            if json_response is None:
+                raise OfflineError([url])
+
+            return json_response.json()
+
         try:
-            json_response = self.session.get(self._base_url + endpoint)
+            json_response = self._request(url)
         except requests.exceptions.TooManyRedirects:
             # Cache control redirect loop.
             # We try to remove the cache and try again
-            self._cache_control_cache.delete(self._base_url + endpoint)
-            json_response = self.session.get(self._base_url + endpoint)
+            self._cache_control_cache.delete(url)
+            json_response = self._request(url)
+
+        return self._json_from_response(url, json_response)
+
+    def _json_from_response(
+        self, url: str, response: requests.Response
+    ) -> Union[dict, None]:
+        if response.status_code == 404:
+            self._remember_not_found(url)
 
-        if json_response.status_code == 404:
             return None
 
-        json_data = json_response.json()
+        return response.json()
+
+    def preload(self, names: Iterable[str]) -> None:
+        if self._fetch_engine is None or self._offline or self._disable_cache:
+            return
+
+        store = self._cache.store("releases")
+        urls = {}
+        for name in names:
+            url = self._base_url + "pypi/{}/json".format(name)
+            if name in urls or store.has(name) or self._is_not_found(url):
+                continue
+
+            urls[name] = url
+
+        responses = self._fetch_engine.send_all(
+            self.session, [requests.Request("GET", url) for url in urls.values()]
+        )
+        for (name, url), response in zip(urls.items(), responses):
+            # Preloading is purely speculative: failures are ignored here
+            # and will resurface, if relevant, when the package is looked up.
+            if isinstance(response, Exception):
+                continue
+
+            try:
+                data = self._json_from_response(url, response)
+            except ValueError:
+                continue
+
+            if data is not None:
+                store.forever(name, self._compact_package_info(data))
+
+    def _is_not_found(self, url: str) -> bool:
+        """
+        Return whether the URL was recently found not to exist,
+        or at any time when offline.
+        """
+        if self._disable_cache or not self._not_found_ttl:
+            return False
+
+        not_found = self._store.get(url, namespace="not-found")
+        if not_found is None:
+            return False
+
+        if not self._offline and not_found["expires"] <= time.time():
+            return False
+
+        self._log("{} was not found recently, skipping".format(url), level="debug")
+
+        return True
+
+    def _remember_not_found(self, url: str) -> None:
+        if self._disable_cache or not self._not_found_ttl:
+            return
+
+        self._store.put(
+            url, {"expires": time.time() + self._not_found_ttl}, namespace="not-found"
+        )
+
+    def _get_cached_response(self, url: str) -> Optional[requests.Response]:
+        """
+        Return the response stored by the HTTP cache for a URL, even if it is stale,
+        following the redirections it has stored as well.
+        """
+        adapter = self.session.get_adapter(url)
+        for _ in range(self.session.max_redirects):
+            request = self.session.prepare_request(requests.Request("GET", url))
+            cached = adapter.controller.serializer.loads(
+                request, adapter.cache.get(adapter.controller.cache_url(url))
+            )
+            if cached is None:
+                return
 
-        return json_data
+            response = adapter.build_response(request, cached, from_cache=True)
+            if not response.is_redirect:
+                return response
+
+            url = urllib.parse.urljoin(url, response.headers["Location"])
 
     def _get_info_from_urls(self, urls: Dict[str, List[str]]) -> PackageInfo:
         # Checking wheels first as they are more likely to hold
@@ -423,21 +568,40 @@ class PyPiRepository(RemoteRepository):
         return self._get_info_from_sdist(urls["sdist"][0])
 
     def _get_info_from_wheel(self, url: str) -> PackageInfo:
-        self._log(
-            "Downloading wheel: {}".format(
-                urllib.parse.urlparse(url).path.rsplit("/")[-1]
-            ),
-            level="debug",
-        )
-
         filename = os.path.basename(urllib.parse.urlparse(url).path.rsplit("/")[-1])
 
+        try:
+            return self._get_info_from_wheel_metadata(url)
+        except LazyWheelUnsupportedError as e:
+            self._log(
+                "Unable to read metadata of {} lazily: {}".format(filename, e),
+                level="debug",
+            )
+
+        self._log("Downloading wheel: {}".format(filename), level="debug")
+
         with temporary_directory() as temp_dir:
             filepath = Path(temp_dir) / filename
             self._download(url, str(filepath))
 
             return PackageInfo.from_wheel(filepath)
 
+    def _get_info_from_wheel_metadata(self, url: str) -> PackageInfo:
+        """
+        Retrieve the information of a remote wheel by only fetching
+        its METADATA file, using HTTP range requests.
+        """
+        self._log(
+            "Retrieving metadata of wheel: {}".format(
+                urllib.parse.urlparse(url).path.rsplit("/")[-1]
+            ),
+            level="debug",
+        )
+
+        return PackageInfo.from_core_metadata(
+            metadata_from_wheel_url(url, self.session)
+        )
+
     def _get_info_from_sdist(self, url: str) -> PackageInfo:
         self._log(
             "Downloading sdist: {}".format(
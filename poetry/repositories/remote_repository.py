@@ -1,7 +1,22 @@
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import Iterable
+from typing import Optional
+
+import requests
+
 from .repository import Repository
 
 
+if TYPE_CHECKING:
+    from poetry.utils.fetch_engine import FetchEngine
+
+
 class RemoteRepository(Repository):
+
+    _offline = False
+    _fetch_engine: Optional["FetchEngine"] = None
+
     def __init__(self, url: str) -> None:
         self._url = url
 
@@ -14,3 +29,43 @@ class RemoteRepository(Repository):
     @property
     def authenticated_url(self) -> str:
         return self._url
+
+    @property
+    def offline(self) -> bool:
+        return self._offline
+
+    def set_offline(self, offline: bool = True) -> "RemoteRepository":
+        """
+        Only use the cached information of the repository,
+        without ever accessing the network.
+        """
+        self._offline = offline
+
+        return self
+
+    @property
+    def fetch_engine(self) -> Optional["FetchEngine"]:
+        return self._fetch_engine
+
+    def set_fetch_engine(self, engine: Optional["FetchEngine"]) -> "RemoteRepository":
+        """
+        Send the requests of the repository with the given fetch engine,
+        which can send many of them at once when preloading packages.
+        """
+        self._fetch_engine = engine
+
+        return self
+
+    def preload(self, names: Iterable[str]) -> None:
+        """
+        Retrieve at once the information of the given packages
+        that later lookups will need, when a fetch engine is set.
+        """
+
+    def _request(self, url: str, **kwargs: Any) -> requests.Response:
+        if self._fetch_engine is None:
+            return self.session.get(url, **kwargs)
+
+        return self._fetch_engine.send(
+            self.session, requests.Request("GET", url, **kwargs)
+        )
@@ -0,0 +1,178 @@
+import atexit
+import os
+import threading
+import weakref
+
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import requests
+
+from poetry.utils.http_client import HTTPClients
+from poetry.utils.http_client import get_http_clients
+
+
+# The number of requests sent concurrently, unless specified otherwise
+DEFAULT_MAX_CONCURRENCY = 16
+
+# The number of seconds to wait for a connection, or for data from the host
+DEFAULT_TIMEOUT = 15.0
+
+
+class FetchEngine:
+    """
+    Sends many HTTP requests at once, from a pool of threads.
+
+    Any number of requests can be sent at once with send_all(),
+    of which at most max_concurrency are in flight at any time.
+    The requests are sent by the session they are for, exactly as if
+    they had been sent by the caller: they are authenticated, cached,
+    redirected and proxied by the session and its adapters.
+
+    Identical requests in flight at the same time are only sent once,
+    so that callers looking for a page being preloaded wait for it.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        timeout: float = DEFAULT_TIMEOUT,
+        clients: Optional[HTTPClients] = None,
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._clients = clients or get_http_clients()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[Tuple, "Future[requests.Response]"] = {}
+
+    @property
+    def max_concurrency(self) -> int:
+        return self._max_concurrency
+
+    def send(
+        self, session: requests.Session, request: requests.Request
+    ) -> requests.Response:
+        """
+        Send a request for the given session and return its response.
+        """
+        return self._send(session, request)
+
+    def send_all(
+        self, session: requests.Session, requests_: List[requests.Request]
+    ) -> List[Union[requests.Response, Exception]]:
+        """
+        Send requests concurrently for the given session and return,
+        in the same order, their responses or the errors they raised.
+        """
+        if not requests_:
+            return []
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(self._send, session, request) for request in requests_
+        ]
+
+        results: List[Union[requests.Response, Exception]] = []
+        for future in futures:
+            error = future.exception()
+            results.append(error if error is not None else future.result())
+
+        return results
+
+    def close(self) -> None:
+        """
+        Stop the threads, if they were started.
+        Engines still running are closed at the end of the process.
+        """
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _send(
+        self, session: requests.Session, request: requests.Request
+    ) -> requests.Response:
+        prepared = session.prepare_request(request)
+        settings = session.merge_environment_settings(
+            prepared.url, {}, None, None, None
+        )
+
+        key = (
+            id(session),
+            prepared.url,
+            tuple(sorted(prepared.headers.items())),
+            repr(settings["verify"]),
+            repr(settings["cert"]),
+        )
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                future = self._pending[key] = Future()
+
+        if pending is not None:
+            return pending.result()
+
+        try:
+            response = session.send(prepared, timeout=self._timeout, **settings)
+        except BaseException as e:
+            future.set_exception(e)
+
+            raise
+        else:
+            future.set_result(response)
+
+            return response
+        finally:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # The connection pools keep as many connections alive
+                self._clients.reserve(self._max_concurrency)
+                _engines.add(self)
+
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self._max_concurrency,
+                    thread_name_prefix="poetry-fetch-engine",
+                )
+
+            return self._executor
+
+    def _forget_executor(self) -> None:
+        # The threads of the executor are not carried over to forked processes
+        self._lock = threading.Lock()
+        self._executor = None
+        self._pending = {}
+
+
+# The engines whose threads are running, to stop at the end of the process.
+_engines: "weakref.WeakSet[FetchEngine]" = weakref.WeakSet()
+
+
+def _close_engines() -> None:
+    for engine in list(_engines):
+        engine.close()
+
+
+def _forget_engines() -> None:
+    for engine in list(_engines):
+        engine._forget_executor()
+
+    _engines.clear()
+
+
+atexit.register(_close_engines)
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_engines)
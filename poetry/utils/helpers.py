@@ -18,6 +18,7 @@ import requests
 from poetry.config.config import Config
 from poetry.core.packages.package import Package
 from poetry.core.version import Version
+from poetry.utils.http_client import get_http_clients
 
 
 try:
@@ -100,9 +101,10 @@ def download_file(
     session: Optional[requests.Session] = None,
     chunk_size: int = 1024,
 ) -> None:
-    get = requests.get if not session else session.get
+    if session is None:
+        session = get_http_clients().session()
 
-    with get(url, stream=True) as response:
+    with session.get(url, stream=True) as response:
         response.raise_for_status()
 
         with open(dest, "wb") as f:
@@ -140,3 +142,32 @@ def is_dir_writable(path: Path, create: bool = False) -> bool:
         return False
     else:
         return True
+
+
+_size_regex = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+_duration_regex = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([smhdw]?)\s*$", re.IGNORECASE)
+
+
+def parse_size(size: str) -> int:
+    """
+    Convert a size, like 512M or 10GB, to a number of bytes.
+    """
+    m = _size_regex.match(str(size))
+    if not m:
+        raise ValueError("Invalid size: {}".format(size))
+
+    return int(float(m.group(1)) * 1024 ** "_kmgt".index(m.group(2).lower() or "_"))
+
+
+def parse_duration(duration: str) -> float:
+    """
+    Convert a duration, like 12h or 30d, to a number of seconds.
+    A duration without a unit is a number of days.
+    """
+    m = _duration_regex.match(str(duration))
+    if not m:
+        raise ValueError("Invalid duration: {}".format(duration))
+
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+
+    return float(m.group(1)) * units[m.group(2).lower() or "d"]
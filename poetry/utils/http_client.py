@@ -0,0 +1,501 @@
+import math
+import os
+import threading
+import time
+import weakref
+
+from email.utils import parsedate_to_datetime
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Type
+from urllib.parse import urlsplit
+
+import requests
+
+from cachecontrol import CacheControlAdapter
+from cachecontrol.cache import BaseCache
+from requests.adapters import HTTPAdapter
+from requests.utils import select_proxy
+from urllib3 import PoolManager
+from urllib3.connectionpool import HTTPConnectionPool
+from urllib3.connectionpool import HTTPSConnectionPool
+
+
+# The number of connections kept alive for each host,
+# unless more concurrent requests are expected.
+DEFAULT_POOL_MAXSIZE = 10
+
+# The number of hosts whose connections are kept alive
+DEFAULT_NUM_POOLS = 20
+
+# The number of times a throttled idempotent request is sent again
+THROTTLED_RETRIES = 5
+
+# The longest a host asking to retry later is waited for, in seconds
+MAX_RETRY_AFTER = 60.0
+
+
+def _tls_pool_kwargs(url: str, verify: Any = True, cert: Any = None) -> Dict[str, Any]:
+    """
+    Return the settings of the connection pool to use for a request
+    with the given TLS settings, which tell apart the pools of a host.
+    """
+    if not url.lower().startswith("https"):
+        return {}
+
+    kwargs: Dict[str, Any] = {"cert_reqs": "CERT_REQUIRED" if verify else "CERT_NONE"}
+    if verify and verify is not True:
+        kwargs["ca_cert_dir" if os.path.isdir(verify) else "ca_certs"] = verify
+
+    if cert:
+        if isinstance(cert, str):
+            kwargs["cert_file"] = cert
+        else:
+            kwargs["cert_file"], kwargs["key_file"] = cert
+
+    return kwargs
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Return the number of seconds to wait given a Retry-After header,
+    which is either a number of seconds or an HTTP date.
+    """
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        delay = float(value)
+    else:
+        try:
+            date = parsedate_to_datetime(value)
+        except (TypeError, ValueError, IndexError):
+            return None
+
+        delay = date.timestamp() - time.time()
+
+    return min(max(0.0, delay), MAX_RETRY_AFTER)
+
+
+class ConnectionStats:
+    """
+    The number of connections opened to a host and the number of requests
+    they served, to tell how well connections are reused.
+    """
+
+    def __init__(self, opened: int = 0, requests: int = 0) -> None:
+        self.opened = opened
+        self.requests = requests
+
+    @property
+    def reused(self) -> int:
+        return max(0, self.requests - self.opened)
+
+    def __repr__(self) -> str:
+        return "ConnectionStats(opened={}, reused={})".format(self.opened, self.reused)
+
+
+class HostLimiter:
+    """
+    Adapts the load put on a host to how well it copes with it.
+
+    Once the host throttled a request, the number of concurrent requests
+    is limited following an AIMD scheme: the limit grows by one for each limit's worth of successful requests
+    and is halved whenever the host throttles a request.
+    Once throttled, the requests are also paced by a token bucket
+    whose rate follows the same scheme, and no request at all is sent
+    before the delay the host asked for with a Retry-After header.
+    """
+
+    MIN_RATE = 1.0
+
+    # The longest a request waits for its turn, in seconds, before being sent
+    # anyway, so that requests never finishing, like streamed responses
+    # never closed, cannot hold up the other requests to the host forever
+    MAX_WAIT = 120.0
+
+    def __init__(self, limit: int) -> None:
+        self._condition = threading.Condition()
+        self._max_limit = limit
+        self._limit = float(limit)
+        self._in_flight = 0
+        self._rate: Optional[float] = None
+        self._tokens = 0.0
+        self._refilled_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._throttled = 0
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def rate(self) -> Optional[float]:
+        return self._rate
+
+    @property
+    def throttled(self) -> int:
+        return self._throttled
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def grow(self, limit: int) -> None:
+        with self._condition:
+            if limit > self._max_limit:
+                self._max_limit = limit
+                self._condition.notify_all()
+
+    def acquire(self) -> None:
+        deadline = time.monotonic() + self.MAX_WAIT
+        with self._condition:
+            while True:
+                delay = self._take()
+                if delay is None:
+                    return
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._in_flight += 1
+
+                    return
+
+                # Without a known delay, a request has to finish first
+                self._condition.wait(min(delay, remaining))
+
+    def _take(self) -> Optional[float]:
+        now = time.monotonic()
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        if self._throttled and self._in_flight >= self.limit:
+            return math.inf
+
+        if self._rate is not None:
+            self._refill(now)
+            if self._tokens < 1:
+                return (1 - self._tokens) / self._rate
+
+            self._tokens -= 1
+
+        self._in_flight += 1
+
+        return None
+
+    def release(
+        self, throttled: bool = False, retry_after: Optional[float] = None
+    ) -> None:
+        with self._condition:
+            self._in_flight -= 1
+
+            if throttled:
+                self._throttled += 1
+                self._limit = max(1.0, self._limit / 2)
+                self._rate = max(self.MIN_RATE, (self._rate or self._limit) / 2)
+                self._tokens = 0.0
+                self._refilled_at = time.monotonic()
+
+                if retry_after:
+                    self._blocked_until = max(
+                        self._blocked_until, time.monotonic() + retry_after
+                    )
+            else:
+                self._limit = min(self._max_limit, self._limit + 1 / self._limit)
+                if self._rate is not None:
+                    self._rate += 1 / self._rate
+
+            self._condition.notify_all()
+
+    def _refill(self, now: float) -> None:
+        # The bucket holds at most one second worth of requests
+        self._tokens = min(
+            self._rate, self._tokens + (now - self._refilled_at) * self._rate
+        )
+        self._refilled_at = now
+
+    def __repr__(self) -> str:
+        return "HostLimiter(limit={}, rate={})".format(self.limit, self._rate)
+
+
+class _SharedAdapter(HTTPAdapter):
+
+    _clients: "HTTPClients"
+
+    def init_poolmanager(self, *args: Any, **kwargs: Any) -> None:
+        self.poolmanager = self._clients.pool_manager
+        self._tls = threading.local()
+
+    def get_connection_with_tls_context(
+        self,
+        request: requests.PreparedRequest,
+        verify: Any,
+        proxies: Optional[Dict[str, str]] = None,
+        cert: Any = None,
+    ) -> HTTPConnectionPool:
+        if select_proxy(request.url, proxies):
+            return super(_SharedAdapter, self).get_connection_with_tls_context(
+                request, verify, proxies=proxies, cert=cert
+            )
+
+        return self._pooled_connection(request.url, verify, cert)
+
+    def get_connection(
+        self, url: str, proxies: Optional[Dict[str, str]] = None
+    ) -> HTTPConnectionPool:
+        # Older versions of requests do not hand the TLS settings over,
+        # and write them onto the pool afterwards.
+        if select_proxy(url, proxies):
+            return super(_SharedAdapter, self).get_connection(url, proxies)
+
+        verify, cert = getattr(self._tls, "settings", (True, None))
+
+        return self._pooled_connection(url, verify, cert)
+
+    def _pooled_connection(
+        self, url: str, verify: Any, cert: Any
+    ) -> HTTPConnectionPool:
+        # The pools are shared by all the sessions:
+        # only the requests with the same TLS settings share one.
+        return self.poolmanager.connection_from_url(
+            url, pool_kwargs=_tls_pool_kwargs(url, verify=verify, cert=cert)
+        )
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> Any:
+        self._tls.settings = (kwargs.get("verify", True), kwargs.get("cert"))
+        limiter = self._clients.limiter(urlsplit(request.url).hostname or "")
+        retries = THROTTLED_RETRIES if request.method in ("GET", "HEAD") else 0
+
+        while True:
+            limiter.acquire()
+            try:
+                response = super(_SharedAdapter, self).send(request, **kwargs)
+            except BaseException:
+                limiter.release()
+
+                raise
+
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            # A 503 response is only a sign of throttling
+            # when the host tells when to retry.
+            throttled = response.status_code == 429 or (
+                response.status_code == 503 and retry_after is not None
+            )
+            if kwargs.get("stream"):
+                # The body is still to be downloaded:
+                # the request is in flight until the response is closed.
+                self._release_on_close(response, limiter, throttled, retry_after)
+            else:
+                limiter.release(throttled=throttled, retry_after=retry_after)
+
+            if response.status_code != 429 or not retries:
+                return response
+
+            # The limiter waits for as long as the host asked to
+            retries -= 1
+            response.close()
+
+    @staticmethod
+    def _release_on_close(
+        response: requests.Response,
+        limiter: HostLimiter,
+        throttled: bool,
+        retry_after: Optional[float],
+    ) -> None:
+        # A finalizer runs at most once, when the response is closed
+        # or, if it never is, when it is collected.
+        release = weakref.finalize(
+            response, limiter.release, throttled=throttled, retry_after=retry_after
+        )
+        close = response.close
+
+        def close_and_release() -> None:
+            try:
+                close()
+            finally:
+                release()
+
+        response.close = close_and_release
+
+    def close(self) -> None:
+        # The shared connection pools outlive the sessions:
+        # only the pools of this adapter, if any, are closed.
+        self.poolmanager = PoolManager()
+
+        super(_SharedAdapter, self).close()
+
+
+class PooledAdapter(_SharedAdapter):
+    """
+    An HTTP adapter using the connection pools shared by all the sessions.
+    """
+
+    def __init__(self, clients: "HTTPClients", **kwargs: Any) -> None:
+        self._clients = clients
+
+        super(PooledAdapter, self).__init__(**kwargs)
+
+
+class CachingAdapter(CacheControlAdapter, _SharedAdapter):
+    """
+    An HTTP adapter caching the responses,
+    using the connection pools shared by all the sessions.
+    """
+
+    def __init__(self, clients: "HTTPClients", cache: BaseCache, **kwargs: Any) -> None:
+        self._clients = clients
+
+        super(CachingAdapter, self).__init__(cache, **kwargs)
+
+
+class HTTPClients:
+    """
+    Registry of the HTTP clients of Poetry.
+
+    The sessions it hands out share the same connection pools, one per host,
+    so that connections are kept alive and reused by the repositories,
+    the installer and the uploader alike.
+    They also share the limiter of each host,
+    so that a throttling host sees all the requests back off together.
+    """
+
+    def __init__(
+        self,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        num_pools: int = DEFAULT_NUM_POOLS,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._stats: Dict[str, ConnectionStats] = {}
+        self._limiters: Dict[str, HostLimiter] = {}
+        self._num_pools = num_pools
+        self._pool_manager = PoolManager(num_pools=num_pools, maxsize=pool_maxsize)
+        self._pool_manager.pool_classes_by_scheme = {
+            "http": self._pool_class(HTTPConnectionPool),
+            "https": self._pool_class(HTTPSConnectionPool),
+        }
+
+    @property
+    def pool_manager(self) -> PoolManager:
+        return self._pool_manager
+
+    @property
+    def pool_maxsize(self) -> int:
+        return self._pool_manager.connection_pool_kw["maxsize"]
+
+    def reserve(self, concurrency: int) -> None:
+        """
+        Make sure that enough connections to each host are kept alive
+        for the given number of concurrent requests.
+        """
+        with self._lock:
+            if concurrency <= self.pool_maxsize:
+                return
+
+            self._pool_manager.connection_pool_kw["maxsize"] = concurrency
+
+            # Existing pools cannot grow: they are recreated when needed
+            self._pool_manager.clear()
+
+            for limiter in self._limiters.values():
+                limiter.grow(concurrency)
+
+    def forget_connections(self) -> None:
+        """
+        Start over with new connection pools and limiters, without closing
+        the connections opened so far, which belong to the parent process
+        of a forked one.
+        """
+        self._lock = threading.Lock()
+        self._limiters = {}
+        # The pool manager is shared by the adapters mounted so far:
+        # only its pools are replaced, with those of a new one.
+        self._pool_manager.pools = PoolManager(
+            self._num_pools, **self._pool_manager.connection_pool_kw
+        ).pools
+
+    def session(self, cache: Optional[BaseCache] = None) -> requests.Session:
+        """
+        Return a new session, caching the responses in the given cache if any.
+        """
+        return self.mount(requests.Session(), cache=cache)
+
+    def mount(
+        self, session: requests.Session, cache: Optional[BaseCache] = None
+    ) -> requests.Session:
+        """
+        Make an existing session use the shared connection pools,
+        caching the responses in the given cache if any.
+        """
+        adapter = self.adapter(cache=cache)
+        for scheme in ("http://", "https://"):
+            session.mount(scheme, adapter)
+
+        return session
+
+    def adapter(self, cache: Optional[BaseCache] = None, **kwargs: Any) -> HTTPAdapter:
+        if cache is not None:
+            return CachingAdapter(self, cache, **kwargs)
+
+        return PooledAdapter(self, **kwargs)
+
+    def limiter(self, host: str) -> HostLimiter:
+        """
+        Return the limiter of the requests sent to the given host.
+        """
+        with self._lock:
+            limiter = self._limiters.get(host)
+            if limiter is None:
+                limiter = self._limiters[host] = HostLimiter(self.pool_maxsize)
+
+            return limiter
+
+    def limiters(self) -> Dict[str, HostLimiter]:
+        with self._lock:
+            return dict(self._limiters)
+
+    def stats(self) -> Dict[str, ConnectionStats]:
+        """
+        Return the connection statistics of each host.
+        """
+        with self._lock:
+            return {
+                host: ConnectionStats(stats.opened, stats.requests)
+                for host, stats in self._stats.items()
+            }
+
+    def record(self, host: str, opened: int = 0, requests: int = 0) -> None:
+        """
+        Count the connections opened to a host and the requests sent to it.
+        """
+        with self._lock:
+            stats = self._stats.setdefault(host, ConnectionStats())
+            stats.opened += opened
+            stats.requests += requests
+
+    def _pool_class(self, base: Type[HTTPConnectionPool]) -> Type[HTTPConnectionPool]:
+        clients = self
+
+        class CountingPool(base):
+            def _new_conn(self) -> Any:
+                clients.record(self.host, opened=1)
+
+                return super(CountingPool, self)._new_conn()
+
+            def _get_conn(self, timeout: Optional[float] = None) -> Any:
+                clients.record(self.host, requests=1)
+
+                return super(CountingPool, self)._get_conn(timeout=timeout)
+
+        return CountingPool
+
+
+_clients = HTTPClients()
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_clients.forget_connections)
+
+
+def get_http_clients() -> HTTPClients:
+    return _clients
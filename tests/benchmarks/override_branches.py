@@ -0,0 +1,142 @@
+"""
+Measure the time it takes to solve the alternative resolutions needed
+by dependencies declared several times with different markers.
+
+Usage:
+
+    python -m tests.benchmarks.override_branches [-b BRANCHES] [-p PACKAGES] \
+        [-l LATENCY] [-w WORKERS ...]
+
+The generated graph has a root package depending on an application which
+requires BRANCHES different versions of a library, each for a different
+Python version, so that as many resolutions are needed. Every version of the
+library depends on its own chain of PACKAGES packages, whose release
+information takes LATENCY milliseconds to retrieve, as from a remote index.
+
+The graph is solved with each given number of worker processes,
+and the results are checked to be identical.
+"""
+import argparse
+import time
+
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from cleo.io.null_io import NullIO
+
+from poetry.config.config import Config
+from poetry.core.packages import Package
+from poetry.core.packages.project_package import ProjectPackage
+from poetry.factory import Factory
+from poetry.puzzle.provider import Provider
+from poetry.puzzle.solver import Solver
+from poetry.repositories import Pool
+from poetry.repositories import Repository
+
+
+class SlowRepository(Repository):
+    def __init__(self, latency: float) -> None:
+        super(SlowRepository, self).__init__()
+
+        self._latency = latency
+
+    def package(
+        self, name: str, version: str, extras: Optional[List[str]] = None
+    ) -> Package:
+        time.sleep(self._latency)
+
+        return super(SlowRepository, self).package(name, version, extras=extras)
+
+
+def generate_graph(
+    branches: int, packages: int, latency: float
+) -> Tuple[ProjectPackage, Pool]:
+    root = ProjectPackage("root", "0.0.0")
+    root.python_versions = "^3.0"
+    root.add_dependency(Factory.create_dependency("app", "*"))
+
+    repository = SlowRepository(latency)
+
+    app = Package("app", "1.0")
+    for i in range(branches):
+        app.add_dependency(
+            Factory.create_dependency(
+                "lib", {"version": "1.{}".format(i), "python": "~3.{}".format(i)}
+            )
+        )
+
+        lib = Package("lib", "1.{}".format(i))
+        lib.add_dependency(Factory.create_dependency("lib-{}-0".format(i), "*"))
+        repository.add_package(lib)
+
+        for j in range(packages):
+            package = Package("lib-{}-{}".format(i, j), "1.0")
+            if j + 1 < packages:
+                package.add_dependency(
+                    Factory.create_dependency("lib-{}-{}".format(i, j + 1), "*")
+                )
+
+            repository.add_package(package)
+
+    repository.add_package(app)
+
+    pool = Pool()
+    pool.add_repository(repository)
+
+    return root, pool
+
+
+def measure(
+    branches: int, packages: int, latency: float, workers: int
+) -> Tuple[float, List[Tuple[str, str, int]]]:
+    """
+    Return the time it took to solve the generated graph, in seconds,
+    along with the name, the version and the depth of the solved packages.
+    """
+    root, pool = generate_graph(branches, packages, latency)
+
+    config = Config()
+    config.merge({"solver": {"override-workers": workers, "prefetch-workers": 0}})
+    provider = Provider(root, pool, NullIO(), config=config)
+    solver = Solver(root, pool, Repository(), Repository(), NullIO(), provider=provider)
+
+    start = time.perf_counter()
+    solved, depths = solver._solve()
+    duration = time.perf_counter() - start
+
+    return (
+        duration,
+        [
+            (package.name, package.version.text, depth)
+            for package, depth in zip(solved, depths)
+        ],
+    )
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-b", "--branches", type=int, default=8)
+    parser.add_argument("-p", "--packages", type=int, default=20)
+    parser.add_argument("-l", "--latency", type=float, default=10.0)
+    parser.add_argument("-w", "--workers", type=int, nargs="+", default=[0, 2, 4, 8])
+    options = parser.parse_args(args)
+
+    print("{:<8} {:>10} {:>10}".format("workers", "solve (s)", "identical"))
+    expected = None
+    for workers in options.workers:
+        duration, solved = measure(
+            options.branches, options.packages, options.latency / 1000, workers
+        )
+        if expected is None:
+            expected = solved
+
+        print(
+            "{:<8} {:>10.2f} {:>10}".format(
+                workers, duration, "yes" if solved == expected else "no"
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Compare the streaming anchor parser of Page with html5lib.
+
+Usage:
+
+    python -m tests.benchmarks.page_parsers [PAGE ...]
+
+Each PAGE is a simple index page recorded on disk, for instance with
+``curl https://pypi.org/simple/botocore/ > botocore.html``. When no page
+is given, the recorded fixtures of the legacy repository tests are used,
+along with a generated page the size of the one of botocore.
+"""
+import argparse
+import timeit
+
+from pathlib import Path
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from poetry.repositories.legacy_repository import Page
+
+
+FIXTURES = Path(__file__).parent.parent / "repositories" / "fixtures" / "legacy"
+
+LINK = (
+    '    <a href="https://files.pythonhosted.org/packages/{hash:.2}/{hash:.64}/'
+    "botocore-1.{version}.0-py2.py3-none-any.whl#sha256={hash:.64}"
+    '" data-requires-python="&gt;= 2.7, !=3.0.*, !=3.1.*, !=3.2.*, !=3.3.*">'
+    "botocore-1.{version}.0-py2.py3-none-any.whl</a><br/>\n"
+    '    <a href="https://files.pythonhosted.org/packages/{hash:.2}/{hash:.64}/'
+    'botocore-1.{version}.0.tar.gz#sha256={hash:.64}">'
+    "botocore-1.{version}.0.tar.gz</a><br/>\n"
+)
+
+
+def generate_page(releases: int = 5000) -> bytes:
+    links = "".join(
+        LINK.format(version=version, hash="{:064x}".format(version * 7919))
+        for version in range(releases)
+    )
+
+    return (
+        "<!DOCTYPE html>\n<html>\n  <head>\n    <title>Links for botocore</title>\n"
+        "  </head>\n  <body>\n    <h1>Links for botocore</h1>\n"
+        "{}  </body>\n</html>\n".format(links)
+    ).encode()
+
+
+def measure(content: bytes, number: int) -> Tuple[float, float]:
+    streaming = timeit.timeit(lambda: Page.parse_anchors(content), number=number)
+    html5lib = timeit.timeit(
+        lambda: Page.parse_anchors_with_html5lib(content), number=number
+    )
+
+    return streaming / number, html5lib / number
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("pages", nargs="*", type=Path)
+    parser.add_argument("-n", "--number", type=int, default=5)
+    options = parser.parse_args(args)
+
+    if options.pages:
+        pages = [(page.name, page.read_bytes()) for page in options.pages]
+    else:
+        pages = [(page.name, page.read_bytes()) for page in FIXTURES.glob("*.html")]
+        pages.append(("botocore (generated)", generate_page()))
+
+    print(
+        "{:<28} {:>8} {:>14} {:>14} {:>8}".format(
+            "page", "anchors", "streaming (ms)", "html5lib (ms)", "speedup"
+        )
+    )
+    for name, content in sorted(pages, key=lambda page: len(page[1])):
+        streaming, html5lib = measure(content, options.number)
+        print(
+            "{:<28} {:>8} {:>14.2f} {:>14.2f} {:>7.1f}x".format(
+                name,
+                len(Page.parse_anchors(content)),
+                streaming * 1000,
+                html5lib * 1000,
+                html5lib / streaming,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
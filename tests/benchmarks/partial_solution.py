@@ -0,0 +1,160 @@
+"""
+Measure the time the version solver spends looking up satisfiers
+and backtracking in its partial solution on a conflict-heavy graph.
+
+Usage:
+
+    python -m tests.benchmarks.partial_solution [-p PACKAGES] [-v VERSIONS] \
+        [--heuristic HEURISTIC ...]
+
+The generated graph has a chain of PACKAGES packages with VERSIONS
+releases each. Every release pins a shared base package to a different
+version and requires a minimum version of the next package of the chain,
+so that most decisions end up in a conflict. No solution exists and the
+solver derives the whole failure explanation.
+
+Each graph is solved with every given decision heuristic.
+"""
+import argparse
+import time
+
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from cleo.io.null_io import NullIO
+
+from poetry.core.packages import Package
+from poetry.core.packages.project_package import ProjectPackage
+from poetry.factory import Factory
+from poetry.mixology.failure import SolveFailure
+from poetry.mixology.partial_solution import PartialSolution
+from poetry.mixology.version_solver import DECISION_HEURISTICS
+from poetry.mixology.version_solver import VersionSolver
+from poetry.puzzle.provider import Provider
+from poetry.repositories import Pool
+from poetry.repositories import Repository
+
+
+def generate_graph(packages: int, versions: int) -> Tuple[ProjectPackage, Pool]:
+    root = ProjectPackage("root", "0.0.0")
+    repository = Repository()
+
+    for i in range(packages):
+        name = "package-{}".format(i)
+        root.add_dependency(Factory.create_dependency(name, "*"))
+
+        for j in range(versions):
+            package = Package(name, "1.{}".format(j))
+            package.add_dependency(
+                Factory.create_dependency("base", "1.{}".format((i + j) % versions))
+            )
+            if i + 1 < packages:
+                package.add_dependency(
+                    Factory.create_dependency(
+                        "package-{}".format(i + 1),
+                        ">=1.{}".format(j * 7 % versions),
+                    )
+                )
+
+            repository.add_package(package)
+
+    for j in range(versions):
+        repository.add_package(Package("base", "1.{}".format(j)))
+
+    pool = Pool()
+    pool.add_repository(repository)
+
+    return root, pool
+
+
+def timed(method: Callable, timings: Dict[str, List[float]]) -> Callable:
+    timing = timings.setdefault(method.__name__, [0, 0.0])
+
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            timing[0] += 1
+            timing[1] += time.perf_counter() - start
+
+    return wrapper
+
+
+def measure(
+    packages: int, versions: int, heuristic: str
+) -> Tuple[float, Dict[str, List[float]]]:
+    """
+    Return the time it took to solve the generated graph, in seconds,
+    along with the number of calls and the time spent in satisfier()
+    and backtrack().
+    """
+    root, pool = generate_graph(packages, versions)
+    solver = VersionSolver(root, Provider(root, pool, NullIO()), heuristic=heuristic)
+
+    timings = dict()
+    original = {
+        name: getattr(PartialSolution, name) for name in ("satisfier", "backtrack")
+    }
+    for name, method in original.items():
+        setattr(PartialSolution, name, timed(method, timings))
+
+    start = time.perf_counter()
+    try:
+        solver.solve()
+    except SolveFailure:
+        pass
+    finally:
+        duration = time.perf_counter() - start
+        for name, method in original.items():
+            setattr(PartialSolution, name, method)
+
+    return duration, timings
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-p", "--packages", type=int, nargs="+", default=[5, 8, 12])
+    parser.add_argument("-v", "--versions", type=int, nargs="+", default=[10, 20, 30])
+    parser.add_argument(
+        "--heuristic",
+        nargs="+",
+        choices=DECISION_HEURISTICS,
+        default=["fewest-versions"],
+    )
+    options = parser.parse_args(args)
+
+    print(
+        "{:<18} {:>8} {:>8} {:>10} {:>10} {:>16} {:>10} {:>16}".format(
+            "heuristic",
+            "packages",
+            "versions",
+            "solve (s)",
+            "satisfier",
+            "satisfier (ms)",
+            "backtrack",
+            "backtrack (ms)",
+        )
+    )
+    for packages, versions in zip(options.packages, options.versions):
+        for heuristic in options.heuristic:
+            duration, timings = measure(packages, versions, heuristic)
+            print(
+                "{:<18} {:>8} {:>8} {:>10.2f} {:>10} {:>16.1f} {:>10} {:>16.1f}".format(
+                    heuristic,
+                    packages,
+                    versions,
+                    duration,
+                    timings["satisfier"][0],
+                    timings["satisfier"][1] * 1000,
+                    timings["backtrack"][0],
+                    timings["backtrack"][1] * 1000,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Compare the memory kept for the project information of PyPI packages
+with and without the compact projection of PyPiRepository.
+
+Usage:
+
+    python -m tests.benchmarks.pypi_package_info [PROJECT_JSON ...]
+
+Each PROJECT_JSON is a project information response recorded on disk,
+for instance with ``curl https://pypi.org/pypi/boto3/json > boto3.json``.
+When none is given, a response the size of the one of boto3 is generated.
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from pathlib import Path
+from typing import Any
+from typing import Callable
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from poetry.repositories.pypi_repository import PyPiRepository
+
+
+def generate_project(releases: int = 1500) -> bytes:
+    def file_info(version: str, filename: str, packagetype: str) -> dict:
+        digest = "{:064x}".format(hash(filename) & (2**256 - 1))
+
+        return {
+            "comment_text": "",
+            "digests": {"md5": digest[:32], "sha256": digest},
+            "downloads": -1,
+            "filename": filename,
+            "has_sig": False,
+            "md5_digest": digest[:32],
+            "packagetype": packagetype,
+            "python_version": "py3" if packagetype == "bdist_wheel" else "source",
+            "requires_python": ">= 3.6",
+            "size": 131072,
+            "upload_time": "2020-01-01T00:00:00",
+            "upload_time_iso_8601": "2020-01-01T00:00:00.000000Z",
+            "url": "https://files.pythonhosted.org/packages/{}/{}/{}".format(
+                digest[:2], digest[2:], filename
+            ),
+            "yanked": False,
+            "yanked_reason": None,
+        }
+
+    versions = ["1.{}.{}".format(i // 100, i % 100) for i in range(releases)]
+
+    return json.dumps(
+        {
+            "info": {
+                "name": "boto3",
+                "version": versions[-1],
+                "summary": "The AWS SDK for Python",
+                "description": "boto3\n=====\n\n"
+                + "Lorem ipsum dolor sit amet. " * 500,
+                "requires_dist": ["botocore (<1.21.0,>=1.20.0)"],
+                "requires_python": ">= 3.6",
+            },
+            "releases": {
+                version: [
+                    file_info(
+                        version,
+                        "boto3-{}-py2.py3-none-any.whl".format(version),
+                        "bdist_wheel",
+                    ),
+                    file_info(version, "boto3-{}.tar.gz".format(version), "sdist"),
+                ]
+                for version in versions
+            },
+            "urls": [],
+        }
+    ).encode()
+
+
+def measure(load: Callable[[], Any]) -> Tuple[int, int, float]:
+    """
+    Return the memory retained by the result of load(),
+    the peak memory used while loading it and the time it took, in seconds.
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    duration = time.perf_counter() - start
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    del result
+
+    return retained, peak, duration
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("projects", nargs="*", type=Path)
+    options = parser.parse_args(args)
+
+    if options.projects:
+        projects = [(path.name, path.read_bytes()) for path in options.projects]
+    else:
+        projects = [("boto3 (generated)", generate_project())]
+
+    print(
+        "{:<24} {:<8} {:>14} {:>14} {:>10}".format(
+            "project", "format", "retained (MB)", "peak (MB)", "time (ms)"
+        )
+    )
+    for name, content in projects:
+        for kind, load in [
+            ("full", lambda: json.loads(content)),
+            (
+                "compact",
+                lambda: PyPiRepository._compact_package_info(json.loads(content)),
+            ),
+        ]:
+            retained, peak, duration = measure(load)
+            print(
+                "{:<24} {:<8} {:>14.2f} {:>14.2f} {:>10.1f}".format(
+                    name, kind, retained / 2**20, peak / 2**20, duration * 1000
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
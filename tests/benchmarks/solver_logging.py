@@ -0,0 +1,89 @@
+"""
+Measure the overhead of the logging of the version solver
+when debug output is disabled.
+
+Usage:
+
+    python -m tests.benchmarks.solver_logging [-p PACKAGES] [-v VERSIONS] [-n NUMBER]
+
+The conflict-heavy graph of the partial solution benchmark is solved
+with the solver logging as it does, with every message formatted before
+being discarded, as it used to, and with no logging at all.
+"""
+import argparse
+import timeit
+
+from typing import Any
+from typing import List
+from typing import Optional
+
+from cleo.io.null_io import NullIO
+
+from poetry.mixology.failure import SolveFailure
+from poetry.mixology.version_solver import VersionSolver
+from poetry.puzzle.provider import Provider
+from tests.benchmarks.partial_solution import generate_graph
+
+
+class EagerVersionSolver(VersionSolver):
+    def _log(self, message: str, *args: Any) -> None:
+        if args:
+            message = message.format(*args)
+
+        self._provider.debug(message, self._solution.attempted_solutions)
+
+
+class SilentVersionSolver(VersionSolver):
+    def _log(self, message: str, *args: Any) -> None:
+        pass
+
+
+def measure(solver_class: type, packages: int, versions: int, number: int) -> float:
+    """
+    Return the average time it took to solve the generated graph, in seconds.
+    """
+    root, pool = generate_graph(packages, versions)
+
+    def solve() -> None:
+        solver = solver_class(root, Provider(root, pool, NullIO()))
+        try:
+            solver.solve()
+        except SolveFailure:
+            pass
+
+    return timeit.timeit(solve, number=number) / number
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-p", "--packages", type=int, default=8)
+    parser.add_argument("-v", "--versions", type=int, default=20)
+    parser.add_argument("-n", "--number", type=int, default=3)
+    options = parser.parse_args(args)
+
+    silent = measure(
+        SilentVersionSolver, options.packages, options.versions, options.number
+    )
+
+    print("{:<10} {:>10} {:>14}".format("logging", "solve (s)", "overhead (ms)"))
+    for name, solver_class in [
+        ("deferred", VersionSolver),
+        ("eager", EagerVersionSolver),
+        ("none", SilentVersionSolver),
+    ]:
+        if solver_class is SilentVersionSolver:
+            duration = silent
+        else:
+            duration = measure(
+                solver_class, options.packages, options.versions, options.number
+            )
+
+        print(
+            "{:<10} {:>10.3f} {:>14.1f}".format(
+                name, duration, (duration - silent) * 1000
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
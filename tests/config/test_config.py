@@ -4,7 +4,13 @@ import pytest
 
 
 @pytest.mark.parametrize(
-    ("name", "value"), [("installer.parallel", True), ("virtualenvs.create", True)]
+    ("name", "value"),
+    [
+        ("cache.artifacts.max-size", None),
+        ("installer.parallel", True),
+        ("solver.prefetch-workers", 10),
+        ("virtualenvs.create", True),
+    ],
 )
 def test_config_get_default_value(config, name, value):
     assert config.get(name) is value
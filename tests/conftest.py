@@ -149,7 +149,7 @@ def http():
 
     yield httpretty
 
-    httpretty.activate()
+    httpretty.disable()
     httpretty.reset()
 
 
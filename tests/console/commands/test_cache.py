@@ -56,3 +56,126 @@ No caches found
 """
 
     assert expected == tester.io.fetch_output()
+
+
+@pytest.fixture
+def clear_tester(command_tester_factory):
+    return command_tester_factory("cache clear")
+
+
+@pytest.fixture
+def metadata_store(repository_cache_dir, repository_one):
+    from poetry.repositories.metadata_store import MetadataStore
+
+    store = MetadataStore(repository_cache_dir / repository_one)
+    store.put("demo:0.1.0", {"name": "demo"})
+    store.put("demo:0.2.0", {"name": "demo"})
+    store.close()
+
+    http_cache = repository_cache_dir / repository_one / "_http" / "a" / "b"
+    http_cache.mkdir(parents=True)
+    (http_cache / "response").write_text("")
+
+    return store
+
+
+def test_cache_clear_all(
+    clear_tester,
+    metadata_store,
+    repository_cache_dir,
+    repository_one,
+    config,
+    config_cache_dir,
+):
+    resolution = config_cache_dir / "resolutions" / "{}.json".format("0" * 64)
+    resolution.parent.mkdir(parents=True)
+    resolution.write_text("{}")
+
+    clear_tester.execute("{} --all".format(repository_one), inputs="yes")
+
+    assert "Delete 2 entries?" in clear_tester.io.fetch_error()
+    assert metadata_store.count() == 0
+    assert not (repository_cache_dir / repository_one / "_http").exists()
+    assert not resolution.exists()
+
+
+def test_cache_clear_package(clear_tester, metadata_store, repository_one):
+    clear_tester.execute("{}:demo:0.1.0".format(repository_one), inputs="yes")
+
+    assert metadata_store.get("demo:0.1.0") is None
+    assert metadata_store.get("demo:0.2.0") == {"name": "demo"}
+
+
+def test_cache_clear_missing_package(clear_tester, metadata_store, repository_one):
+    clear_tester.execute("{}:demo:0.3.0".format(repository_one))
+
+    assert "No cache entries for demo:0.3.0\n" == clear_tester.io.fetch_output()
+    assert metadata_store.count() == 2
+
+
+@pytest.fixture
+def prune_tester(command_tester_factory):
+    return command_tester_factory("cache prune")
+
+
+@pytest.fixture
+def artifacts(config, config_cache_dir):
+    import os
+    import time
+
+    paths = []
+    for i, name in enumerate(["old-1.0.tar.gz", "recent-1.0.tar.gz"]):
+        path = config_cache_dir / "artifacts" / "ab" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(b"\0" * 1024)
+
+        accessed = time.time() - (2 - i) * 86400
+        os.utime(str(path), (accessed, accessed))
+        paths.append(path)
+
+    return paths
+
+
+def test_cache_prune_max_size(prune_tester, artifacts):
+    old, recent = artifacts
+
+    prune_tester.execute("--max-size 1K")
+
+    assert "Removed 1 artifacts (0.0 MB)\n" == prune_tester.io.fetch_output()
+    assert not old.exists()
+    assert recent.exists()
+
+
+def test_cache_prune_uses_configured_max_size(prune_tester, config, artifacts):
+    config.merge({"cache": {"artifacts": {"max-size": "0"}}})
+
+    prune_tester.execute()
+
+    assert not any(artifact.exists() for artifact in artifacts)
+
+
+def test_cache_prune_older_than(prune_tester, artifacts):
+    old, recent = artifacts
+
+    prune_tester.execute("--older-than 36h")
+
+    assert not old.exists()
+    assert recent.exists()
+
+
+def test_cache_prune_requires_a_limit(prune_tester, artifacts):
+    assert 1 == prune_tester.execute()
+    assert all(artifact.exists() for artifact in artifacts)
+
+
+@pytest.mark.parametrize(
+    ("args", "message"),
+    [
+        ("--max-size 1X", "Invalid size: 1X\n"),
+        ("--older-than soon", "Invalid duration: soon\n"),
+    ],
+)
+def test_cache_prune_rejects_invalid_limits(prune_tester, artifacts, args, message):
+    assert 1 == prune_tester.execute(args)
+    assert message == prune_tester.io.fetch_error()
+    assert all(artifact.exists() for artifact in artifacts)
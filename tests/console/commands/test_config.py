@@ -26,9 +26,17 @@ def test_show_config_with_local_config_file_empty(tester, mocker):
 def test_list_displays_default_value_if_not_set(tester, config, config_cache_dir):
     tester.execute("--list")
 
-    expected = """cache-dir = {cache}
+    expected = """cache.artifacts.max-size = null
+cache.not-found-ttl = 300
+cache-dir = {cache}
 experimental.new-installer = true
 installer.parallel = true
+solver.async-requests = 0
+solver.decision-heuristic = "fewest-versions"
+solver.override-workers = 0
+solver.prefetch-workers = 10
+solver.resolution-cache = false
+solver.trust-locked-metadata = false
 virtualenvs.create = true
 virtualenvs.in-project = null
 virtualenvs.options.always-copy = false
@@ -47,9 +55,17 @@ def test_list_displays_set_get_setting(tester, config, config_cache_dir):
 
     tester.execute("--list")
 
-    expected = """cache-dir = {cache}
+    expected = """cache.artifacts.max-size = null
+cache.not-found-ttl = 300
+cache-dir = {cache}
 experimental.new-installer = true
 installer.parallel = true
+solver.async-requests = 0
+solver.decision-heuristic = "fewest-versions"
+solver.override-workers = 0
+solver.prefetch-workers = 10
+solver.resolution-cache = false
+solver.trust-locked-metadata = false
 virtualenvs.create = false
 virtualenvs.in-project = null
 virtualenvs.options.always-copy = false
@@ -90,9 +106,17 @@ def test_list_displays_set_get_local_setting(tester, config, config_cache_dir):
 
     tester.execute("--list")
 
-    expected = """cache-dir = {cache}
+    expected = """cache.artifacts.max-size = null
+cache.not-found-ttl = 300
+cache-dir = {cache}
 experimental.new-installer = true
 installer.parallel = true
+solver.async-requests = 0
+solver.decision-heuristic = "fewest-versions"
+solver.override-workers = 0
+solver.prefetch-workers = 10
+solver.resolution-cache = false
+solver.trust-locked-metadata = false
 virtualenvs.create = false
 virtualenvs.in-project = null
 virtualenvs.options.always-copy = false
@@ -61,3 +61,12 @@ def test_lock_no_update(command_tester_factory, poetry_with_old_lockfile, repo):
 
     for package in packages:
         assert locked_repository.find_packages(package.to_dependency())
+
+
+def test_lock_offline(command_tester_factory, poetry_with_old_lockfile, repo):
+    repo.add_package(get_package("sampleproject", "1.3.1"))
+
+    tester = command_tester_factory("lock", poetry=poetry_with_old_lockfile)
+    tester.execute("--no-update --offline")
+
+    assert poetry_with_old_lockfile.pool.offline
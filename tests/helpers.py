@@ -18,6 +18,7 @@ from poetry.packages import Locker
 from poetry.repositories import Repository
 from poetry.repositories.exceptions import PackageNotFound
 from poetry.utils._compat import WINDOWS
+from poetry.utils.fetch_engine import FetchEngine
 
 
 FIXTURE_PATH = Path(__file__).parent / "fixtures"
@@ -199,3 +200,12 @@ class TestRepository(Repository):
                 )
             )
         ]
+
+
+class TestFetchEngine(FetchEngine):
+    """
+    Sends the requests one at a time with the session, for httpretty to see them.
+    """
+
+    def send_all(self, session, requests_):
+        return [session.send(session.prepare_request(r)) for r in requests_]
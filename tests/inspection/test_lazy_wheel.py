@@ -0,0 +1,181 @@
+import os
+import re
+import threading
+import zipfile
+
+from functools import partial
+from http.server import HTTPServer
+from http.server import SimpleHTTPRequestHandler
+from pathlib import Path
+
+import pytest
+import requests
+
+from poetry.inspection.info import PackageInfo
+from poetry.inspection.lazy_wheel import LazyWheelUnsupportedError
+from poetry.inspection.lazy_wheel import metadata_from_wheel_url
+from poetry.repositories.pypi_repository import PyPiRepository
+
+
+FIXTURE_DIR_BASE = Path(__file__).parent.parent / "fixtures"
+
+METADATA = b"""\
+Metadata-Version: 2.1
+Name: big
+Version: 1.0.0
+Summary: A big wheel.
+Requires-Python: >=3.6
+Requires-Dist: pendulum (>=1.4.4)
+Requires-Dist: cleo ; extra == "foo"
+Provides-Extra: foo
+"""
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def send_head(self):
+        path = Path(self.translate_path(self.path))
+        if not path.is_file():
+            self.send_error(404)
+
+            return
+
+        content = path.read_bytes()
+        match = re.match(r"bytes=(\d+)-(\d+)", self.headers.get("Range", ""))
+        if match and self.server.range_error:
+            self.send_error(self.server.range_error)
+
+            return
+
+        if match and self.server.supports_ranges:
+            start, end = int(match.group(1)), int(match.group(2))
+            content = content[start : end + 1]
+            self.send_response(206)
+        else:
+            self.send_response(200)
+
+        if self.server.supports_ranges:
+            self.send_header("Accept-Ranges", "bytes")
+
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+
+        if self.command == "GET":
+            self.server.served += len(content)
+
+        self.wfile.write(content)
+
+    def do_GET(self):
+        self.send_head()
+
+    def do_HEAD(self):
+        self.send_head()
+
+
+@pytest.fixture
+def server(tmp_path):
+    handler = partial(RangeRequestHandler, directory=str(tmp_path))
+    server = HTTPServer(("127.0.0.1", 0), handler)
+    server.supports_ranges = True
+    server.range_error = None
+    server.served = 0
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def big_wheel(tmp_path):
+    path = tmp_path / "big-1.0.0-py3-none-any.whl"
+    with zipfile.ZipFile(str(path), "w") as archive:
+        archive.writestr("big/__init__.py", os.urandom(1024 * 1024))
+        archive.writestr("big-1.0.0.dist-info/METADATA", METADATA)
+        archive.writestr("big-1.0.0.dist-info/WHEEL", b"Wheel-Version: 1.0\n")
+
+    return path
+
+
+def url_for(server, path):
+    return "http://127.0.0.1:{}/{}".format(server.server_port, path.name)
+
+
+def test_metadata_from_wheel_url_only_downloads_needed_ranges(server, big_wheel):
+    metadata = metadata_from_wheel_url(url_for(server, big_wheel), requests.Session())
+
+    assert metadata == METADATA
+    assert server.served < big_wheel.stat().st_size / 10
+
+
+def test_metadata_from_wheel_url_small_wheel(server, tmp_path):
+    wheel = FIXTURE_DIR_BASE / "distributions" / "demo-0.1.0-py2.py3-none-any.whl"
+    (tmp_path / wheel.name).write_bytes(wheel.read_bytes())
+
+    metadata = metadata_from_wheel_url(url_for(server, wheel), requests.Session())
+    info = PackageInfo.from_core_metadata(metadata)
+
+    expected = PackageInfo.from_wheel(wheel)
+
+    assert info.name == expected.name == "demo"
+    assert info.version == expected.version == "0.1.0"
+    assert info.requires_dist == expected.requires_dist
+
+
+def test_metadata_from_wheel_url_without_range_support(server, big_wheel):
+    server.supports_ranges = False
+
+    with pytest.raises(LazyWheelUnsupportedError):
+        metadata_from_wheel_url(url_for(server, big_wheel), requests.Session())
+
+    assert server.served == 0
+
+
+@pytest.mark.parametrize("status", [403, 416])
+def test_metadata_from_wheel_url_with_rejected_range_requests(
+    server, big_wheel, status
+):
+    server.range_error = status
+
+    with pytest.raises(LazyWheelUnsupportedError):
+        metadata_from_wheel_url(url_for(server, big_wheel), requests.Session())
+
+
+def test_metadata_from_wheel_url_with_unreachable_server(big_wheel):
+    with pytest.raises(LazyWheelUnsupportedError):
+        metadata_from_wheel_url(
+            "http://127.0.0.1:1/{}".format(big_wheel.name), requests.Session()
+        )
+
+
+def test_pypi_repository_reads_wheel_metadata_lazily(server, big_wheel):
+    repository = PyPiRepository(disable_cache=True)
+
+    info = repository._get_info_from_wheel(url_for(server, big_wheel))
+
+    assert info.name == "big"
+    assert info.requires_python == ">=3.6"
+    assert info.requires_dist == ["pendulum (>=1.4.4)", 'cleo ; extra == "foo"']
+    assert server.served < big_wheel.stat().st_size / 10
+
+
+def test_pypi_repository_falls_back_to_full_download(server, big_wheel, mocker):
+    server.supports_ranges = False
+    repository = PyPiRepository(disable_cache=True)
+    download = mocker.patch(
+        "poetry.repositories.pypi_repository.download_file",
+        side_effect=lambda url, dest, session: Path(dest).write_bytes(
+            big_wheel.read_bytes()
+        ),
+    )
+
+    info = repository._get_info_from_wheel(url_for(server, big_wheel))
+
+    assert download.call_count == 1
+    assert info.name == "big"
+    assert info.requires_dist == ["pendulum (>=1.4.4)", 'cleo ; extra == "foo"']
@@ -0,0 +1,74 @@
+import os
+import time
+
+import pytest
+
+from poetry.installation.artifact_cache import ArtifactCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(tmp_path / "artifacts")
+
+
+def add_artifact(cache, name, size, age):
+    path = cache.cache_dir / name[:2] / name
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"\0" * size)
+
+    accessed = time.time() - age
+    os.utime(str(path), (accessed, accessed))
+    os.utime(str(path.parent), (accessed, accessed))
+
+    return path
+
+
+def test_prune_evicts_least_recently_used_artifacts(cache):
+    old = add_artifact(cache, "old-1.0.tar.gz", 100, age=3000)
+    used = add_artifact(cache, "used-1.0.tar.gz", 100, age=2000)
+    recent = add_artifact(cache, "recent-1.0.tar.gz", 100, age=1000)
+
+    cache.touch(used)
+    removed = cache.prune(max_size=200)
+
+    assert removed == [(old, 100)]
+    assert not old.exists()
+    assert used.exists()
+    assert recent.exists()
+    assert cache.size() == 200
+
+
+def test_prune_removes_artifacts_older_than(cache):
+    old = add_artifact(cache, "old-1.0.tar.gz", 100, age=3 * 86400)
+    recent = add_artifact(cache, "recent-1.0.tar.gz", 100, age=86400)
+
+    removed = cache.prune(older_than=2 * 86400)
+
+    assert removed == [(old, 100)]
+    assert recent.exists()
+
+    # Emptied directories are removed once they are no longer in use
+    assert old.parent.exists()
+
+    accessed = time.time() - 3000
+    os.utime(str(old.parent), (accessed, accessed))
+    cache.prune()
+
+    assert not old.parent.exists()
+    assert recent.parent.exists()
+
+
+def test_prune_never_removes_artifacts_in_use(cache):
+    in_use = add_artifact(cache, "in_use-1.0.tar.gz", 100, age=10)
+
+    assert cache.prune(max_size=0, older_than=0) == []
+    assert in_use.exists()
+
+
+def test_prune_ignores_artifacts_removed_concurrently(cache, mocker):
+    old = add_artifact(cache, "old-1.0.tar.gz", 100, age=3000)
+    artifacts = list(cache.artifacts())
+    old.unlink()
+    mocker.patch.object(cache, "artifacts", return_value=artifacts)
+
+    assert cache.prune(max_size=0) == [(old, 100)]
@@ -201,3 +201,19 @@ def test_authenticator_uses_env_provided_credentials(
     request = http.last_request()
 
     assert "Basic YmFyOmJheg==" == request.headers["Authorization"]
+
+
+def test_authenticator_request_honors_retry_after(mocker, config, http):
+    sleep = mocker.patch("time.sleep")
+    sdist_uri = "https://throttled.foo.bar/files/foo-0.1.0.tar.gz"
+    responses = [
+        httpretty.Response(body="", status=503, adding_headers={"Retry-After": "0"}),
+        httpretty.Response(body="foo"),
+    ]
+    httpretty.register_uri(httpretty.GET, sdist_uri, responses=responses)
+
+    authenticator = Authenticator(config, NullIO())
+    response = authenticator.request("get", sdist_uri)
+
+    assert response.text == "foo"
+    sleep.assert_called_once_with(0.0)
@@ -17,6 +17,7 @@ from poetry.installation.executor import Executor
 from poetry.installation.operations import Install
 from poetry.installation.operations import Uninstall
 from poetry.installation.operations import Update
+from poetry.repositories.exceptions import OfflineError
 from poetry.repositories.pool import Pool
 from poetry.utils.env import MockEnv
 from tests.repositories.test_pypi_repository import MockRepository
@@ -157,7 +158,7 @@ Package operations: 0 installs, 0 updates, 0 removals, 1 skipped
     assert 0 == len(env.executed)
 
 
-def test_execute_should_show_errors(config, mocker, io, env):
+def test_execute_should_show_errors(config, pool, mocker, io, env):
     executor = Executor(env, pool, config, io)
     executor.verbose()
 
@@ -179,7 +180,7 @@ Package operations: 1 install, 0 updates, 0 removals
 
 
 def test_execute_should_show_operation_as_cancelled_on_subprocess_keyboard_interrupt(
-    config, mocker, io, env
+    config, pool, mocker, io, env
 ):
     executor = Executor(env, pool, config, io)
     executor.verbose()
@@ -199,7 +200,7 @@ Package operations: 1 install, 0 updates, 0 removals
     assert expected == io.fetch_output()
 
 
-def test_execute_should_gracefully_handle_io_error(config, mocker, io, env):
+def test_execute_should_gracefully_handle_io_error(config, pool, mocker, io, env):
     executor = Executor(env, pool, config, io)
     executor.verbose()
 
@@ -254,3 +255,49 @@ def test_executor_should_delete_incomplete_downloads(
         executor._download(Install(Package("tomlkit", "0.5.3")))
 
     assert not destination_fixture.exists()
+
+
+def test_execute_lists_missing_distributions_when_offline(
+    config, pool, io, config_cache_dir, env, mocker
+):
+    config = Config()
+    config.merge({"cache-dir": config_cache_dir.as_posix()})
+
+    executor = Executor(env, pool.set_offline(), config, io)
+    download = mocker.patch.object(executor, "_download_archive")
+
+    git_package = Package(
+        "demo",
+        "0.1.0",
+        source_type="git",
+        source_reference="master",
+        source_url="https://github.com/demo/demo.git",
+    )
+    operations = [Install(Package("pytest", "3.5.2")), Install(git_package)]
+
+    with pytest.raises(OfflineError) as e:
+        executor.execute(operations)
+
+    assert e.value.missing == [
+        "https://files.pythonhosted.org/packages/ed/96/"
+        "271c93f75212c06e2a7ec3e2fa8a9c90acee0a4838dc05bf379ea09aae31/"
+        "pytest-3.5.0-py2.py3-none-any.whl",
+        "git repository https://github.com/demo/demo.git",
+    ]
+    assert 0 == len(env.executed)
+
+    link = executor._chooser.choose_for(operations[0].package)
+    archive = executor._chef.get_cache_directory_for_link(link) / link.filename
+    archive.parent.mkdir(parents=True)
+    shutil.copyfile(
+        str(
+            Path(__file__).parent.parent.joinpath(
+                "fixtures/distributions/demo-0.1.0-py2.py3-none-any.whl"
+            )
+        ),
+        str(archive),
+    )
+
+    assert 0 == executor.execute(operations[:1])
+    assert 1 == len(env.executed)
+    assert not download.called
@@ -1,7 +1,9 @@
 from __future__ import unicode_literals
 
 import json
+import os
 import sys
+import time
 
 from pathlib import Path
 
@@ -16,6 +18,8 @@ from poetry.installation import Installer as BaseInstaller
 from poetry.installation.executor import Executor as BaseExecutor
 from poetry.installation.noop_installer import NoopInstaller
 from poetry.packages import Locker as BaseLocker
+from poetry.puzzle import Solver
+from poetry.puzzle.resolution_cache import ResolutionCache
 from poetry.repositories import Pool
 from poetry.repositories import Repository
 from poetry.repositories.installed_repository import InstalledRepository
@@ -184,6 +188,23 @@ def test_run_no_dependencies(installer, locker):
     assert locker.written_data == expected
 
 
+def test_run_prunes_the_artifact_cache(installer, config, config_cache_dir):
+    artifact = config_cache_dir / "artifacts" / "ab" / "demo-0.1.0.tar.gz"
+    artifact.parent.mkdir(parents=True)
+    artifact.write_bytes(b"\0" * 1024)
+    accessed = time.time() - 86400
+    os.utime(str(artifact), (accessed, accessed))
+
+    installer.run()
+
+    assert artifact.exists()
+
+    config.merge({"cache": {"artifacts": {"max-size": "512"}}})
+    installer.run()
+
+    assert not artifact.exists()
+
+
 def test_run_with_dependencies(installer, locker, repo, package):
     package_a = get_package("A", "1.0")
     package_b = get_package("B", "1.1")
@@ -199,6 +220,91 @@ def test_run_with_dependencies(installer, locker, repo, package):
     assert locker.written_data == expected
 
 
+def test_run_reuses_the_cached_resolution(
+    installer, locker, repo, package, config, config_cache_dir, mocker
+):
+    config.merge({"solver": {"resolution-cache": True}})
+    repo.add_package(get_package("A", "1.0"))
+    repo.add_package(get_package("B", "1.1"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+    package.add_dependency(Factory.create_dependency("B", "^1.0"))
+
+    solve = mocker.spy(Solver, "_solve")
+
+    installer.run()
+    # The resolution for the current environment is never cached
+    assert solve.call_count == 2
+    assert len(list((config_cache_dir / "resolutions").iterdir())) == 1
+
+    find_packages = mocker.spy(repo, "find_packages")
+    package_info = mocker.spy(repo, "package")
+    installer.run()
+
+    assert solve.call_count == 3
+    assert locker.written_data == fixture("with-dependencies")
+    # Only the versions of the packages are looked for again,
+    # the information of their releases is not retrieved.
+    assert find_packages.call_count == 2
+    assert package_info.call_count == 0
+
+
+def test_run_discards_the_cached_resolution_if_the_metadata_changed(
+    installer, locker, repo, package, config, mocker
+):
+    config.merge({"solver": {"resolution-cache": True}})
+    repo.add_package(get_package("A", "1.0"))
+    repo.add_package(get_package("B", "1.0"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+    package.add_dependency(Factory.create_dependency("B", "^1.0"))
+
+    installer.run()
+
+    repo.add_package(get_package("B", "1.1"))
+    solve = mocker.spy(Solver, "_solve")
+
+    installer.run()
+
+    assert solve.call_count == 2
+    assert locker.written_data == fixture("with-dependencies")
+
+
+def test_run_evicts_the_least_recently_used_resolutions(
+    installer, repo, package, config, config_cache_dir, mocker
+):
+    config.merge({"solver": {"resolution-cache": True}})
+    mocker.patch.object(ResolutionCache, "MAX_ENTRIES", 2)
+    resolutions = config_cache_dir / "resolutions"
+    resolutions.mkdir(parents=True)
+    for i, name in enumerate(["old", "recent"]):
+        path = resolutions / "{}.json".format(name)
+        path.write_text("{}")
+        os.utime(str(path), (i + 1, i + 1))
+
+    repo.add_package(get_package("A", "1.0"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+
+    installer.run()
+
+    assert len(list(resolutions.iterdir())) == 2
+    assert not (resolutions / "old.json").exists()
+    assert (resolutions / "recent.json").exists()
+
+
+def test_run_does_not_cache_the_resolution_by_default(
+    installer, repo, package, config_cache_dir
+):
+    repo.add_package(get_package("A", "1.0"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+
+    installer.run()
+
+    assert not (config_cache_dir / "resolutions").exists()
+
+
 def test_run_update_after_removing_dependencies(
     installer, locker, repo, package, installed
 ):
@@ -452,6 +558,125 @@ def test_run_whitelist_add(installer, locker, repo, package):
     assert locker.written_data == expected
 
 
+@pytest.fixture()
+def locked_a_and_c(locker):
+    locker.locked(True)
+    locker.mock_lock_data(
+        {
+            "package": [
+                {
+                    "name": "A",
+                    "version": "1.0",
+                    "category": "main",
+                    "optional": False,
+                    "platform": "*",
+                    "python-versions": "*",
+                    "checksum": [],
+                    "dependencies": {"C": "^1.0"},
+                },
+                {
+                    "name": "C",
+                    "version": "1.0",
+                    "category": "main",
+                    "optional": False,
+                    "platform": "*",
+                    "python-versions": "*",
+                    "checksum": [],
+                },
+            ],
+            "metadata": {
+                "python-versions": "*",
+                "platform": "*",
+                "content-hash": "123456789",
+                "hashes": {"A": [], "C": []},
+            },
+        }
+    )
+
+
+def test_run_whitelist_add_keeps_the_unaffected_locked_packages(
+    installer, locker, repo, package, locked_a_and_c, mocker
+):
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency(Factory.create_dependency("C", "^1.0"))
+    repo.add_package(package_a)
+    repo.add_package(get_package("A", "1.1"))
+    repo.add_package(get_package("B", "1.1"))
+    repo.add_package(get_package("C", "1.0"))
+    repo.add_package(get_package("C", "1.1"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+    package.add_dependency(Factory.create_dependency("B", "^1.0"))
+
+    lookup = mocker.spy(repo, "package")
+
+    installer.update(True)
+    installer.whitelist(["B"])
+
+    installer.run()
+
+    assert [call.args[0] for call in lookup.call_args_list] == ["b"]
+    assert [(p["name"], p["version"]) for p in locker.written_data["package"]] == [
+        ("A", "1.0"),
+        ("B", "1.1"),
+        ("C", "1.0"),
+    ]
+
+
+def test_run_whitelist_add_solves_again_if_the_locked_packages_conflict(
+    installer, locker, repo, package, locked_a_and_c
+):
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency(Factory.create_dependency("C", "^1.0"))
+    package_b = get_package("B", "1.1")
+    package_b.add_dependency(Factory.create_dependency("C", "^1.1"))
+    repo.add_package(package_a)
+    repo.add_package(package_b)
+    repo.add_package(get_package("C", "1.0"))
+    repo.add_package(get_package("C", "1.1"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+    package.add_dependency(Factory.create_dependency("B", "^1.0"))
+
+    installer.update(True)
+    installer.whitelist(["B"])
+
+    installer.run()
+
+    assert [(p["name"], p["version"]) for p in locker.written_data["package"]] == [
+        ("A", "1.0"),
+        ("B", "1.1"),
+        ("C", "1.1"),
+    ]
+
+
+def test_run_lock_trusts_the_locked_metadata(
+    installer, locker, repo, package, config, locked_a_and_c, mocker
+):
+    config.merge({"solver": {"trust-locked-metadata": True}})
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency(Factory.create_dependency("C", "^1.0"))
+    repo.add_package(package_a)
+    repo.add_package(get_package("B", "1.1"))
+    repo.add_package(get_package("C", "1.0"))
+
+    package.add_dependency(Factory.create_dependency("A", "~1.0"))
+    package.add_dependency(Factory.create_dependency("B", "^1.0"))
+
+    lookup = mocker.spy(repo, "package")
+
+    installer.lock()
+
+    installer.run()
+
+    assert [call.args[0] for call in lookup.call_args_list] == ["b"]
+    assert [(p["name"], p["version"]) for p in locker.written_data["package"]] == [
+        ("A", "1.0"),
+        ("B", "1.1"),
+        ("C", "1.0"),
+    ]
+
+
 def test_run_whitelist_remove(installer, locker, repo, package, installed):
     locker.locked(True)
     locker.mock_lock_data(
@@ -1089,7 +1314,15 @@ def test_run_update_with_locked_extras(installer, locker, repo, package):
                     "platform": "*",
                     "python-versions": "*",
                     "checksum": [],
-                    "dependencies": {"B": "^1.0", "C": "^1.0"},
+                    "dependencies": {
+                        "B": {"version": "^1.0", "optional": True},
+                        "C": {
+                            "version": "^1.0",
+                            "markers": 'python_version >= "2.7" '
+                            'and python_version < "2.8"',
+                        },
+                    },
+                    "extras": {"foo": ["b"]},
                 },
                 {
                     "name": "B",
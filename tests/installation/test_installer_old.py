@@ -1001,7 +1001,15 @@ def test_run_update_with_locked_extras(installer, locker, repo, package):
                     "platform": "*",
                     "python-versions": "*",
                     "checksum": [],
-                    "dependencies": {"B": "^1.0", "C": "^1.0"},
+                    "dependencies": {
+                        "B": {"version": "^1.0", "optional": True},
+                        "C": {
+                            "version": "^1.0",
+                            "markers": 'python_version >= "2.7" '
+                            'and python_version < "2.8"',
+                        },
+                    },
+                    "extras": {"foo": ["b"]},
                 },
                 {
                     "name": "B",
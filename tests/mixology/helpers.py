@@ -18,12 +18,21 @@ def add_to_repo(repository, name, version, deps=None, python=None):
 
 
 def check_solver_result(
-    root, provider, result=None, error=None, tries=None, locked=None, use_latest=None
+    root,
+    provider,
+    result=None,
+    error=None,
+    tries=None,
+    locked=None,
+    use_latest=None,
+    heuristic="fewest-versions",
 ):
     if locked is not None:
         locked = {k: DependencyPackage(l.to_dependency(), l) for k, l in locked.items()}
 
-    solver = VersionSolver(root, provider, locked=locked, use_latest=use_latest)
+    solver = VersionSolver(
+        root, provider, locked=locked, use_latest=use_latest, heuristic=heuristic
+    )
 
     try:
         solution = solver.solve()
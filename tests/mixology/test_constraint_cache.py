@@ -0,0 +1,48 @@
+from poetry.core.semver import parse_constraint
+from poetry.core.semver.version import Version
+from poetry.core.semver.version_range import VersionRange
+from poetry.mixology.constraint_cache import ConstraintCache
+from poetry.mixology.constraint_cache import apply
+
+
+def test_operations_are_memoized_for_equal_constraints():
+    cache = ConstraintCache()
+
+    first = cache.apply(
+        "intersect", parse_constraint("^1.0"), parse_constraint(">=1.5")
+    )
+    second = cache.apply(
+        "intersect", parse_constraint("^1.0"), parse_constraint(">=1.5")
+    )
+
+    assert first is second
+    assert str(first) == ">=1.5,<2.0"
+    assert cache.hits == 1
+    assert cache.misses == 1
+    assert cache.hit_rate == 0.5
+
+
+def test_constraints_that_only_differ_by_their_upper_bound_are_not_mixed_up():
+    cache = ConstraintCache()
+    version = Version.parse("2.0.0a1")
+
+    assert not cache.apply(
+        "allows_all", VersionRange(max=Version.parse("2.0")), version
+    )
+    assert cache.apply(
+        "allows_all",
+        VersionRange(max=Version.parse("2.0"), always_include_max_prerelease=True),
+        version,
+    )
+    assert cache.misses == 2
+
+
+def test_apply_uses_the_cache_of_the_current_thread():
+    cache = ConstraintCache()
+
+    with cache.use():
+        assert apply("allows_any", parse_constraint("^1.0"), parse_constraint("<1.1"))
+
+    assert ConstraintCache.current() is None
+    assert apply("allows_any", parse_constraint("^1.0"), parse_constraint("<1.1"))
+    assert cache.misses == 1
@@ -1,4 +1,8 @@
+import pytest
+
 from poetry.factory import Factory
+from poetry.mixology.version_solver import DECISION_HEURISTICS
+from poetry.mixology.version_solver import VersionSolver
 
 from ..helpers import add_to_repo
 from ..helpers import check_solver_result
@@ -150,3 +154,134 @@ def test_backjump_past_failed_package_on_disjoint_constraint(root, provider, rep
     add_to_repo(repo, "foo", "2.0.4")
 
     check_solver_result(root, provider, {"a": "1.0.0", "foo": "2.0.4"})
+
+
+def test_watched_terms_stay_unsatisfied_while_backtracking(root, provider, repo):
+    root.add_dependency(Factory.create_dependency("a", "*"))
+    root.add_dependency(Factory.create_dependency("b", "*"))
+
+    add_to_repo(repo, "a", "2.0.0", deps={"c": "^2.0.0", "d": "^1.0.0"})
+    add_to_repo(repo, "a", "1.0.0", deps={"c": "^1.0.0"})
+    add_to_repo(repo, "b", "2.0.0", deps={"d": "^2.0.0"})
+    add_to_repo(repo, "b", "1.0.0", deps={"c": "^1.0.0"})
+    add_to_repo(repo, "c", "2.0.0")
+    add_to_repo(repo, "c", "1.0.0")
+    add_to_repo(repo, "d", "2.0.0")
+    add_to_repo(repo, "d", "1.0.0")
+
+    solver = VersionSolver(root, provider)
+    result = solver.solve()
+
+    assert {p.name: str(p.version) for p in result.packages} == {
+        "a": "1.0.0",
+        "b": "2.0.0",
+        "c": "1.0.0",
+        "d": "2.0.0",
+    }
+
+    for incompatibilities in solver._incompatibilities.values():
+        for incompatibility in incompatibilities:
+            watched = solver._watches[id(incompatibility)]
+            if watched is None:
+                continue
+
+            for term in incompatibility.terms:
+                if term.dependency.complete_name in watched:
+                    assert not solver.solution.satisfies(term)
+
+
+@pytest.mark.parametrize("heuristic", DECISION_HEURISTICS)
+def test_heuristics_backjump_to_the_same_solution(root, provider, repo, heuristic):
+    root.add_dependency(Factory.create_dependency("c", "*"))
+    root.add_dependency(Factory.create_dependency("y", "^2.0.0"))
+
+    add_to_repo(repo, "a", "1.0.0", deps={"x": ">=1.0.0"})
+    add_to_repo(repo, "b", "1.0.0", deps={"x": "<2.0.0"})
+
+    add_to_repo(repo, "c", "1.0.0")
+    add_to_repo(repo, "c", "2.0.0", deps={"a": "*", "b": "*"})
+
+    add_to_repo(repo, "x", "0.0.0")
+    add_to_repo(repo, "x", "1.0.0", deps={"y": "1.0.0"})
+    add_to_repo(repo, "x", "2.0.0")
+
+    add_to_repo(repo, "y", "1.0.0")
+    add_to_repo(repo, "y", "2.0.0")
+
+    check_solver_result(
+        root, provider, {"c": "1.0.0", "y": "2.0.0"}, heuristic=heuristic
+    )
+
+
+@pytest.mark.parametrize("heuristic", DECISION_HEURISTICS)
+def test_candidates_are_chosen_as_by_a_scan_of_the_unsatisfied_dependencies(
+    root, provider, repo, heuristic
+):
+    root.add_dependency(Factory.create_dependency("a", "*"))
+    root.add_dependency(Factory.create_dependency("b", "*"))
+    root.add_dependency(Factory.create_dependency("d", "*"))
+
+    add_to_repo(repo, "a", "1.0.0", deps={"x": "^1.0.0", "e": "*"})
+    add_to_repo(repo, "a", "2.0.0", deps={"x": "^2.0.0", "e": "*"})
+    add_to_repo(repo, "b", "1.0.0", deps={"x": "^1.0.0"})
+    add_to_repo(repo, "b", "2.0.0", deps={"x": "^1.0.0", "y": "*"})
+    add_to_repo(repo, "d", "1.0.0")
+    add_to_repo(repo, "e", "1.0.0")
+    add_to_repo(repo, "e", "2.0.0", deps={"y": "<2.0.0"})
+
+    for version in ("1.0.0", "2.0.0", "3.0.0"):
+        add_to_repo(repo, "x", version)
+        add_to_repo(repo, "y", version)
+
+    solver = VersionSolver(root, provider, heuristic=heuristic)
+    next_candidate = solver._next_candidate
+    candidates = []
+
+    def checked_next_candidate():
+        candidate = next_candidate()
+        unsatisfied = solver.solution.unsatisfied
+        if unsatisfied:
+            assert candidate is min(unsatisfied, key=solver._decision_key)
+        else:
+            assert candidate is None
+
+        candidates.append(candidate)
+
+        return candidate
+
+    solver._next_candidate = checked_next_candidate
+
+    result = solver.solve()
+
+    assert {p.name: p.version.text for p in result.packages} == {
+        "a": "1.0.0",
+        "b": "2.0.0",
+        "d": "1.0.0",
+        "e": "2.0.0",
+        "x": "1.0.0",
+        "y": "1.0.0",
+    }
+    assert len(candidates) > len(result.packages)
+
+
+def test_versions_are_counted_once_per_constraint(root, provider, repo, mocker):
+    for i in range(10):
+        name = "package-{}".format(i)
+        root.add_dependency(Factory.create_dependency(name, "*"))
+        add_to_repo(repo, name, "1.0.0")
+        add_to_repo(repo, name, "2.0.0")
+
+    search_for = mocker.spy(provider, "search_for")
+
+    check_solver_result(
+        root, provider, {"package-{}".format(i): "2.0.0" for i in range(10)}
+    )
+
+    # Once for the root package, then once to count the versions of each package
+    # and once to choose its version.
+    assert search_for.call_count == 21
+
+
+def test_unknown_heuristic_is_rejected(root, provider):
+    with pytest.raises(ValueError):
+        VersionSolver(root, provider, heuristic="most-versions")
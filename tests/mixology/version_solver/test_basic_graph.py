@@ -1,4 +1,9 @@
+from cleo.io.buffered_io import BufferedIO
+from cleo.io.outputs.output import Verbosity
+
 from poetry.factory import Factory
+from poetry.mixology.incompatibility import Incompatibility
+from poetry.puzzle.provider import Provider
 
 from ..helpers import add_to_repo
 from ..helpers import check_solver_result
@@ -71,3 +76,32 @@ def test_circular_dependency(root, provider, repo):
     add_to_repo(repo, "bar", "1.0.0", deps={"foo": "1.0.0"})
 
     check_solver_result(root, provider, {"foo": "1.0.0", "bar": "1.0.0"})
+
+
+def test_solver_does_not_format_messages_if_not_debugging(root, provider, repo, mocker):
+    root.add_dependency(Factory.create_dependency("a", "*"))
+
+    add_to_repo(repo, "a", "1.0.0", deps={"b": "^1.0.0"})
+    add_to_repo(repo, "b", "1.0.0")
+
+    to_string = mocker.patch.object(Incompatibility, "__str__", return_value="")
+
+    check_solver_result(root, provider, {"a": "1.0.0", "b": "1.0.0"})
+
+    assert to_string.call_count == 0
+
+
+def test_solver_logs_messages_if_debugging(root, pool, repo):
+    root.add_dependency(Factory.create_dependency("a", "*"))
+
+    add_to_repo(repo, "a", "1.0.0", deps={"b": "^1.0.0"})
+    add_to_repo(repo, "b", "1.0.0")
+
+    io = BufferedIO()
+    io.set_verbosity(Verbosity.DEBUG)
+
+    check_solver_result(root, Provider(root, pool, io), {"a": "1.0.0", "b": "1.0.0"})
+
+    output = io.fetch_output()
+    assert "fact: a (1.0.0) depends on b (^1.0.0)" in output
+    assert "selecting a (1.0.0)" in output
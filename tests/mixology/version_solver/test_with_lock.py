@@ -1,4 +1,8 @@
+import pytest
+
 from poetry.factory import Factory
+from poetry.mixology.version_solver import VersionSolver
+from poetry.packages import DependencyPackage
 
 from ...helpers import get_package
 from ..helpers import add_to_repo
@@ -119,3 +123,62 @@ def test_with_compatible_locked_dependencies_use_latest(root, provider, repo):
         },
         use_latest=["foo"],
     )
+
+
+@pytest.mark.parametrize(
+    ("heuristic", "result"),
+    [
+        ("fewest-versions", {"foo": "2.0.0", "bar": "2.0.0"}),
+        ("locked-first", {"foo": "1.0.0", "bar": "1.0.0"}),
+    ],
+)
+def test_locked_first_heuristic_keeps_locked_versions(
+    root, provider, repo, heuristic, result
+):
+    root.add_dependency(Factory.create_dependency("bar", "*"))
+    root.add_dependency(Factory.create_dependency("foo", "*"))
+
+    add_to_repo(repo, "foo", "1.0.0")
+    add_to_repo(repo, "foo", "2.0.0", deps={"bar": "^2.0.0"})
+    add_to_repo(repo, "bar", "1.0.0")
+    add_to_repo(repo, "bar", "2.0.0")
+
+    check_solver_result(
+        root,
+        provider,
+        result=result,
+        locked={
+            "foo": get_package("foo", "1.0.0"),
+            "bar": get_package("bar", "1.0.0"),
+        },
+        use_latest=["foo"],
+        heuristic=heuristic,
+    )
+
+
+@pytest.mark.parametrize(
+    ("heuristic", "order"),
+    [("fewest-versions", ["single", "locked"]), ("locked-first", ["locked", "single"])],
+)
+def test_locked_first_heuristic_decides_locked_packages_first(
+    root, provider, repo, heuristic, order
+):
+    root.add_dependency(Factory.create_dependency("locked", "*"))
+    root.add_dependency(Factory.create_dependency("single", "*"))
+
+    add_to_repo(repo, "single", "1.0.0")
+    add_to_repo(repo, "locked", "1.0.0")
+    add_to_repo(repo, "locked", "2.0.0")
+
+    locked = get_package("locked", "1.0.0")
+    solver = VersionSolver(
+        root,
+        provider,
+        locked={"locked": DependencyPackage(locked.to_dependency(), locked)},
+        heuristic=heuristic,
+    )
+
+    solver.solve()
+
+    # Both packages have a single version to choose from
+    assert [p.name for p in solver.solution.decisions][1:] == order
@@ -10,12 +10,14 @@ from poetry.core.packages.directory_dependency import DirectoryDependency
 from poetry.core.packages.file_dependency import FileDependency
 from poetry.core.packages.vcs_dependency import VCSDependency
 from poetry.inspection.info import PackageInfo
+from poetry.packages import DependencyPackage
 from poetry.puzzle.provider import Provider
 from poetry.repositories.pool import Pool
 from poetry.repositories.repository import Repository
 from poetry.utils.env import EnvCommandError
 from poetry.utils.env import MockEnv as BaseMockEnv
 from tests.helpers import get_dependency
+from tests.helpers import get_package
 
 
 class MockEnv(BaseMockEnv):
@@ -46,6 +48,11 @@ def provider(root, pool):
     return Provider(root, pool, NullIO())
 
 
+@pytest.fixture
+def prefetching_provider(root, pool, config):
+    return Provider(root, pool, NullIO(), config=config)
+
+
 @pytest.mark.parametrize("value", [True, False])
 def test_search_for_vcs_retains_develop_flag(provider, value):
     dependency = VCSDependency(
@@ -495,3 +502,113 @@ def test_search_for_file_wheel_with_extras(provider):
         "foo": [get_dependency("cleo")],
         "bar": [get_dependency("tomlkit")],
     }
+
+
+def test_complete_package_prefetches_dependencies(
+    prefetching_provider, repository, root
+):
+    root.add_dependency(get_dependency("A", "^1.0"))
+    repository.add_package(get_package("A", "1.0"))
+    repository.add_package(get_package("A", "1.1"))
+
+    prefetching_provider.complete_package(DependencyPackage(root.to_dependency(), root))
+
+    packages = prefetching_provider.search_for(get_dependency("A", "^1.0"))
+
+    assert [p.version.text for p in packages] == ["1.1", "1.0"]
+    assert prefetching_provider.prefetcher.hits == 1
+    assert prefetching_provider.prefetcher.misses == 0
+
+    package = prefetching_provider.complete_package(packages[0])
+
+    assert package.version.text == "1.1"
+    assert prefetching_provider.prefetcher.hits == 2
+    assert prefetching_provider.prefetcher.misses == 0
+
+    prefetching_provider.stop_prefetching()
+
+
+def test_prefetched_results_are_only_used_once(prefetching_provider, repository, root):
+    root.add_dependency(get_dependency("A", "^1.0"))
+    repository.add_package(get_package("A", "1.0"))
+
+    prefetching_provider.complete_package(DependencyPackage(root.to_dependency(), root))
+
+    prefetcher = prefetching_provider.prefetcher
+    assert len(prefetcher.find_packages(get_dependency("A", "^1.0"))) == 1
+    assert len(prefetcher.find_packages(get_dependency("A", "^1.0"))) == 1
+    assert prefetcher.hits == 1
+    assert prefetcher.misses == 1
+
+    prefetching_provider.stop_prefetching()
+
+
+def test_complete_package_trusts_the_locked_metadata(
+    provider, repository, root, mocker
+):
+    locked_a = get_package("A", "1.0")
+    locked_a.add_dependency(get_dependency("B", "^1.0"))
+    provider.set_locked_metadata([locked_a])
+
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency(get_dependency("B", "^2.0"))
+    repository.add_package(package_a)
+    repository.add_package(get_package("A", "1.1"))
+
+    lookup = mocker.spy(repository, "package")
+
+    package = provider.complete_package(
+        DependencyPackage(get_dependency("A"), package_a)
+    )
+
+    assert package.package is not locked_a
+    assert [str(d) for d in package.requires] == ["B (>=1.0,<2.0)"]
+    assert lookup.call_count == 0
+
+    package = provider.complete_package(
+        DependencyPackage(get_dependency("A"), get_package("A", "1.1"))
+    )
+
+    assert package.version.text == "1.1"
+    assert lookup.call_count == 1
+
+    provider.stop_prefetching()
+
+
+def test_prefetching_can_be_disabled(root, pool, config):
+    config.merge({"solver": {"prefetch-workers": 0}})
+
+    provider = Provider(root, pool, NullIO(), config=config)
+
+    assert provider.prefetcher is None
+
+
+def test_prefetching_is_disabled_without_config(provider):
+    assert provider.prefetcher is None
+
+
+@pytest.mark.parametrize(
+    ("constraint", "allows_prereleases", "versions"),
+    [
+        ("^1.0", False, ["1.2", "1.1", "1.0"]),
+        ("<1.1 || >=1.2", False, ["2.1", "1.2", "1.0", "0.9", "2.0b1"]),
+        ("<1.1 || >=1.2", True, ["2.1", "2.0b1", "1.2", "1.0", "0.9"]),
+        ("!=1.1", False, ["2.1", "1.2", "1.0", "0.9", "2.0b1"]),
+        ("1.1", False, ["1.1"]),
+        (">2.1", False, []),
+    ],
+)
+def test_search_for_reuses_previous_searches(
+    provider, repository, mocker, constraint, allows_prereleases, versions
+):
+    for version in ["0.9", "1.0", "1.1", "1.2", "2.0b1", "2.1"]:
+        repository.add_package(get_package("A", version))
+
+    find_packages = mocker.spy(provider.pool, "find_packages")
+    provider.search_for(get_dependency("A", "*", allows_prereleases=True))
+
+    dependency = get_dependency("A", constraint, allows_prereleases=allows_prereleases)
+    packages = provider.search_for(dependency)
+
+    assert [p.version.text for p in packages] == versions
+    assert find_packages.call_count == 1
@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -12,8 +13,10 @@ from poetry.factory import Factory
 from poetry.puzzle import Solver
 from poetry.puzzle.exceptions import SolverProblemError
 from poetry.puzzle.provider import Provider as BaseProvider
+from poetry.repositories.exceptions import OfflineError
 from poetry.repositories.installed_repository import InstalledRepository
 from poetry.repositories.pool import Pool
+from poetry.repositories.pypi_repository import PyPiRepository
 from poetry.repositories.repository import Repository
 from poetry.utils.env import MockEnv
 from tests.helpers import get_dependency
@@ -1061,6 +1064,70 @@ def test_solver_duplicate_dependencies_different_constraints(solver, repo, packa
     )
 
 
+@pytest.mark.parametrize(
+    ("platform", "version_info", "processes"),
+    [("linux", (3, 7), 1), ("darwin", (3, 7), 0), ("linux", (3, 6), 0)],
+)
+def test_solver_solves_duplicate_dependencies_in_processes(
+    package,
+    pool,
+    repo,
+    installed,
+    locked,
+    io,
+    config,
+    mocker,
+    platform,
+    version_info,
+    processes,
+):
+    mocker.patch("poetry.puzzle.solver.sys.platform", platform)
+    mocker.patch("poetry.puzzle.solver.sys.version_info", version_info)
+    config.merge({"solver": {"override-workers": 2}})
+    executor = mocker.patch(
+        "poetry.puzzle.solver.ProcessPoolExecutor", wraps=ProcessPoolExecutor
+    )
+    solver = Solver(
+        package,
+        pool,
+        installed,
+        locked,
+        io,
+        provider=Provider(package, pool, io, config=config),
+    )
+
+    package.add_dependency(Factory.create_dependency("A", "*"))
+
+    package_a = get_package("A", "1.0")
+    package_a.add_dependency(
+        Factory.create_dependency("B", {"version": "^1.0", "python": "<3.4"})
+    )
+    package_a.add_dependency(
+        Factory.create_dependency("B", {"version": "^2.0", "python": ">=3.4"})
+    )
+
+    package_b10 = get_package("B", "1.0")
+    package_b20 = get_package("B", "2.0")
+
+    repo.add_package(package_a)
+    repo.add_package(package_b10)
+    repo.add_package(package_b20)
+
+    ops = solver.solve()
+
+    assert executor.call_count == processes
+    # The overrides used by the processes are reported as if solved in turn
+    assert len(solver._overrides) == 2
+    check_solver_result(
+        ops,
+        [
+            {"job": "install", "package": package_b10},
+            {"job": "install", "package": package_b20},
+            {"job": "install", "package": package_a},
+        ],
+    )
+
+
 def test_solver_duplicate_dependencies_different_constraints_same_requirements(
     solver, repo, package
 ):
@@ -2746,3 +2813,28 @@ def test_solver_can_resolve_python_restricted_package_dependencies(
             {"job": "install", "package": pre_commit},
         ],
     )
+
+
+def test_solver_lists_everything_missing_when_offline(
+    package, installed, locked, io, http, tmp_path, mocker
+):
+    mocker.patch("poetry.repositories.pypi_repository.REPOSITORY_CACHE_DIR", tmp_path)
+
+    pool = Pool([PyPiRepository(url="https://foo.bar/")]).set_offline()
+    solver = Solver(
+        package, pool, installed, locked, io, provider=Provider(package, pool, io)
+    )
+
+    package.add_dependency(Factory.create_dependency("requests", "*"))
+    package.add_dependency(Factory.create_dependency("isort", "*"))
+
+    with pytest.raises(OfflineError) as e:
+        solver.solve()
+
+    assert e.value.missing == [
+        "https://foo.bar/pypi/requests/json",
+        "https://foo.bar/pypi/isort/json",
+    ]
+    assert "https://foo.bar/pypi/requests/json" in str(e.value)
+    assert "https://foo.bar/pypi/isort/json" in str(e.value)
+    assert len(http.latest_requests()) == 0
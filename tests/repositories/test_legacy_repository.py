@@ -1,3 +1,5 @@
+import hashlib
+import json
 import shutil
 
 from pathlib import Path
@@ -6,11 +8,17 @@ import pytest
 import requests
 
 from poetry.core.packages import Dependency
+from poetry.core.semver import Version
 from poetry.factory import Factory
+from poetry.inspection.lazy_wheel import LazyWheelUnsupportedError
+from poetry.repositories.exceptions import OfflineError
 from poetry.repositories.exceptions import PackageNotFound
 from poetry.repositories.exceptions import RepositoryError
+from poetry.repositories.legacy_repository import JsonPage
 from poetry.repositories.legacy_repository import LegacyRepository
 from poetry.repositories.legacy_repository import Page
+from poetry.repositories.legacy_repository import PageCache
+from tests.helpers import TestFetchEngine
 
 
 try:
@@ -39,6 +47,9 @@ class MockRepository(LegacyRepository):
         with fixture.open(encoding="utf-8") as f:
             return Page(self._url + endpoint, f.read(), {})
 
+    def _get_info_from_wheel_metadata(self, url):
+        raise LazyWheelUnsupportedError("Range requests are not supported")
+
     def _download(self, url, dest):
         filename = urlparse.urlparse(url).path.rsplit("/")[-1]
         filepath = self.FIXTURES.parent / "pypi.org" / "dists" / filename
@@ -329,7 +340,7 @@ def test_get_redirected_response_url(http, monkeypatch):
     repo = MockHttpRepository({"/foo": 200}, http)
     redirect_url = "http://legacy.redirect.bar"
 
-    def get_mock(url):
+    def get_mock(url, **kwargs):
         response = requests.Response()
         response.status_code = 200
         response.url = redirect_url + "/foo"
@@ -337,3 +348,427 @@ def test_get_redirected_response_url(http, monkeypatch):
 
     monkeypatch.setattr(repo.session, "get", get_mock)
     assert repo._get("/foo")._url == "http://legacy.redirect.bar/foo/"
+
+
+def test_get_negotiates_json_simple_api(http):
+    repo = MockHttpRepository({}, http)
+    content = {
+        "meta": {"api-version": "1.0"},
+        "name": "pastel",
+        "files": [
+            {
+                "filename": "pastel-0.1.0.tar.gz",
+                "url": "https://files.foo.bar/pastel-0.1.0.tar.gz",
+                "hashes": {"sha256": "1234"},
+            }
+        ],
+    }
+    http.register_uri(
+        http.GET,
+        "http://legacy.foo.bar/pastel/",
+        body=json.dumps(content),
+        content_type="application/vnd.pypi.simple.v1+json",
+    )
+
+    page = repo._get("/pastel/")
+
+    assert isinstance(page, JsonPage)
+    assert http.last_request().headers["Accept"] == LegacyRepository.ACCEPT
+    assert [link.url for link in page.links] == [
+        "https://files.foo.bar/pastel-0.1.0.tar.gz#sha256=1234"
+    ]
+
+
+def test_json_page_links():
+    content = {
+        "meta": {"api-version": "1.0"},
+        "name": "demo",
+        "files": [
+            {
+                "filename": "demo-0.1.0-py2.py3-none-any.whl",
+                "url": "../../files/demo-0.1.0-py2.py3-none-any.whl",
+                "hashes": {"md5": "abcd"},
+                "requires-python": ">=3.6",
+                "core-metadata": {"sha256": "1234"},
+            },
+            {
+                "filename": "demo-0.1.0.tar.gz",
+                "url": "https://files.foo.bar/demo-0.1.0.tar.gz#sha256=5678",
+                "hashes": {"sha256": "5678"},
+                "dist-info-metadata": False,
+            },
+            {
+                "filename": "demo-0.1.0.exe",
+                "url": "https://files.foo.bar/demo-0.1.0.exe",
+                "hashes": {},
+            },
+        ],
+    }
+    page = JsonPage("http://legacy.foo.bar/simple/demo", json.dumps(content), {})
+
+    wheel, sdist = page.links
+
+    assert (
+        wheel.url
+        == "http://legacy.foo.bar/files/demo-0.1.0-py2.py3-none-any.whl#md5=abcd"
+    )
+    assert wheel.requires_python == ">=3.6"
+    assert wheel.metadata == {"sha256": "1234"}
+    assert wheel.metadata_url == (
+        "http://legacy.foo.bar/files/demo-0.1.0-py2.py3-none-any.whl.metadata"
+    )
+    assert sdist.hash == "5678"
+    assert not sdist.has_metadata
+    assert sdist.metadata_url is None
+    assert [str(v) for v in page.versions] == ["0.1.0"]
+
+
+@pytest.mark.parametrize(
+    "attribute,expected",
+    [
+        ("", None),
+        (' data-dist-info-metadata="true"', {}),
+        (' data-dist-info-metadata="sha256=1234"', {"sha256": "1234"}),
+        (' data-core-metadata="sha256=1234"', {"sha256": "1234"}),
+    ],
+)
+def test_page_links_metadata(attribute, expected):
+    content = """<html><body>
+<a href="https://files.foo.bar/demo-0.1.0.tar.gz"{}>demo-0.1.0.tar.gz</a>
+</body></html>""".format(
+        attribute
+    )
+    page = Page("http://legacy.foo.bar/demo", content, {})
+
+    link = next(page.links)
+
+    assert link.metadata == expected
+
+
+@pytest.mark.parametrize(
+    "fixture", sorted(MockRepository.FIXTURES.glob("*.html")), ids=lambda f: f.stem
+)
+def test_page_anchors_match_html5lib(fixture):
+    content = fixture.read_text(encoding="utf-8")
+
+    assert Page.parse_anchors(content) == Page.parse_anchors_with_html5lib(content)
+
+
+def test_page_links_yanked():
+    content = """<html><body>
+<a href="https://files.foo.bar/demo-0.1.0.tar.gz">demo-0.1.0.tar.gz</a>
+<a href="https://files.foo.bar/demo-0.2.0.tar.gz" data-yanked>demo-0.2.0.tar.gz</a>
+<a href="https://files.foo.bar/demo-0.3.0.tar.gz" data-yanked="Broken &amp; bad">
+demo-0.3.0.tar.gz</a>
+</body></html>"""
+    page = Page("http://legacy.foo.bar/demo", content, {})
+
+    first, second, third = page.links
+
+    assert not first.is_yanked
+    assert second.is_yanked
+    assert second.yanked_reason is None
+    assert third.is_yanked
+    assert third.yanked_reason == "Broken & bad"
+
+
+def test_page_falls_back_to_html5lib(mocker):
+    content = """<html><body>
+<a href="https://files.foo.bar/demo-0.1.0.tar.gz">demo-0.1.0.tar.gz</a>
+</body></html>"""
+    mocker.patch(
+        "poetry.repositories.legacy_repository.AnchorParser.feed",
+        side_effect=AssertionError(),
+    )
+    html5lib_parse = mocker.spy(Page, "parse_anchors_with_html5lib")
+
+    page = Page("http://legacy.foo.bar/demo", content, {})
+
+    assert html5lib_parse.call_count == 1
+    assert [link.filename for link in page.links] == ["demo-0.1.0.tar.gz"]
+
+
+def test_page_links_for_version():
+    repo = MockRepository()
+    page = repo._get("/ipython")
+
+    assert [str(v) for v in page.versions] == ["5.7.0", "7.5.0"]
+    assert [link.filename for link in page.links_for_version(Version.parse("7.5"))] == [
+        "ipython-7.5.0-py3-none-any.whl",
+        "ipython-7.5.0.tar.gz",
+    ]
+    assert list(page.links_for_version(Version.parse("6.0.0"))) == []
+
+
+def test_page_cache_evicts_least_recently_used_pages():
+    cache = PageCache(maxsize=2)
+    pages = {url: Page(url, "", {}) for url in ("/a", "/b", "/c")}
+
+    cache.put("/a", pages["/a"])
+    cache.put("/b", pages["/b"])
+    assert cache.get("/a") is pages["/a"]
+
+    cache.put("/c", pages["/c"])
+
+    assert len(cache) == 2
+    assert cache.get("/a") is pages["/a"]
+    assert cache.get("/b") is None
+    assert cache.get("/c") is pages["/c"]
+
+
+class MockCachedRepository(MockRepository):
+
+    _get = LegacyRepository._get
+
+    def __init__(self):
+        super(MockCachedRepository, self).__init__()
+
+        self._disable_cache = False
+        self.requested = []
+
+    def _get_page(self, url):
+        self.requested.append(url)
+
+        return MockRepository._get(self, url[len(self._url) :])
+
+
+def test_pages_are_parsed_once_per_process(mocker):
+    mocker.patch.object(LegacyRepository, "_pages", PageCache())
+    repo = MockCachedRepository()
+    other_repo = MockCachedRepository()
+
+    repo._get_release_info("ipython", "5.7.0")
+    repo._get_release_info("ipython", "7.5.0")
+    repo.find_links_for_package(repo.find_packages(Dependency("ipython", "*"))[0])
+    other_repo.find_links_for_package(repo.find_packages(Dependency("ipython", "*"))[0])
+
+    assert repo.requested == ["http://legacy.foo.bar/ipython/"]
+    assert other_repo.requested == []
+
+
+class PageServer:
+    """
+    Serves a project page, answering conditional requests.
+    """
+
+    def __init__(self, http, url, etag="1", cache_control="max-age=0"):
+        self.etag = etag
+        self.cache_control = cache_control
+        self.content = (MockRepository.FIXTURES / "isort.html").read_text()
+        self.requests = []
+
+        http.register_uri(http.GET, url, body=self.respond)
+
+    def respond(self, request, uri, response_headers):
+        self.requests.append(request)
+        response_headers.update(
+            {
+                "ETag": self.etag,
+                "Cache-Control": self.cache_control,
+                "Content-Type": "text/html",
+            }
+        )
+
+        if request.headers.get("If-None-Match") == self.etag:
+            return [304, response_headers, ""]
+
+        return [200, response_headers, self.content]
+
+
+@pytest.fixture
+def cached_repository(tmp_path, mocker):
+    mocker.patch("poetry.repositories.legacy_repository.REPOSITORY_CACHE_DIR", tmp_path)
+    pages = mocker.patch.object(LegacyRepository, "_pages", PageCache())
+
+    repositories = []
+
+    def factory():
+        # Simulates a new process: nothing is shared with previous repositories
+        # but the data stored on disk.
+        pages.clear()
+        for repository in repositories:
+            repository._store.close()
+
+        repositories.append(LegacyRepository("legacy", url="http://legacy.foo.bar"))
+
+        return repositories[-1]
+
+    return factory
+
+
+def test_get_uses_fresh_pages_stored_on_disk(http, cached_repository):
+    server = PageServer(
+        http, "http://legacy.foo.bar/isort/", cache_control="max-age=600"
+    )
+
+    cached_repository()._get("/isort/")
+    page = cached_repository()._get("/isort/")
+
+    assert len(server.requests) == 1
+    assert [str(v) for v in page.versions] == ["4.3.4"]
+    assert len(list(page.links_for_version(Version.parse("4.3.4")))) == 3
+
+
+def test_get_revalidates_stale_pages_stored_on_disk(http, cached_repository):
+    server = PageServer(http, "http://legacy.foo.bar/isort/")
+
+    cached_repository()._get("/isort/")
+    page = cached_repository()._get("/isort/")
+
+    assert len(server.requests) == 2
+    assert server.requests[-1].headers["If-None-Match"] == "1"
+    assert [str(v) for v in page.versions] == ["4.3.4"]
+
+
+def test_get_refreshes_modified_pages_stored_on_disk(http, cached_repository):
+    server = PageServer(http, "http://legacy.foo.bar/isort/")
+
+    cached_repository()._get("/isort/")
+    server.etag = "2"
+    server.content = server.content.replace("4.3.4", "4.3.5")
+    page = cached_repository()._get("/isort/")
+    cached_page = cached_repository()._get("/isort/")
+
+    assert len(server.requests) == 3
+    assert [str(v) for v in page.versions] == ["4.3.5"]
+    assert [str(v) for v in cached_page.versions] == ["4.3.5"]
+
+
+def test_offline_get_uses_stale_pages_stored_on_disk(http, cached_repository):
+    server = PageServer(http, "http://legacy.foo.bar/isort/")
+
+    cached_repository()._get("/isort/")
+    page = cached_repository().set_offline()._get("/isort/")
+
+    assert len(server.requests) == 1
+    assert [str(v) for v in page.versions] == ["4.3.4"]
+
+
+def test_offline_get_raises_for_missing_pages(http, cached_repository):
+    server = PageServer(http, "http://legacy.foo.bar/isort/")
+
+    with pytest.raises(OfflineError) as e:
+        cached_repository().set_offline()._get("/isort/")
+
+    assert e.value.missing == ["http://legacy.foo.bar/isort/"]
+    assert server.requests == []
+
+
+def test_get_remembers_missing_pages(http, cached_repository):
+    http.register_uri(http.GET, "http://legacy.foo.bar/missing/", status=404)
+
+    assert cached_repository()._get("/missing/") is None
+    assert cached_repository()._get("/missing/") is None
+    assert len(http.latest_requests()) == 1
+
+
+def test_get_retries_missing_pages_after_their_ttl(http, cached_repository, mocker):
+    http.register_uri(http.GET, "http://legacy.foo.bar/missing/", status=404)
+
+    assert cached_repository()._get("/missing/") is None
+
+    time = mocker.patch("poetry.repositories.pypi_repository.time.time")
+    time.return_value = 9999999999
+
+    assert cached_repository()._get("/missing/") is None
+    assert len(http.latest_requests()) == 2
+
+
+class MockMetadataRepository(MockRepository):
+    def __init__(self, content):
+        super(MockMetadataRepository, self).__init__()
+
+        self._content = content
+
+    def _get(self, endpoint):
+        return JsonPage(self._url + endpoint, json.dumps(self._content), {})
+
+    def _download(self, url, dest):
+        raise AssertionError("Distributions should not be downloaded")
+
+
+def test_get_package_information_from_metadata_files(http):
+    metadata = b"""\
+Metadata-Version: 2.1
+Name: demo
+Version: 0.1.0
+Summary: A demo package.
+Requires-Python: >=3.6
+Requires-Dist: pendulum (>=1.4.4)
+"""
+    content = {
+        "meta": {"api-version": "1.0"},
+        "name": "demo",
+        "files": [
+            {
+                "filename": "demo-0.1.0.tar.gz",
+                "url": "https://files.foo.bar/demo-0.1.0.tar.gz",
+                "hashes": {"sha256": "5678"},
+                "core-metadata": True,
+            },
+            {
+                "filename": "demo-0.1.0-py2.py3-none-any.whl",
+                "url": "https://files.foo.bar/demo-0.1.0-py2.py3-none-any.whl",
+                "hashes": {"sha256": "1234"},
+                "core-metadata": {"sha256": hashlib.sha256(metadata).hexdigest()},
+            },
+        ],
+    }
+    http.register_uri(
+        http.GET,
+        "https://files.foo.bar/demo-0.1.0-py2.py3-none-any.whl.metadata",
+        body=metadata,
+    )
+    repo = MockMetadataRepository(content)
+
+    package = repo.package("demo", "0.1.0")
+
+    assert package.python_versions == ">=3.6"
+    assert package.description == "A demo package."
+    assert [str(dep) for dep in package.requires] == ["pendulum (>=1.4.4)"]
+    assert package.files == [
+        {"file": "demo-0.1.0.tar.gz", "hash": "sha256:5678"},
+        {"file": "demo-0.1.0-py2.py3-none-any.whl", "hash": "sha256:1234"},
+    ]
+    assert http.last_request().path.endswith(".whl.metadata")
+
+
+def test_get_package_information_ignores_metadata_files_with_wrong_hash(http):
+    content = {
+        "meta": {"api-version": "1.0"},
+        "name": "pastel",
+        "files": [
+            {
+                "filename": "pastel-0.1.0.tar.gz",
+                "url": "https://files.foo.bar/pastel-0.1.0.tar.gz",
+                "hashes": {},
+                "core-metadata": {"sha256": "1234"},
+            },
+        ],
+    }
+    http.register_uri(
+        http.GET,
+        "https://files.foo.bar/pastel-0.1.0.tar.gz.metadata",
+        body=b"Metadata-Version: 2.1\nName: pastel\nVersion: 0.1.0\n",
+    )
+    repo = MockMetadataRepository(content)
+
+    with pytest.raises(AssertionError, match="should not be downloaded"):
+        repo.package("pastel", "0.1.0")
+
+
+def test_preload_retrieves_pages_at_once(http, cached_repository):
+    server = PageServer(http, "http://legacy.foo.bar/isort/")
+    http.register_uri(http.GET, "http://legacy.foo.bar/missing/", status=404)
+
+    repository = cached_repository().set_fetch_engine(TestFetchEngine())
+    repository.preload(["isort", "missing"])
+
+    assert len(http.latest_requests()) == 2
+
+    page = repository._get("/isort/")
+
+    assert [str(v) for v in page.versions] == ["4.3.4"]
+    assert repository._get("/missing/") is None
+    assert len(server.requests) == 1
+    assert len(http.latest_requests()) == 2
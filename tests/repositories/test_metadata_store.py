@@ -0,0 +1,155 @@
+import gc
+import hashlib
+import json
+import weakref
+
+import pytest
+
+from poetry.repositories import metadata_store
+from poetry.repositories.metadata_store import MetadataStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = MetadataStore(tmp_path)
+
+    yield store
+
+    store.close()
+
+
+def legacy_entry(directory, key, value, expires=9999999999):
+    h = hashlib.sha256(key.encode()).hexdigest()
+    path = directory.joinpath(*[h[i : i + 2] for i in range(0, 16, 2)], h)
+    path.parent.mkdir(parents=True)
+    path.write_bytes(str(expires).encode() + json.dumps(value).encode())
+
+    return path
+
+
+def test_store_get_and_put(store):
+    assert store.get("demo:0.1.0") is None
+
+    store.put("demo:0.1.0", {"name": "demo"})
+    store.put("https://foo.bar/demo/", {"url": "demo"}, namespace="pages")
+
+    assert store.get("demo:0.1.0") == {"name": "demo"}
+    assert store.has("demo:0.1.0")
+    assert store.get("demo:0.1.0", namespace="pages") is None
+    assert store.get("https://foo.bar/demo/", namespace="pages") == {"url": "demo"}
+
+
+def test_store_writes_are_committed_in_batches(store, tmp_path, mocker):
+    mocker.patch.object(MetadataStore, "BATCH_SIZE", 3)
+    other = MetadataStore(tmp_path)
+
+    store.put("demo:0.1.0", {"name": "demo"})
+    store.put("demo:0.2.0", {"name": "demo"})
+
+    assert other.get("demo:0.1.0") is None
+
+    store.put("demo:0.3.0", {"name": "demo"})
+
+    assert other.get("demo:0.1.0") == {"name": "demo"}
+    assert other.count() == 3
+
+    other.close()
+
+
+def test_stores_are_committed_at_exit_without_being_kept_alive(tmp_path):
+    store = MetadataStore(tmp_path)
+    store.put("demo:0.1.0", {"name": "demo"})
+
+    metadata_store.commit_stores()
+
+    other = MetadataStore(tmp_path)
+    assert other.get("demo:0.1.0") == {"name": "demo"}
+    other.close()
+
+    reference = weakref.ref(store)
+    del store
+    gc.collect()
+
+    assert reference() is None
+
+
+def test_store_writes_are_committed_when_the_store_is_collected(tmp_path):
+    store = MetadataStore(tmp_path)
+    store.put("demo:0.1.0", {"name": "demo"})
+
+    del store
+    gc.collect()
+
+    other = MetadataStore(tmp_path)
+    assert other.get("demo:0.1.0") == {"name": "demo"}
+    other.close()
+
+
+def test_store_remember(store):
+    callback = lambda: {"name": "demo"}  # noqa: E731
+
+    assert store.remember("demo:0.1.0", callback) == {"name": "demo"}
+    assert store.remember("demo:0.1.0", lambda: {"name": "other"}) == {"name": "demo"}
+
+
+def test_store_forget_and_clear(store):
+    store.put("demo:0.1.0", {"name": "demo"})
+    store.put("demo:0.2.0", {"name": "demo"})
+    store.commit()
+
+    store.forget("demo:0.1.0")
+
+    assert store.get("demo:0.1.0") is None
+    assert store.count() == 1
+
+    store.clear()
+
+    assert store.count() == 0
+
+
+def test_store_uses_wal_journal_mode(store):
+    store.commit()
+
+    assert store._execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_store_migrates_entries_of_the_file_based_cache(store, tmp_path):
+    path = legacy_entry(tmp_path, "demo:0.1.0", {"name": "demo"})
+    expired = legacy_entry(tmp_path, "demo:0.2.0", {"name": "demo"}, expires=1)
+
+    assert store.get("demo:0.1.0") == {"name": "demo"}
+    assert store.get("demo:0.2.0") is None
+    assert not path.exists()
+    assert not expired.exists()
+
+    store.commit()
+
+    assert store.get("demo:0.1.0") == {"name": "demo"}
+    assert store.count() == 1
+
+
+def test_store_recreates_corrupted_databases(tmp_path):
+    (tmp_path / MetadataStore.FILENAME).write_bytes(b"This is not a database" * 100)
+    store = MetadataStore(tmp_path)
+
+    store.put("demo:0.1.0", {"name": "demo"})
+    store.close()
+
+    assert MetadataStore(tmp_path).get("demo:0.1.0") == {"name": "demo"}
+
+
+def test_forked_processes_start_over_with_a_new_connection(store):
+    store.count()
+    store.put("demo:0.1.0", {"name": "demo"})
+    connection = store._connection
+    lock = store._lock
+
+    metadata_store._forget_connections()
+
+    assert store._connection is None
+    assert store._lock is not lock
+    assert store._pending == {}
+    assert connection in metadata_store._inherited_connections
+
+    metadata_store._inherited_connections.remove(connection)
+    connection.close()
@@ -1,9 +1,14 @@
+import threading
+
 import pytest
 
 from poetry.repositories import Pool
 from poetry.repositories import Repository
 from poetry.repositories.exceptions import PackageNotFound
 from poetry.repositories.legacy_repository import LegacyRepository
+from poetry.repositories.remote_repository import RemoteRepository
+from tests.helpers import get_dependency
+from tests.helpers import get_package
 
 
 def test_pool_raises_package_not_found_when_no_package_is_found():
@@ -69,3 +74,106 @@ def test_repository_with_normal_default_and_secondary_repositories():
     assert pool.repository("foo") is repo1
     assert pool.repository("bar") is repo2
     assert pool.has_default()
+
+
+def test_pool_set_offline_applies_to_remote_repositories():
+    repository = LegacyRepository("foo", "https://foo.bar")
+    pool = Pool([Repository(), repository])
+
+    assert pool.set_offline().offline
+    assert repository.offline
+
+    other = LegacyRepository("bar", "https://bar.baz")
+    pool.add_repository(other)
+
+    assert other.offline
+
+
+class MockRemoteRepository(RemoteRepository):
+    def __init__(self, name, packages, barrier=None):
+        super(MockRemoteRepository, self).__init__("https://{}.com".format(name))
+
+        self._name = name
+        self._barrier = barrier
+        self.requested = []
+
+        for package in packages:
+            self.add_package(package)
+
+    def find_packages(self, dependency):
+        if self._barrier is not None:
+            # Only passes if the other repositories are queried at the same time
+            self._barrier.wait()
+
+        return super(MockRemoteRepository, self).find_packages(dependency)
+
+    def package(self, name, version, extras=None):
+        self.requested.append((name, version))
+
+        for package in self.packages:
+            if package.name == name and package.version.text == version:
+                return package
+
+        raise PackageNotFound()
+
+
+def test_pool_queries_remote_repositories_concurrently():
+    barrier = threading.Barrier(3, timeout=5)
+    default = MockRemoteRepository("default", [get_package("foo", "1.0")], barrier)
+    primary = MockRemoteRepository("primary", [get_package("foo", "2.0")], barrier)
+    secondary = MockRemoteRepository("secondary", [get_package("foo", "3.0")], barrier)
+
+    pool = Pool()
+    pool.add_repository(secondary, secondary=True)
+    pool.add_repository(primary)
+    pool.add_repository(default, default=True)
+
+    packages = pool.find_packages(get_dependency("foo"))
+
+    assert [package.version.text for package in packages] == ["1.0", "2.0", "3.0"]
+
+
+def test_pool_package_goes_to_the_repository_that_provided_it():
+    primary = MockRemoteRepository("primary", [get_package("foo", "1.0")])
+    secondary = MockRemoteRepository(
+        "secondary", [get_package("foo", "1.0"), get_package("foo", "2.0")]
+    )
+    pool = Pool()
+    pool.add_repository(primary)
+    pool.add_repository(secondary, secondary=True)
+
+    pool.find_packages(get_dependency("foo"))
+
+    assert pool.package("foo", "2.0").version.text == "2.0"
+    assert primary.requested == []
+    assert secondary.requested == [("foo", "2.0")]
+
+    # The package is taken from the repository with the highest priority
+    assert pool.package("foo", "1.0") is primary.packages[0]
+    assert secondary.requested == [("foo", "2.0")]
+
+
+def test_pool_package_uses_the_first_repository_providing_it():
+    primary = MockRemoteRepository("primary", [])
+    secondary = MockRemoteRepository("secondary", [get_package("foo", "1.0")])
+    pool = Pool()
+    pool.add_repository(primary)
+    pool.add_repository(secondary, secondary=True)
+
+    assert pool.package("foo", "1.0") is secondary.packages[0]
+    assert primary.requested == [("foo", "1.0")]
+
+    with pytest.raises(PackageNotFound):
+        pool.package("foo", "2.0")
+
+
+def test_pool_package_queries_the_repositories_in_turn():
+    primary = MockRemoteRepository("primary", [get_package("foo", "1.0")])
+    secondary = MockRemoteRepository("secondary", [get_package("foo", "1.0")])
+    pool = Pool()
+    pool.add_repository(primary)
+    pool.add_repository(secondary, secondary=True)
+
+    assert pool.package("foo", "1.0") is primary.packages[0]
+    assert primary.requested == [("foo", "1.0")]
+    assert secondary.requested == []
@@ -9,10 +9,15 @@ import pytest
 from requests.exceptions import TooManyRedirects
 from requests.models import Response
 
+from poetry.config.config import Config
 from poetry.core.packages import Dependency
 from poetry.factory import Factory
+from poetry.inspection.lazy_wheel import LazyWheelUnsupportedError
+from poetry.repositories.exceptions import OfflineError
+from poetry.repositories.exceptions import PackageNotFound
 from poetry.repositories.pypi_repository import PyPiRepository
 from poetry.utils._compat import encode
+from tests.helpers import TestFetchEngine
 
 
 class MockRepository(PyPiRepository):
@@ -46,6 +51,9 @@ class MockRepository(PyPiRepository):
         with fixture.open(encoding="utf-8") as f:
             return json.loads(f.read())
 
+    def _get_info_from_wheel_metadata(self, url):
+        raise LazyWheelUnsupportedError("Range requests are not supported")
+
     def _download(self, url, dest):
         filename = url.split("/")[-1]
 
@@ -83,6 +91,40 @@ def test_find_packages_only_prereleases(constraint, count):
     assert len(packages) == count
 
 
+def test_get_package_info():
+    repo = MockRepository()
+
+    info = repo.get_package_info("black")
+
+    assert info["info"]["name"] == "black"
+    assert len(info["urls"]) == 2
+    assert len(info["releases"]["19.10b0"]) == 2
+
+
+def test_releases_are_a_compact_projection():
+    repo = MockRepository()
+
+    assert repo._get_releases("black") == {
+        "name": "black",
+        "releases": {
+            "19.10b0": {
+                "files": [
+                    {
+                        "file": "black-19.10b0-py36-none-any.whl",
+                        "hash": "sha256:"
+                        "1b30e59be925fafc1ee4565e5e08abef6b03fe455102883820fe5ee2e4734e0b",
+                    },
+                    {
+                        "file": "black-19.10b0.tar.gz",
+                        "hash": "sha256:"
+                        "c2edb73a08e9e0e6f65a0e6af18b059b8b1cdd5bef997d7a0b181df93dc81539",
+                    },
+                ],
+            }
+        },
+    }
+
+
 def test_package():
     repo = MockRepository()
 
@@ -235,3 +277,111 @@ def test_use_pypi_pretty_name():
     package = repo.find_packages(Factory.create_dependency("twisted", "*"))
     assert len(package) == 1
     assert package[0].pretty_name == "Twisted"
+
+
+@pytest.fixture
+def cached_repository(tmp_path, mocker):
+    mocker.patch("poetry.repositories.pypi_repository.REPOSITORY_CACHE_DIR", tmp_path)
+
+    repository = PyPiRepository(url="https://foo.bar/")
+
+    yield repository
+
+    repository._store.close()
+
+
+def test_offline_get_uses_stale_cached_responses(http, cached_repository):
+    body = (MockRepository.JSON_FIXTURES / "requests.json").read_text()
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/pypi/requests/json",
+        body=body,
+        adding_headers={
+            "Cache-Control": "max-age=0",
+            "Date": "Mon, 01 Jan 2001 00:00:00 GMT",
+            "ETag": "1",
+        },
+        content_type="application/json",
+    )
+
+    expected = cached_repository._get("pypi/requests/json")
+    cached_repository.set_offline()
+
+    assert cached_repository._get("pypi/requests/json") == expected
+    assert len(http.latest_requests()) == 1
+
+
+def test_offline_get_raises_for_missing_responses(http, cached_repository):
+    cached_repository.set_offline()
+
+    with pytest.raises(OfflineError) as e:
+        cached_repository.find_packages(Factory.create_dependency("requests", "*"))
+
+    assert e.value.missing == ["https://foo.bar/pypi/requests/json"]
+    assert len(http.latest_requests()) == 0
+
+
+def test_offline_get_release_info_uses_the_metadata_cache(cached_repository):
+    info = MockRepository().get_release_info("requests", "2.18.4")
+    cached_repository._store.put("requests:2.18.4", info.asdict())
+    cached_repository.set_offline()
+
+    package = cached_repository.package("requests", "2.18.4")
+
+    assert package.requires == info.to_package().requires
+
+    with pytest.raises(OfflineError) as e:
+        cached_repository.package("requests", "2.18.0")
+
+    assert e.value.missing == ["requests 2.18.0 from PyPI"]
+
+
+def test_get_remembers_missing_projects(http, cached_repository):
+    http.register_uri(http.GET, "https://foo.bar/pypi/missing/json", status=404)
+
+    assert cached_repository.find_packages(Dependency("missing", "*")) == []
+    cached_repository._store.commit()
+
+    with pytest.raises(PackageNotFound):
+        PyPiRepository(url="https://foo.bar/").get_package_info("missing")
+
+    assert len(http.latest_requests()) == 1
+
+    config = Config()
+    config.merge({"cache": {"not-found-ttl": 0}})
+
+    with pytest.raises(PackageNotFound):
+        PyPiRepository(url="https://foo.bar/", config=config).get_package_info(
+            "missing"
+        )
+
+    assert len(http.latest_requests()) == 2
+
+
+def test_preload_retrieves_package_info_at_once(http, cached_repository):
+    http.register_uri(
+        http.GET,
+        "https://foo.bar/pypi/requests/json",
+        body=(MockRepository.JSON_FIXTURES / "requests.json").read_text(),
+        content_type="application/json",
+    )
+    http.register_uri(http.GET, "https://foo.bar/pypi/missing/json", status=404)
+
+    cached_repository.set_fetch_engine(TestFetchEngine())
+    cached_repository.preload(["requests", "missing", "requests"])
+
+    assert len(http.latest_requests()) == 2
+
+    packages = cached_repository.find_packages(
+        Factory.create_dependency("requests", "*")
+    )
+
+    assert len(packages) == 129
+    assert cached_repository.find_packages(Dependency("missing", "*")) == []
+    assert len(http.latest_requests()) == 2
+
+
+def test_preload_does_nothing_without_fetch_engine(http, cached_repository):
+    cached_repository.preload(["requests"])
+
+    assert len(http.latest_requests()) == 0
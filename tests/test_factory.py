@@ -177,6 +177,27 @@ def test_poetry_with_no_default_source():
     assert isinstance(poetry.pool.repositories[0], PyPiRepository)
 
 
+def test_poetry_offline_from_environment(monkeypatch):
+    monkeypatch.setenv("POETRY_OFFLINE", "1")
+
+    poetry = Factory().create_poetry(fixtures_dir / "with_non_default_source")
+
+    assert poetry.pool.offline
+    assert all(repository.offline for repository in poetry.pool.repositories)
+
+
+def test_poetry_async_requests_from_environment(monkeypatch):
+    monkeypatch.setenv("POETRY_SOLVER_ASYNC_REQUESTS", "50")
+
+    poetry = Factory().create_poetry(fixtures_dir / "with_non_default_source")
+
+    assert poetry.pool.fetch_engine.max_concurrency == 50
+    assert all(
+        repository.fetch_engine is poetry.pool.fetch_engine
+        for repository in poetry.pool.repositories
+    )
+
+
 def test_poetry_with_two_default_sources():
     with pytest.raises(ValueError) as e:
         Factory().create_poetry(fixtures_dir / "with_two_default_sources")
@@ -0,0 +1,237 @@
+import gzip
+import socket
+import threading
+import time
+
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+
+import pytest
+import requests
+
+from cachecontrol.cache import DictCache
+
+from poetry.utils import fetch_engine
+from poetry.utils.fetch_engine import FetchEngine
+from poetry.utils.http_client import HTTPClients
+
+
+class Handler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        self.server.authorizations.append(self.headers.get("Authorization"))
+
+        if self.path == "/redirect/":
+            self.send_response(301)
+            self.send_header("Location", "/simple/foo/")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/redirect-to-localhost/":
+            self.send_response(302)
+            self.send_header(
+                "Location",
+                "http://localhost:{}/simple/foo/".format(self.server.server_address[1]),
+            )
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        elif self.path == "/gzip/":
+            body = gzip.compress(b"compressed")
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == "/chunked/":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"foo", b"bar"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif self.path == "/slow/":
+            time.sleep(0.2)
+            self.send_response(200)
+            self.send_header("Content-Length", "4")
+            self.end_headers()
+            self.wfile.write(b"slow")
+        elif self.path == "/missing/":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            body = self.path.encode()
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "max-age=900")
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.requests = []
+    server.authorizations = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def engine():
+    engine = FetchEngine(max_concurrency=4)
+
+    yield engine
+
+    engine.close()
+
+
+def url(server, path):
+    return "http://127.0.0.1:{}{}".format(server.server_address[1], path)
+
+
+def test_send_all_returns_responses_in_order(server, engine):
+    session = HTTPClients().session()
+    paths = ["/simple/{}/".format(i) for i in range(20)]
+
+    responses = engine.send_all(
+        session, [requests.Request("GET", url(server, path)) for path in paths]
+    )
+
+    assert [response.text for response in responses] == paths
+    assert sorted(server.requests) == sorted(paths)
+
+
+def test_send_all_sends_identical_requests_once(server, engine):
+    responses = engine.send_all(
+        HTTPClients().session(),
+        [requests.Request("GET", url(server, "/slow/")) for _ in range(3)],
+    )
+
+    assert [response.text for response in responses] == ["slow"] * 3
+    assert server.requests == ["/slow/"]
+
+
+def test_send_follows_redirects(server, engine):
+    response = engine.send(
+        HTTPClients().session(), requests.Request("GET", url(server, "/redirect/"))
+    )
+
+    assert response.text == "/simple/foo/"
+    assert response.url == url(server, "/simple/foo/")
+    assert [r.status_code for r in response.history] == [301]
+
+
+@pytest.mark.parametrize(
+    ("path", "text"), [("/gzip/", "compressed"), ("/chunked/", "foobar")]
+)
+def test_send_decodes_responses(server, engine, path, text):
+    response = engine.send(
+        HTTPClients().session(), requests.Request("GET", url(server, path))
+    )
+
+    assert response.status_code == 200
+    assert response.text == text
+
+
+def test_send_returns_error_responses(server, engine):
+    response = engine.send(
+        HTTPClients().session(), requests.Request("GET", url(server, "/missing/"))
+    )
+
+    assert response.status_code == 404
+
+
+def test_send_uses_the_http_cache_of_the_session(server, engine):
+    session = HTTPClients().session(cache=DictCache())
+
+    first = engine.send(session, requests.Request("GET", url(server, "/simple/foo/")))
+    second = engine.send(session, requests.Request("GET", url(server, "/simple/foo/")))
+
+    assert first.text == second.text == "/simple/foo/"
+    assert second.from_cache
+    assert server.requests == ["/simple/foo/"]
+
+
+def test_send_raises_connection_errors(engine):
+    with pytest.raises(requests.ConnectionError):
+        engine.send(
+            HTTPClients().session(), requests.Request("GET", "http://127.0.0.1:1/")
+        )
+
+
+@pytest.mark.parametrize(
+    ("path", "authorizations"),
+    [
+        ("/redirect/", ["Basic dXNlcjpzZWNyZXQ=", "Basic dXNlcjpzZWNyZXQ="]),
+        ("/redirect-to-localhost/", ["Basic dXNlcjpzZWNyZXQ=", None]),
+    ],
+)
+def test_send_only_sends_credentials_to_their_host(
+    server, engine, path, authorizations
+):
+    session = HTTPClients().session()
+    session.auth = requests.auth.HTTPBasicAuth("user", "secret")
+    session.trust_env = False
+
+    response = engine.send(session, requests.Request("GET", url(server, path)))
+
+    assert response.text == "/simple/foo/"
+    assert server.authorizations == authorizations
+
+
+def test_send_times_out():
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen()
+    engine = FetchEngine(timeout=0.2)
+
+    try:
+        with pytest.raises(requests.Timeout):
+            engine.send(
+                HTTPClients().session(),
+                requests.Request(
+                    "GET", "http://127.0.0.1:{}/".format(listener.getsockname()[1])
+                ),
+            )
+    finally:
+        engine.close()
+        listener.close()
+
+
+def test_send_all_uses_the_limiters_and_statistics_of_the_clients(server):
+    clients = HTTPClients()
+    engine = FetchEngine(max_concurrency=4, clients=clients)
+    paths = ["/simple/{}/".format(i) for i in range(10)]
+
+    try:
+        engine.send_all(
+            clients.session(),
+            [requests.Request("GET", url(server, path)) for path in paths],
+        )
+    finally:
+        engine.close()
+
+    stats = clients.stats()["127.0.0.1"]
+
+    assert stats.requests == 10
+    assert 1 <= stats.opened <= 4
+    assert clients.limiter("127.0.0.1").in_flight == 0
+
+
+def test_running_engines_are_closed_at_exit(server, engine):
+    engine.send(HTTPClients().session(), requests.Request("GET", url(server, "/")))
+
+    fetch_engine._close_engines()
+
+    assert engine._executor is None
@@ -0,0 +1,243 @@
+import time
+
+from email.utils import formatdate
+
+import httpretty
+import pytest
+import requests
+
+from cachecontrol.cache import DictCache
+
+from poetry.utils.http_client import CachingAdapter
+from poetry.utils.http_client import HostLimiter
+from poetry.utils.http_client import HTTPClients
+from poetry.utils.http_client import PooledAdapter
+from poetry.utils.http_client import parse_retry_after
+
+
+def test_sessions_share_connection_pools():
+    clients = HTTPClients()
+
+    session = clients.session()
+    cached_session = clients.session(cache=DictCache())
+
+    adapter = session.get_adapter("https://foo.bar")
+    cached_adapter = cached_session.get_adapter("https://foo.bar")
+
+    assert isinstance(adapter, PooledAdapter)
+    assert isinstance(cached_adapter, CachingAdapter)
+    assert adapter.poolmanager is clients.pool_manager
+    assert cached_adapter.poolmanager is clients.pool_manager
+
+
+def test_sessions_share_pools_only_with_the_same_tls_settings(tmp_path):
+    ca = tmp_path / "ca.pem"
+    cert = tmp_path / "client.pem"
+    key = tmp_path / "client.key"
+    for path in (ca, cert, key):
+        path.write_text("")
+
+    clients = HTTPClients()
+    request = requests.Request("GET", "https://foo.bar/simple/").prepare()
+    settings = [
+        (True, None),
+        (str(ca), (str(cert), str(key))),
+        (False, None),
+        (True, str(cert)),
+    ]
+
+    pools = []
+    for verify, client_cert in settings:
+        adapter = clients.session(cache=DictCache()).get_adapter(request.url)
+        pool = adapter.get_connection_with_tls_context(
+            request, verify, cert=client_cert
+        )
+        # What requests does with the pool before sending the request
+        adapter.cert_verify(pool, request.url, verify, client_cert)
+        pools.append(pool)
+
+    default, custom, unverified, client = pools
+
+    assert len({id(pool) for pool in pools}) == 4
+    assert (default.cert_reqs, default.cert_file) == ("CERT_REQUIRED", None)
+    assert (custom.ca_certs, custom.cert_file) == (str(ca), str(cert))
+    assert custom.key_file == str(key)
+    assert unverified.cert_reqs == "CERT_NONE"
+    assert (client.cert_file, client.key_file) == (str(cert), None)
+    assert (
+        clients.session()
+        .get_adapter(request.url)
+        .get_connection_with_tls_context(request, True)
+        is default
+    )
+
+
+def test_connections_are_reused_across_sessions(http):
+    http.register_uri(http.GET, "http://foo.bar/simple/", body="foo")
+    clients = HTTPClients()
+
+    clients.session().get("http://foo.bar/simple/")
+    session = clients.session()
+    session.get("http://foo.bar/simple/")
+    session.close()
+    clients.session(cache=DictCache()).get("http://foo.bar/simple/")
+
+    stats = clients.stats()["foo.bar"]
+
+    assert stats.opened == 1
+    assert stats.reused == 2
+
+
+def test_reserve_grows_connection_pools():
+    clients = HTTPClients(pool_maxsize=10)
+    pool = clients.pool_manager.connection_from_url("https://foo.bar")
+
+    clients.reserve(4)
+
+    assert clients.pool_maxsize == 10
+    assert clients.pool_manager.connection_from_url("https://foo.bar") is pool
+
+    clients.reserve(16)
+
+    assert clients.pool_maxsize == 16
+    assert (
+        clients.pool_manager.connection_from_url("https://foo.bar").pool.maxsize == 16
+    )
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [(None, None), ("", None), ("3", 3.0), ("3600", 60.0), ("soon", None)],
+)
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_date():
+    date = formatdate(time.time() + 10, usegmt=True)
+
+    assert 8 < parse_retry_after(date) <= 10
+
+
+def test_host_limiter_backs_off_when_throttled():
+    limiter = HostLimiter(8)
+
+    limiter.acquire()
+    limiter.release(throttled=True)
+
+    assert limiter.limit == 4
+    assert limiter.rate == 2.0
+    assert limiter.throttled == 1
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+
+    assert limiter.limit == 4
+    assert 2.0 < limiter.rate
+
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+
+    assert limiter.limit == 5
+
+
+def test_host_limiter_only_limits_concurrency_once_throttled():
+    limiter = HostLimiter(2)
+
+    for _ in range(3):
+        limiter.acquire()
+
+    assert limiter.in_flight == 3
+
+
+def test_host_limiter_waits_for_a_bounded_time(mocker):
+    mocker.patch.object(HostLimiter, "MAX_WAIT", 0.2)
+    limiter = HostLimiter(2)
+
+    limiter.acquire()
+    limiter.release(throttled=True)
+    # A request which never finishes
+    limiter.acquire()
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.2
+    assert limiter.in_flight == 2
+
+
+def test_host_limiter_waits_for_retry_after():
+    limiter = HostLimiter(8)
+
+    limiter.acquire()
+    limiter.release(throttled=True, retry_after=0.5)
+
+    start = time.monotonic()
+    limiter.acquire()
+
+    assert time.monotonic() - start >= 0.5
+
+
+def test_throttled_requests_are_sent_again(http):
+    responses = [
+        httpretty.Response(body="", status=429, adding_headers={"Retry-After": "0"}),
+        httpretty.Response(body="foo"),
+    ]
+    http.register_uri(http.GET, "http://foo.bar/simple/", responses=responses)
+    clients = HTTPClients()
+
+    response = clients.session().get("http://foo.bar/simple/")
+
+    assert response.status_code == 200
+    assert response.text == "foo"
+    assert clients.limiter("foo.bar").throttled == 1
+    assert len(http.latest_requests()) == 2
+
+
+def test_throttled_posts_are_not_sent_again(http):
+    http.register_uri(http.POST, "http://foo.bar/legacy/", status=429)
+    clients = HTTPClients()
+
+    response = clients.session().post("http://foo.bar/legacy/")
+
+    assert response.status_code == 429
+    assert len(http.latest_requests()) == 1
+
+
+def test_streamed_requests_are_in_flight_until_closed(http):
+    http.register_uri(http.GET, "http://foo.bar/files/foo.whl", body="foo")
+    clients = HTTPClients()
+    limiter = clients.limiter("foo.bar")
+
+    response = clients.session().get("http://foo.bar/files/foo.whl", stream=True)
+
+    assert limiter.in_flight == 1
+
+    with response:
+        assert response.content == b"foo"
+
+    assert limiter.in_flight == 0
+
+    response.close()
+
+    assert limiter.in_flight == 0
+
+    clients.session().get("http://foo.bar/files/foo.whl")
+
+    assert limiter.in_flight == 0
+
+
+def test_forget_connections_starts_over_with_new_pools():
+    clients = HTTPClients(pool_maxsize=16)
+    pool_manager = clients.pool_manager
+    pool = pool_manager.connection_from_url("https://foo.bar")
+    limiter = clients.limiter("foo.bar")
+
+    clients.forget_connections()
+
+    assert clients.pool_manager is pool_manager
+    assert pool_manager.connection_from_url("https://foo.bar") is not pool
+    assert pool_manager.connection_from_url("https://foo.bar").pool.maxsize == 16
+    assert clients.limiter("foo.bar") is not limiter